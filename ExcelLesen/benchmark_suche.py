@@ -0,0 +1,74 @@
+"""
+Vergleicht die alte Suche (Schleife Begriff × Spalte) mit excel_suche.suche_maske.
+
+Erzeugt Testdaten mit gemischten Spalten (Text, Zahlen, Datum, fehlende Werte)
+und misst die Zeit. Dass beide Varianten dieselbe Maske liefern, prüft
+excel_suche_test.py.
+
+Nutzung:
+python benchmark_suche.py                      (10.000 / 100.000 / 1.000.000 Zeilen)
+python benchmark_suche.py --zeilen 50000 --spalten 40 --begriffe 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from excel_suche import suche_maske
+
+
+def alte_suche_maske(df, suchbegriffe, spalten):
+    """Bisherige Implementierung aus suche_dataframe (Index angepasst)."""
+    mask = pd.Series(False, index=df.index)
+    for begriff in suchbegriffe:
+        for spalte in spalten:
+            mask |= df[spalte].astype(str).str.contains(begriff, case=False, na=False)
+    return mask
+
+
+def testdaten(zeilen, spalten, seed=42):
+    rng = np.random.default_rng(seed)
+    woerter = np.array(["Rechnung", "Gutschrift", "Trasse", "Abschlag", "Leipzig", "Frankfurt",
+                        "DB Fernverkehr", "InfraGO", "Entgelt", "Stornierung", "Mahnung", "Zahlung"])
+    daten = {}
+    for i in range(spalten):
+        art = i % 4
+        if art == 0:
+            werte = rng.choice(woerter, zeilen).astype(object)
+            werte[rng.random(zeilen) < 0.05] = None
+            daten[f"Text_{i}"] = werte
+        elif art == 1:
+            daten[f"Betrag_{i}"] = rng.normal(1000, 500, zeilen).round(2)
+        elif art == 2:
+            daten[f"Nummer_{i}"] = rng.integers(3_000_000, 3_999_999, zeilen)
+        else:
+            daten[f"Datum_{i}"] = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 730, zeilen), unit="D")
+    return pd.DataFrame(daten)
+
+
+def messe(funktion, *args):
+    start = time.perf_counter()
+    ergebnis = funktion(*args)
+    return ergebnis, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zeilen", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--spalten", type=int, default=10)
+    parser.add_argument("--begriffe", type=int, default=10)
+    args = parser.parse_args()
+
+    suchbegriffe = ["rechnung", "leipzig", "3001300", "2023-12", "storn", "infra", "mahn", "1234", "abschlag", "xyz"]
+    suchbegriffe = (suchbegriffe * (args.begriffe // len(suchbegriffe) + 1))[:args.begriffe]
+
+    print(f"{args.begriffe} Begriffe × {args.spalten} Spalten\n")
+    print(f"{'Zeilen':>10} | {'alt':>9} | {'neu':>9} | {'Faktor':>6} | Treffer")
+    for zeilen in args.zeilen:
+        df = testdaten(zeilen, args.spalten)
+        spalten = df.columns.tolist()
+        maske_alt, zeit_alt = messe(alte_suche_maske, df, suchbegriffe, spalten)
+        maske_neu, zeit_neu = messe(suche_maske, df, suchbegriffe, spalten)
+        print(f"{zeilen:>10,} | {zeit_alt:>8.2f}s | {zeit_neu:>8.2f}s | {zeit_alt / zeit_neu:>5.1f}x | {int(maske_neu.sum()):,}")
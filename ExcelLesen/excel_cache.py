@@ -0,0 +1,367 @@
+"""
+Zwischenspeicher für eingelesene Excel-Tabellen.
+
+1. DataFrameCache (im Arbeitsspeicher)
+   Streamlit führt bei jeder Eingabe das ganze Skript neu aus – ohne Cache wird
+   die hochgeladene Datei also bei jedem Schieberegler neu durch openpyxl geparst.
+   DataFrameCache hält die fertigen DataFrames im Speicher, Schlüssel ist ein
+   Hash über den Dateiinhalt. Wird die Speichergrenze überschritten, fliegen die
+   am längsten nicht benutzten Einträge raus (LRU).
+
+2. Parquet-Sidecar (auf der Festplatte)
+   openpyxl ist 10–50x langsamer als das Lesen einer spaltenorientierten Datei.
+   Beim ersten Öffnen wird jedes Blatt zusätzlich als .parquet unter
+   SIDECAR_ORDNER/<hash der Arbeitsmappe>/ abgelegt, danach wird nur noch von
+   dort gelesen. Ändert sich die .xlsx, ändert sich der Hash – der alte
+   Sidecar wird dann nicht mehr benutzt und beim nächsten Schreiben gelöscht.
+   SIDECAR_ORDNER liegt im Cache-Ordner des Benutzers (nicht im Projekt) und
+   lässt sich über die Umgebungsvariable EXCEL_SIDECAR_ORDNER umlegen. Werden
+   es mehr als SIDECAR_MAX_MAPPEN Mappen oder SIDECAR_MAX_BYTES, fliegen die am
+   längsten nicht benutzten raus – das trifft auch Uploads, deren Sidecar
+   sonst nie wieder gelöscht würde.
+   Blätter, die sich nicht verlustfrei als Parquet speichern lassen (z. B.
+   Spalten mit gemischten Typen), werden weiterhin aus der Excel-Datei gelesen.
+
+3. Blattnamen
+   pd.ExcelFile lädt für die Blattnamen die ganze Arbeitsmappe (Formate,
+   gemeinsame Texte, …). blattnamen_aus_mappe() liest bei .xlsx/.xlsm nur
+   xl/workbook.xml aus dem ZIP-Archiv – keine einzige Zelle.
+
+pip install pandas openpyxl pyarrow   (ohne pyarrow gibt es keinen Sidecar)
+"""
+
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import threading
+import zipfile
+from collections import OrderedDict
+from collections.abc import Mapping
+from xml.etree import ElementTree
+
+import pandas as pd
+
+
+def _cache_ordner():
+    """Cache-Ordner des Benutzers: %LOCALAPPDATA% unter Windows, sonst $XDG_CACHE_HOME bzw. ~/.cache."""
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return os.environ["LOCALAPPDATA"]
+    return os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+
+SIDECAR_ORDNER = os.environ.get("EXCEL_SIDECAR_ORDNER") or os.path.join(_cache_ordner(), "excel_lesen", "sidecar")
+SIDECAR_MAX_MAPPEN = 50
+SIDECAR_MAX_BYTES = 2 * 1024**3  # 2 GB
+META_DATEI = "meta.json"
+
+PARQUET_VERFUEGBAR = importlib.util.find_spec("pyarrow") is not None
+
+
+def inhalt_hash(inhalt):
+    """SHA-256 über die Bytes einer Datei."""
+    return hashlib.sha256(inhalt).hexdigest()
+
+
+def df_groesse(df):
+    """Speicherbedarf eines DataFrames in Bytes (inkl. Text in object-Spalten)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+class DataFrameCache:
+    """LRU-Cache für DataFrames, begrenzt auf max_bytes Speicher."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._eintraege = OrderedDict()
+        self._belegt = 0
+        self._lock = threading.Lock()
+
+    def hole(self, schluessel):
+        """Gibt den DataFrame zurück oder None. Der Eintrag wird als zuletzt benutzt markiert."""
+        with self._lock:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is None:
+                return None
+            self._eintraege.move_to_end(schluessel)
+            return eintrag[0]
+
+    def speichere(self, schluessel, df, groesse=None):
+        """groesse in Bytes; nur nötig, wenn kein DataFrame gespeichert wird (z. B. ein SuchIndex)."""
+        groesse = df_groesse(df) if groesse is None else groesse
+        with self._lock:
+            if schluessel in self._eintraege:
+                self._belegt -= self._eintraege.pop(schluessel)[1]
+            if groesse > self.max_bytes:
+                # Passt grundsätzlich nicht hinein → nicht cachen
+                return
+            self._eintraege[schluessel] = (df, groesse)
+            self._belegt += groesse
+            while self._belegt > self.max_bytes:
+                _, (_, alte_groesse) = self._eintraege.popitem(last=False)
+                self._belegt -= alte_groesse
+
+    def belegt(self):
+        """Aktuell belegter Speicher in Bytes."""
+        return self._belegt
+
+    def __len__(self):
+        return len(self._eintraege)
+
+
+# -------------------------------
+# Parquet-Sidecar
+# -------------------------------
+_pfad_hashes = {}
+
+
+def quelle_hash(quelle):
+    """Hash einer Arbeitsmappe (Pfad oder Bytes). Pfade werden pro (Größe, Änderungszeit) nur einmal gehasht."""
+    if isinstance(quelle, (bytes, bytearray)):
+        return inhalt_hash(quelle)
+
+    stat = os.stat(quelle)
+    schluessel = (os.path.abspath(quelle), stat.st_size, stat.st_mtime)
+    if schluessel not in _pfad_hashes:
+        h = hashlib.sha256()
+        with open(quelle, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        _pfad_hashes[schluessel] = h.hexdigest()
+    return _pfad_hashes[schluessel]
+
+
+def _excel_quelle(quelle):
+    """pd.read_excel braucht für Bytes ein dateiähnliches Objekt."""
+    return io.BytesIO(quelle) if isinstance(quelle, (bytes, bytearray)) else quelle
+
+
+def blattnamen_aus_mappe(quelle):
+    """Blattnamen aus xl/workbook.xml (Pfad oder Bytes); alte .xls-Dateien über pandas."""
+    try:
+        with zipfile.ZipFile(_excel_quelle(quelle)) as mappe:
+            wurzel = ElementTree.fromstring(mappe.read("xl/workbook.xml"))
+    except (zipfile.BadZipFile, KeyError):
+        return pd.ExcelFile(_excel_quelle(quelle)).sheet_names
+    return [blatt.get("name") for blatt in wurzel.iterfind("{*}sheets/{*}sheet")]
+
+
+def sidecar_aufraeumen(ordner=SIDECAR_ORDNER, max_mappen=None, max_bytes=None, behalten=None):
+    """Löscht die am längsten nicht benutzten Sidecars, bis Anzahl und Größe wieder unter den Grenzen liegen."""
+    max_mappen = SIDECAR_MAX_MAPPEN if max_mappen is None else max_mappen
+    max_bytes = SIDECAR_MAX_BYTES if max_bytes is None else max_bytes
+    mappen = []
+    try:
+        namen = os.listdir(ordner)
+    except OSError:
+        return
+    for name in namen:
+        pfad = os.path.join(ordner, name)
+        try:
+            # meta.json wird bei jeder Benutzung angefasst → Änderungszeit = letzte Benutzung
+            benutzt = os.path.getmtime(os.path.join(pfad, META_DATEI))
+            groesse = sum(eintrag.stat().st_size for eintrag in os.scandir(pfad) if eintrag.is_file())
+        except OSError:
+            continue
+        mappen.append((benutzt, name, groesse))
+
+    mappen.sort()
+    belegt = sum(groesse for _, _, groesse in mappen)
+    anzahl = len(mappen)
+    for _, name, groesse in mappen:
+        if anzahl <= max_mappen and belegt <= max_bytes:
+            break
+        if name == behalten:
+            continue
+        shutil.rmtree(os.path.join(ordner, name), ignore_errors=True)
+        anzahl -= 1
+        belegt -= groesse
+
+
+class Sidecar:
+    """Parquet-Kopien aller Blätter einer Arbeitsmappe in SIDECAR_ORDNER/<hash>/."""
+
+    def __init__(self, quelle, ordner=SIDECAR_ORDNER):
+        self.quelle = quelle
+        self.hash = quelle_hash(quelle)
+        self.ordner = os.path.join(ordner, self.hash)
+        self.basis_ordner = ordner
+        self.meta = self._lese_meta()
+        if self.meta is not None:
+            self._benutzt()
+
+    def _benutzt(self):
+        """Änderungszeit von meta.json auffrischen (Grundlage für sidecar_aufraeumen)."""
+        try:
+            os.utime(os.path.join(self.ordner, META_DATEI))
+        except OSError:
+            pass
+
+    def _lese_meta(self):
+        try:
+            with open(os.path.join(self.ordner, META_DATEI), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _schreibe_meta(self, versuche=5):
+        """Schreibt meta.json atomar (temporäre Datei + Umbenennen), erst nachdem die Parquet-Datei fertig ist."""
+        os.makedirs(self.ordner, exist_ok=True)
+        ziel = os.path.join(self.ordner, META_DATEI)
+        tmp = f"{ziel}.{os.getpid()}.{threading.get_ident()}.tmp"
+        for _ in range(versuche):
+            # Andere Prozesse (excel_mehrfachsuche.py) können parallel Blätter derselben Mappe eintragen
+            auf_platte = self._lese_meta()
+            if auf_platte:
+                self.meta["dateien"] = {**auf_platte.get("dateien", {}), **self.meta["dateien"]}
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.meta, f, ensure_ascii=False)
+            os.replace(tmp, ziel)
+            # Hat ein anderer Prozess zwischen Lesen und Umbenennen geschrieben, fehlen dort unsere Einträge → erneut
+            auf_platte = self._lese_meta() or {}
+            if all(auf_platte.get("dateien", {}).get(name, datei) == datei for name, datei in self.meta["dateien"].items()):
+                return
+
+    def _neu_angelegt(self, blattnamen):
+        """Erstes Öffnen dieser Arbeitsmappe: Meta anlegen, alte Sidecars derselben Datei entfernen."""
+        quelle = os.path.abspath(self.quelle) if isinstance(self.quelle, str) else None
+        self.meta = {"quelle": quelle, "blaetter": list(blattnamen), "dateien": {}}
+        if PARQUET_VERFUEGBAR:
+            self._schreibe_meta()
+            if quelle:
+                self._alte_entfernen(quelle)
+            sidecar_aufraeumen(self.basis_ordner, behalten=self.hash)
+
+    def _alte_entfernen(self, quelle):
+        for name in os.listdir(self.basis_ordner):
+            if name == self.hash:
+                continue
+            try:
+                with open(os.path.join(self.basis_ordner, name, META_DATEI), "r", encoding="utf-8") as f:
+                    if json.load(f).get("quelle") == quelle:
+                        shutil.rmtree(os.path.join(self.basis_ordner, name), ignore_errors=True)
+            except (OSError, ValueError):
+                continue
+
+    def blattnamen(self):
+        if self.meta is None:
+            self._neu_angelegt(blattnamen_aus_mappe(self.quelle))
+        return self.meta["blaetter"]
+
+    def _blattname(self, blatt):
+        # blattnamen() legt beim ersten Öffnen auch die Meta an (nötig zum Speichern der Parquet-Kopie)
+        namen = self.blattnamen()
+        return namen[blatt] if isinstance(blatt, int) else blatt
+
+    def _parquet_pfad(self, blattname):
+        datei = self.meta["dateien"].get(blattname) if self.meta else None
+        if datei:
+            pfad = os.path.join(self.ordner, datei)
+            if os.path.exists(pfad):
+                return pfad
+        return None
+
+    def _speichere_blatt(self, blattname, df):
+        if self.meta is None:
+            self.blattnamen()
+        if not PARQUET_VERFUEGBAR or blattname in self.meta["dateien"]:
+            return
+        datei = f"{self.meta['blaetter'].index(blattname)}.parquet"
+        ziel = os.path.join(self.ordner, datei)
+        # Eigene temporäre Datei je Prozess/Thread – zwei Prozesse können dasselbe Blatt gleichzeitig speichern
+        tmp = f"{ziel}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            df.to_parquet(tmp)
+            os.replace(tmp, ziel)
+            self.meta["dateien"][blattname] = datei
+        except Exception:
+            # Nicht verlustfrei speicherbar → dieses Blatt immer aus Excel lesen
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            self.meta["dateien"][blattname] = None
+        self._schreibe_meta()
+
+    def lade_blatt(self, blatt=0):
+        """Ein Blatt (Name oder Index) als DataFrame – aus dem Sidecar, sonst aus Excel."""
+        blattname = self._blattname(blatt)
+        pfad = self._parquet_pfad(blattname)
+        if pfad:
+            return pd.read_parquet(pfad, memory_map=True)
+
+        df = pd.read_excel(_excel_quelle(self.quelle), sheet_name=blattname)
+        self._speichere_blatt(blattname, df)
+        return df
+
+    def lade_alle_blaetter(self):
+        """Alle Blätter als Dictionary {Name: DataFrame}; fehlende werden in einem Durchlauf aus Excel gelesen."""
+        blattnamen = self.blattnamen()
+        fehlend = [name for name in blattnamen if not self._parquet_pfad(name)]
+        aus_excel = {}
+        if fehlend:
+            aus_excel = pd.read_excel(_excel_quelle(self.quelle), sheet_name=fehlend)
+            for name, df in aus_excel.items():
+                self._speichere_blatt(name, df)
+        return {
+            name: aus_excel[name] if name in aus_excel else pd.read_parquet(self._parquet_pfad(name), memory_map=True)
+            for name in blattnamen
+        }
+
+    def vorschau(self, blatt=0, zeilen=5):
+        """Die ersten Zeilen eines Blatts – ohne das ganze Blatt aus Excel zu parsen."""
+        blattname = self._blattname(blatt)
+        pfad = self._parquet_pfad(blattname)
+        if pfad:
+            return pd.read_parquet(pfad, memory_map=True).head(zeilen)
+        # nrows: openpyxl hört nach den benötigten Zeilen auf zu lesen
+        return pd.read_excel(_excel_quelle(self.quelle), sheet_name=blattname, nrows=zeilen)
+
+
+class Arbeitsmappe(Mapping):
+    """
+    Dictionary {Blattname: DataFrame}, das ein Blatt erst beim ersten Zugriff lädt.
+    Verhält sich wie das Ergebnis von pd.read_excel(..., sheet_name=None),
+    liest aber nur die Blätter, die wirklich gebraucht werden.
+    """
+
+    def __init__(self, quelle):
+        self.sidecar = Sidecar(quelle)
+        self._geladen = {}
+
+    def __getitem__(self, blattname):
+        if blattname not in self._geladen:
+            if blattname not in self.sidecar.blattnamen():
+                raise KeyError(blattname)
+            self._geladen[blattname] = self.sidecar.lade_blatt(blattname)
+        return self._geladen[blattname]
+
+    def __iter__(self):
+        return iter(self.sidecar.blattnamen())
+
+    def __len__(self):
+        return len(self.sidecar.blattnamen())
+
+    def ist_geladen(self, blattname):
+        return blattname in self._geladen
+
+    def vorschau(self, blattname, zeilen=5):
+        """Erste Zeilen eines Blatts; bereits geladene Blätter werden dafür nicht neu gelesen."""
+        if blattname in self._geladen:
+            return self._geladen[blattname].head(zeilen)
+        return self.sidecar.vorschau(blattname, zeilen)
+
+
+def lade_blatt(quelle, blatt=0):
+    """Kurzform: ein Blatt einer Arbeitsmappe (Pfad oder Bytes) über den Sidecar laden."""
+    return Sidecar(quelle).lade_blatt(blatt)
+
+
+def lade_alle_blaetter(quelle):
+    """Kurzform: alle Blätter einer Arbeitsmappe (Pfad oder Bytes) über den Sidecar laden."""
+    return Sidecar(quelle).lade_alle_blaetter()
+
+
+def blattnamen(quelle):
+    """Blattnamen einer Arbeitsmappe (aus dem Sidecar, falls vorhanden)."""
+    return Sidecar(quelle).blattnamen()
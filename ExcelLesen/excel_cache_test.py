@@ -0,0 +1,91 @@
+"""
+Tests für excel_cache.py (Parquet-Sidecar).
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from multiprocessing import Pool
+
+import pandas as pd
+
+import excel_cache
+from excel_cache import META_DATEI, PARQUET_VERFUEGBAR, Sidecar, inhalt_hash, sidecar_aufraeumen
+
+BLAETTER = [f"Blatt{i}" for i in range(6)]
+
+
+def _mappe(wert=0, blaetter=BLAETTER):
+    puffer = io.BytesIO()
+    with pd.ExcelWriter(puffer) as schreiber:
+        for nr, name in enumerate(blaetter):
+            pd.DataFrame({"Ort": ["Leipzig", "Berlin"], "Wert": [wert, nr]}).to_excel(schreiber, sheet_name=name, index=False)
+    return puffer.getvalue()
+
+
+def _lade(auftrag):
+    pfad, ordner, blatt = auftrag
+    return len(Sidecar(pfad, ordner).lade_blatt(blatt))
+
+
+@unittest.skipUnless(PARQUET_VERFUEGBAR, "pyarrow fehlt")
+class SidecarTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.ordner = os.path.join(self._tmp.name, "sidecar")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_lade_blatt_ohne_vorher_blattnamen(self):
+        mappe = _mappe()
+        df = Sidecar(mappe, self.ordner).lade_blatt("Blatt2")
+        self.assertEqual(df["Ort"].tolist(), ["Leipzig", "Berlin"])
+        # Zweites Öffnen kommt aus der Parquet-Kopie
+        sidecar = Sidecar(mappe, self.ordner)
+        self.assertIsNotNone(sidecar._parquet_pfad("Blatt2"))
+        self.assertTrue(sidecar.lade_blatt(2).equals(df))
+
+    def test_parallel_gespeicherte_blaetter_landen_alle_in_der_meta(self):
+        pfad = os.path.join(self._tmp.name, "mappe.xlsx")
+        with open(pfad, "wb") as f:
+            f.write(_mappe())
+        with Pool(4) as pool:
+            pool.map(_lade, [(pfad, self.ordner, blatt) for blatt in BLAETTER] * 2)
+
+        sidecar = Sidecar(pfad, self.ordner)
+        self.assertEqual(sorted(sidecar.meta["dateien"]), BLAETTER)
+        for blatt in BLAETTER:
+            self.assertIsNotNone(sidecar._parquet_pfad(blatt))
+        self.assertEqual([name for name in os.listdir(sidecar.ordner) if name.endswith(".tmp")], [])
+        with open(os.path.join(sidecar.ordner, META_DATEI), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["blaetter"], BLAETTER)
+
+    def test_aufraeumen_behaelt_die_zuletzt_benutzten(self):
+        mappen = [_mappe(wert, ["Daten"]) for wert in range(5)]
+        for mappe in mappen:
+            Sidecar(mappe, self.ordner).lade_blatt(0)
+            time.sleep(0.02)
+        Sidecar(mappen[0], self.ordner)  # wieder benutzt → bleibt
+        sidecar_aufraeumen(self.ordner, max_mappen=2)
+        self.assertEqual(sorted(os.listdir(self.ordner)), sorted([inhalt_hash(mappen[0]), inhalt_hash(mappen[4])]))
+
+    def test_grenzen_zur_laufzeit(self):
+        # Die Grenzen werden beim Aufruf gelesen, nicht beim Import
+        alt = excel_cache.SIDECAR_MAX_MAPPEN
+        excel_cache.SIDECAR_MAX_MAPPEN = 1
+        try:
+            for wert in range(3):
+                Sidecar(_mappe(wert, ["Daten"]), self.ordner).lade_blatt(0)
+        finally:
+            excel_cache.SIDECAR_MAX_MAPPEN = alt
+        self.assertEqual(len(os.listdir(self.ordner)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Export der Suchergebnisse direkt in den Arbeitsspeicher (für st.download_button).
+
+Bisher wurde jedes Ergebnis zweimal auf die Festplatte geschrieben (gewähltes
+Format + letzte_suchergebnisse.xlsx über openpyxl) und danach wieder
+eingelesen. Hier:
+
+- CSV wird blockweise in einen BytesIO-Puffer geschrieben
+- XLSX wird Zeile für Zeile geschrieben – mit xlsxwriter im
+  constant_memory-Modus (schneller, falls installiert), sonst mit openpyxl
+  im write_only-Modus. Der Speicherbedarf wächst nicht mit der Anzahl der
+  Zellen wie beim normalen Arbeitsmappen-Modell
+- die "letzten Suchergebnisse" werden als Parquet gespeichert
+  (spaltenorientiert, um ein Vielfaches schneller als .xlsx)
+
+pip install pandas openpyxl pyarrow xlsxwriter   (xlsxwriter optional)
+"""
+
+import importlib.util
+import io
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+
+BLOCKGROESSE = 50_000
+DATUMSFORMAT = "yyyy-mm-dd hh:mm:ss"
+
+XLSXWRITER_VERFUEGBAR = importlib.util.find_spec("xlsxwriter") is not None
+
+MIME_TYPEN = {
+    "csv": "text/csv",
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+ENDUNGEN = {"csv": "csv", "excel": "xlsx"}
+
+
+def _bloecke(df, blockgroesse=BLOCKGROESSE):
+    for start in range(0, len(df), blockgroesse):
+        yield df.iloc[start:start + blockgroesse]
+
+
+def csv_bytes(df):
+    """CSV (UTF-8 mit BOM, öffnet direkt in Excel) als Bytes."""
+    puffer = io.BytesIO()
+    text = io.TextIOWrapper(puffer, encoding="utf-8-sig", newline="")
+    for nr, block in enumerate(_bloecke(df)):
+        block.to_csv(text, index=False, header=nr == 0)
+    if len(df) == 0:
+        df.to_csv(text, index=False)
+    text.flush()
+    return puffer.getvalue()
+
+
+def _zellwerte(block):
+    """Zeilen als Tupel; fehlende Werte (NaN/NaT) werden zu leeren Zellen."""
+    werte = block.astype(object).where(block.notna(), None)
+    return werte.itertuples(index=False, name=None)
+
+
+def xlsx_bytes(df, blattname="Suchergebnisse"):
+    """XLSX Zeile für Zeile (constant_memory bzw. write_only) als Bytes."""
+    puffer = io.BytesIO()
+    kopf = [str(spalte) for spalte in df.columns]
+    if XLSXWRITER_VERFUEGBAR:
+        import xlsxwriter
+        mappe = xlsxwriter.Workbook(puffer, {"constant_memory": True, "default_date_format": DATUMSFORMAT})
+        tabelle = mappe.add_worksheet(blattname)
+        tabelle.write_row(0, 0, kopf)
+        nr = 1
+        for block in _bloecke(df):
+            for zeile in _zellwerte(block):
+                tabelle.write_row(nr, 0, zeile)
+                nr += 1
+        mappe.close()
+    else:
+        mappe = Workbook(write_only=True)
+        tabelle = mappe.create_sheet(blattname)
+        tabelle.append(kopf)
+        for block in _bloecke(df):
+            for zeile in _zellwerte(block):
+                tabelle.append(zeile)
+        mappe.save(puffer)
+    return puffer.getvalue()
+
+
+def export_bytes(df, format="csv"):
+    """Ergebnis im gewählten Format ("csv" oder "excel") als Bytes."""
+    return csv_bytes(df) if format == "csv" else xlsx_bytes(df)
+
+
+def speichere_letzte_ergebnisse(df, pfad):
+    """Schnappschuss der letzten Ergebnisse als Parquet (atomar: temporäre Datei + Umbenennen)."""
+    os.makedirs(os.path.dirname(os.path.abspath(pfad)), exist_ok=True)
+    tmp_pfad = pfad + ".tmp"
+    # Spaltennamen müssen für Parquet Text sein
+    df = df.rename(columns=str)
+    try:
+        df.to_parquet(tmp_pfad, index=False)
+    except Exception:
+        # Spalten mit gemischten Typen (Zahl und Text) lassen sich nur als Text speichern
+        gemischt = [spalte for spalte in df.columns if pd.api.types.is_object_dtype(df[spalte])]
+        df.astype({spalte: str for spalte in gemischt}).to_parquet(tmp_pfad, index=False)
+    os.replace(tmp_pfad, pfad)
+
+
+def lade_letzte_ergebnisse(pfad):
+    return pd.read_parquet(pfad)
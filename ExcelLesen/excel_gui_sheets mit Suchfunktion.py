@@ -6,19 +6,35 @@ Excel-Datei auswählen
 → Es öffnet ein Dateidialog-Fenster.
 
 Dropdown-Menü mit allen Tabellenblättern
-→ Alle gefundenen Sheets werden automatisch geladen.
+→ Die Blattnamen kommen direkt aus der Arbeitsmappe (xl/workbook.xml),
+  ohne Zellen zu lesen.
 
 Anzeigen des ausgewählten Blattes
 → Zeigt die ersten 5 Zeilen des gewählten Sheets im Textfeld an."
+→ Das Blatt wird im Hintergrund geladen und im Arbeitsspeicher behalten
+  (höchstens BLATT_CACHE_MB) – ein zweites Mal anzeigen geht sofort.
 
 Suchfeld + Button, 
 → um Ergebnisse anzuzeigen
+→ Die Suche läuft im Hintergrund (Fortschrittsbalken, Abbrechen-Knopf),
+  das Fenster bleibt bedienbar. Gesucht wird spaltenweise wie in den
+  Streamlit-Tools (excel_suche.py).
+→ Treffer werden seitenweise angezeigt (◀ / ▶), die Gesamtzahl sofort.
 """
 
-"""pip install pandas openpyxl"""
-import pandas as pd
+"""pip install pandas openpyxl pyarrow"""
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+from excel_cache import DataFrameCache, blattnamen_aus_mappe as lese_blattnamen, lade_blatt
+from excel_suche import SucheAbgebrochen, suche_maske
+
+# So viele Trefferzeilen stehen gleichzeitig im Textfeld
+SEITENGROESSE = 200
+# Wie viel Arbeitsspeicher bereits geöffnete Blätter höchstens belegen dürfen
+BLATT_CACHE_MB = 512
 
 def lade_excel_datei():
     """Öffnet Dateidialog zum Auswählen einer Excel-Datei"""
@@ -33,8 +49,7 @@ def lade_excel_datei():
 def lade_tabellenblaetter(dateipfad):
     """Liest die Blattnamen und füllt das Dropdown-Menü"""
     try:
-        excel = pd.ExcelFile(dateipfad)
-        blattnamen = excel.sheet_names
+        blattnamen = lese_blattnamen(dateipfad)
 
         blatt_dropdown['values'] = blattnamen
         blatt_dropdown.set("Bitte Tabellenblatt wählen")
@@ -55,36 +70,163 @@ def zeige_ausgewaehltes_blatt():
         messagebox.showwarning("Warnung", "Bitte ein Tabellenblatt auswählen!")
         return
 
+    # Schlüssel mit Änderungszeit: wird die Datei neu gespeichert, wird das Blatt neu gelesen
     try:
-        global aktueller_df
-        aktueller_df = pd.read_excel(aktuelle_datei, sheet_name=blatt)
-        textfeld.delete("1.0", tk.END)
-        textfeld.insert(tk.END, f"--- 📑 Blatt: {blatt} ---\n\n")
-        textfeld.insert(tk.END, aktueller_df.head().to_string(index=False))
-    except Exception as e:
+        schluessel = (aktuelle_datei, os.path.getmtime(aktuelle_datei), blatt)
+    except OSError as e:
         messagebox.showerror("Fehler", f"Fehler beim Einlesen des Blatts:\n{e}")
+        return
+    df = blatt_cache.hole(schluessel)
+    if df is not None:
+        zeige_blatt(blatt, df)
+        return
+
+    anzeigen_button.config(state=tk.DISABLED)
+    status_label.config(text=f"⏳ Blatt '{blatt}' wird geladen …")
+    threading.Thread(target=_lade_im_hintergrund, args=(schluessel,), daemon=True).start()
+    root.after(100, pruefe_laden)
+
+def _lade_im_hintergrund(schluessel):
+    """Läuft im Worker-Thread – das Fenster bleibt während des Einlesens bedienbar."""
+    pfad, _, blatt = schluessel
+    try:
+        df = lade_blatt(pfad, blatt)
+        blatt_cache.speichere(schluessel, df)
+        lade_meldungen.put(("fertig", (schluessel, df)))
+    except Exception as e:
+        lade_meldungen.put(("fehler", e))
+
+def pruefe_laden():
+    """Holt das geladene Blatt ab (läuft im Tk-Hauptthread über root.after)"""
+    try:
+        art, inhalt = lade_meldungen.get_nowait()
+    except queue.Empty:
+        root.after(100, pruefe_laden)
+        return
+
+    anzeigen_button.config(state=tk.NORMAL)
+    status_label.config(text="")
+    if art == "fehler":
+        messagebox.showerror("Fehler", f"Fehler beim Einlesen des Blatts:\n{inhalt}")
+        return
+    (pfad, _, blatt), df = inhalt
+    if pfad == aktuelle_datei:  # Inzwischen wurde keine andere Datei gewählt
+        zeige_blatt(blatt, df)
+
+def zeige_blatt(blatt, df):
+    global aktueller_df
+    aktueller_df = df
+    zeige_treffer(None)
+    textfeld.delete("1.0", tk.END)
+    textfeld.insert(tk.END, f"--- 📑 Blatt: {blatt} ---\n\n")
+    textfeld.insert(tk.END, df.head().to_string(index=False))
 
 def suche_in_daten():
-    """Durchsucht das aktuell geladene Blatt nach einem Begriff"""
+    """Durchsucht das aktuell geladene Blatt nach einem Begriff (im Hintergrund-Thread)"""
+    global suche_abbruch
     if aktueller_df is None:
         messagebox.showwarning("Warnung", "Bitte zuerst ein Tabellenblatt anzeigen!")
         return
+    if suche_abbruch is not None:
+        return  # Es läuft schon eine Suche
 
     suchbegriff = suchfeld.get().strip()
     if not suchbegriff:
         messagebox.showinfo("Hinweis", "Bitte einen Suchbegriff eingeben.")
         return
 
-    # Suche: prüft, ob der Begriff in einer beliebigen Zelle vorkommt
-    mask = aktueller_df.apply(lambda row: row.astype(str).str.contains(suchbegriff, case=False, na=False)).any(axis=1)
-    treffer = aktueller_df[mask]
+    suche_abbruch = threading.Event()
+    such_button.config(state=tk.DISABLED)
+    abbrechen_button.config(state=tk.NORMAL)
+    fortschritt_balken["value"] = 0
+    status_label.config(text="⏳ Suche läuft …")
 
+    threading.Thread(
+        target=_suche_im_hintergrund,
+        args=(aktueller_df, suchbegriff, suche_abbruch),
+        daemon=True,
+    ).start()
+    root.after(100, pruefe_suche)
+
+def _suche_im_hintergrund(df, suchbegriff, abbruch):
+    """Läuft im Worker-Thread – greift nicht auf tkinter zu, sondern meldet über die Queue."""
+    try:
+        # Prüft, ob der Begriff in einer beliebigen Zelle vorkommt
+        mask = suche_maske(
+            df, [suchbegriff], df.columns.tolist(),
+            fortschritt=lambda erledigt, gesamt: suche_meldungen.put(("fortschritt", erledigt / gesamt)),
+            abbruch=abbruch,
+        )
+        suche_meldungen.put(("fertig", (suchbegriff, df[mask])))
+    except SucheAbgebrochen:
+        suche_meldungen.put(("abgebrochen", suchbegriff))
+    except Exception as e:
+        suche_meldungen.put(("fehler", e))
+
+def pruefe_suche():
+    """Holt Meldungen des Such-Threads ab (läuft im Tk-Hauptthread über root.after)"""
+    global suche_abbruch
+    while True:
+        try:
+            art, inhalt = suche_meldungen.get_nowait()
+        except queue.Empty:
+            root.after(100, pruefe_suche)
+            return
+
+        if art == "fortschritt":
+            fortschritt_balken["value"] = inhalt * 100
+            continue
+
+        suche_abbruch = None
+        such_button.config(state=tk.NORMAL)
+        abbrechen_button.config(state=tk.DISABLED)
+        fortschritt_balken["value"] = 0
+        status_label.config(text="")
+
+        if art == "fehler":
+            messagebox.showerror("Fehler", f"Fehler bei der Suche:\n{inhalt}")
+        elif art == "abgebrochen":
+            status_label.config(text=f"⛔ Suche nach '{inhalt}' abgebrochen.")
+        else:
+            suchbegriff, treffer = inhalt
+            if treffer.empty:
+                zeige_treffer(None)
+                textfeld.delete("1.0", tk.END)
+                textfeld.insert(tk.END, f"❌ Keine Treffer für '{suchbegriff}' gefunden.")
+            else:
+                zeige_treffer(treffer, suchbegriff)
+        return
+
+def zeige_treffer(treffer, suchbegriff=None, seite=0):
+    """Schreibt nur eine Seite der Treffer ins Textfeld (to_string über alles würde das Fenster blockieren)"""
+    global aktuelle_treffer, aktueller_suchbegriff, aktuelle_seite
+    aktuelle_treffer, aktuelle_seite = treffer, seite
+    if suchbegriff is not None:
+        aktueller_suchbegriff = suchbegriff
+    if treffer is None:
+        seiten_label.config(text="")
+        zurueck_button.config(state=tk.DISABLED)
+        weiter_button.config(state=tk.DISABLED)
+        return
+
+    anzahl_seiten = max(1, -(-len(treffer) // SEITENGROESSE))
+    start = seite * SEITENGROESSE
+    ende = min(start + SEITENGROESSE, len(treffer))
     textfeld.delete("1.0", tk.END)
-    if treffer.empty:
-        textfeld.insert(tk.END, f"❌ Keine Treffer für '{suchbegriff}' gefunden.")
-    else:
-        textfeld.insert(tk.END, f"🔍 Treffer für '{suchbegriff}':\n\n")
-        textfeld.insert(tk.END, treffer.to_string(index=False))
+    textfeld.insert(tk.END, f"🔍 {len(treffer):,} Treffer für '{aktueller_suchbegriff}' – Zeilen {start + 1:,}–{ende:,}:\n\n")
+    textfeld.insert(tk.END, treffer.iloc[start:ende].to_string(index=False))
+    seiten_label.config(text=f"Seite {seite + 1} von {anzahl_seiten:,}")
+    zurueck_button.config(state=tk.NORMAL if seite > 0 else tk.DISABLED)
+    weiter_button.config(state=tk.NORMAL if seite + 1 < anzahl_seiten else tk.DISABLED)
+
+def blaettern(richtung):
+    if aktuelle_treffer is not None:
+        zeige_treffer(aktuelle_treffer, seite=aktuelle_seite + richtung)
+
+def suche_abbrechen():
+    if suche_abbruch is not None:
+        suche_abbruch.set()
+        status_label.config(text="⏳ Suche wird abgebrochen …")
 
 # Hauptfenster
 root = tk.Tk()
@@ -93,6 +235,13 @@ root.geometry("800x600")
 
 aktuelle_datei = None
 aktueller_df = None
+suche_abbruch = None           # threading.Event der laufenden Suche
+suche_meldungen = queue.Queue()  # Worker-Thread → Tk-Hauptthread
+lade_meldungen = queue.Queue()   # Lade-Thread → Tk-Hauptthread
+blatt_cache = DataFrameCache(BLATT_CACHE_MB * 1024 * 1024)
+aktuelle_treffer = None        # Ergebnis der letzten Suche, seitenweise angezeigt
+aktueller_suchbegriff = ""
+aktuelle_seite = 0
 
 # UI-Elemente
 tk.Label(root, text="Excel-Datei einlesen", font=("Arial", 14, "bold")).pack(pady=10)
@@ -105,7 +254,8 @@ dateipfad_label.pack(pady=5)
 blatt_dropdown = ttk.Combobox(root, state="readonly", width=50)
 blatt_dropdown.pack(pady=10)
 
-tk.Button(root, text="📊 Blatt anzeigen", command=zeige_ausgewaehltes_blatt).pack(pady=5)
+anzeigen_button = tk.Button(root, text="📊 Blatt anzeigen", command=zeige_ausgewaehltes_blatt)
+anzeigen_button.pack(pady=5)
 
 # Suchfeld
 suche_frame = tk.Frame(root)
@@ -114,7 +264,28 @@ suche_frame.pack(pady=10)
 tk.Label(suche_frame, text="🔍 Suchbegriff:").pack(side=tk.LEFT, padx=5)
 suchfeld = tk.Entry(suche_frame, width=40)
 suchfeld.pack(side=tk.LEFT, padx=5)
-tk.Button(suche_frame, text="Suchen", command=suche_in_daten).pack(side=tk.LEFT, padx=5)
+such_button = tk.Button(suche_frame, text="Suchen", command=suche_in_daten)
+such_button.pack(side=tk.LEFT, padx=5)
+abbrechen_button = tk.Button(suche_frame, text="Abbrechen", command=suche_abbrechen, state=tk.DISABLED)
+abbrechen_button.pack(side=tk.LEFT, padx=5)
+
+# Fortschritt der Suche
+fortschritt_frame = tk.Frame(root)
+fortschritt_frame.pack()
+fortschritt_balken = ttk.Progressbar(fortschritt_frame, length=300, mode="determinate", maximum=100)
+fortschritt_balken.pack(side=tk.LEFT, padx=5)
+status_label = tk.Label(fortschritt_frame, text="", fg="gray")
+status_label.pack(side=tk.LEFT, padx=5)
+
+# Blättern in den Treffern
+seiten_frame = tk.Frame(root)
+seiten_frame.pack()
+zurueck_button = tk.Button(seiten_frame, text="◀", command=lambda: blaettern(-1), state=tk.DISABLED)
+zurueck_button.pack(side=tk.LEFT, padx=5)
+seiten_label = tk.Label(seiten_frame, text="")
+seiten_label.pack(side=tk.LEFT, padx=5)
+weiter_button = tk.Button(seiten_frame, text="▶", command=lambda: blaettern(1), state=tk.DISABLED)
+weiter_button.pack(side=tk.LEFT, padx=5)
 
 # Textfeld zur Anzeige
 textfeld = tk.Text(root, wrap="none", width=100, height=25)
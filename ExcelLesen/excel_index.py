@@ -0,0 +1,138 @@
+"""
+Suchindex für ein geladenes Tabellenblatt (für wiederholte Suchen im selben Blatt).
+
+In den Streamlit-Tools gibt man meist einen Begriff nach dem anderen ein –
+ohne Index wird dabei jedes Mal jede Zelle neu in Text umgewandelt und
+durchsucht. Der Index wird einmal beim Laden aufgebaut:
+
+1. Wörterbuch: Jede Zelle wird in kleingeschriebenen Text umgewandelt,
+   gleiche Texte bekommen dieselbe Nummer (pd.factorize). Pro Zelle bleibt
+   nur diese Nummer übrig (Matrix Zeilen × Spalten). Gesucht wird danach nur
+   noch in den verschiedenen Texten, nicht in allen Zellen.
+2. Trigramme: Für jeden Text alle Ausschnitte aus 3 Zeichen → Liste der
+   Textnummern. Ein normaler Suchbegriff (kein regulärer Ausdruck) mit
+   mindestens 3 Zeichen muss alle seine Trigramme enthalten; nur diese
+   wenigen Kandidaten werden noch geprüft.
+
+Das Ergebnis ist dieselbe Maske wie bei excel_suche.suche_maske.
+Begriffe mit Sonderzeichen werden weiterhin als regulärer Ausdruck behandelt
+(dann über alle verschiedenen Texte statt über alle Zellen).
+
+pip install pandas
+"""
+
+import re
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Mehr verschiedene Texte → keine Trigramme (Aufbau würde zu lange dauern), nur Wörterbuch
+MAX_TRIGRAMM_TEXTE = 500_000
+
+REGEX_ZEICHEN = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def ist_regex(begriff):
+    """True, wenn der Begriff Zeichen mit Sonderbedeutung in regulären Ausdrücken enthält."""
+    return REGEX_ZEICHEN.search(begriff) is not None
+
+
+def trigramme(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SuchIndex:
+    """Wörterbuch + Trigramm-Index über alle Zellen eines DataFrames."""
+
+    def __init__(self, df):
+        start = time.perf_counter()
+        self.spalten = df.columns.tolist()
+        self.anzahl_zeilen = len(df)
+
+        # Erst pro Spalte, dann die Spalten-Wörterbücher zu einem gemeinsamen zusammenführen
+        spalten_codes = []
+        spalten_texte = []
+        for spalte in self.spalten:
+            codes, texte = pd.factorize(df[spalte].astype(str).str.lower())
+            spalten_codes.append(codes)
+            spalten_texte.append(np.asarray(texte, dtype=object))
+        alle_texte = np.concatenate(spalten_texte) if spalten_texte else np.array([], dtype=object)
+        gesamt_codes, self.texte = pd.factorize(alle_texte)
+        self.texte = np.asarray(self.texte, dtype=object)
+
+        self.codes = np.empty((self.anzahl_zeilen, len(self.spalten)), dtype=np.int32)
+        versatz = 0
+        for nr, (codes, texte) in enumerate(zip(spalten_codes, spalten_texte)):
+            # Leere Zellen (NaN) haben Code -1 und behalten ihn – sie passen zu keinem Begriff
+            self.codes[:, nr] = np.where(codes < 0, -1, gesamt_codes[versatz:versatz + len(texte)][codes])
+            versatz += len(texte)
+
+        self.trigramme = None
+        if len(self.texte) <= MAX_TRIGRAMM_TEXTE:
+            postings = defaultdict(list)
+            for nr, text in enumerate(self.texte):
+                for tri in trigramme(text):
+                    postings[tri].append(nr)
+            self.trigramme = {tri: np.array(nummern, dtype=np.int32) for tri, nummern in postings.items()}
+
+        self.aufbau_sekunden = time.perf_counter() - start
+
+    # -------------------------------
+    # Suchen
+    # -------------------------------
+    def _passende_texte(self, begriff):
+        """Nummern aller Texte, in denen der Begriff vorkommt."""
+        if ist_regex(begriff):
+            muster = re.compile(begriff, re.IGNORECASE)
+            return [nr for nr, text in enumerate(self.texte) if muster.search(text)]
+
+        begriff = begriff.lower()
+        if self.trigramme is None or len(begriff) < 3:
+            return [nr for nr, text in enumerate(self.texte) if begriff in text]
+
+        # Kandidaten = Schnittmenge der Trigramm-Listen, kürzeste zuerst
+        listen = [self.trigramme.get(tri) for tri in trigramme(begriff)]
+        if any(liste is None for liste in listen):
+            return []
+        listen.sort(key=len)
+        kandidaten = listen[0]
+        for liste in listen[1:]:
+            kandidaten = np.intersect1d(kandidaten, liste, assume_unique=True)
+            if len(kandidaten) == 0:
+                return []
+        # Trigramme können auch verstreut vorkommen → Kandidaten noch einmal prüfen
+        return [nr for nr in kandidaten if begriff in self.texte[nr]]
+
+    def maske(self, suchbegriffe, spalten=None):
+        """True für jede Zeile, in der mindestens ein Begriff in einer der Spalten vorkommt."""
+        if not suchbegriffe or self.anzahl_zeilen == 0:
+            return np.zeros(self.anzahl_zeilen, dtype=bool)
+        # Ein Eintrag mehr als Texte: Code -1 (leere Zelle) landet dort und ist immer False
+        passend = np.zeros(len(self.texte) + 1, dtype=bool)
+        for begriff in suchbegriffe:
+            passend[self._passende_texte(begriff)] = True
+
+        spalten_nr = [self.spalten.index(s) for s in (spalten if spalten is not None else self.spalten)]
+        if not spalten_nr:
+            return np.zeros(self.anzahl_zeilen, dtype=bool)
+        return passend[self.codes[:, spalten_nr]].any(axis=1)
+
+    def suche(self, df, suchbegriffe, spalten=None):
+        """Die Trefferzeilen von df (muss der DataFrame sein, über den der Index gebaut wurde)."""
+        return df[self.maske(suchbegriffe, spalten)]
+
+    # -------------------------------
+    # Kennzahlen für die Anzeige
+    # -------------------------------
+    def speicher(self):
+        """Ungefährer Speicherbedarf des Index in Bytes."""
+        groesse = self.codes.nbytes + self.texte.nbytes + sum(len(text) + 49 for text in self.texte)
+        if self.trigramme:
+            groesse += sum(liste.nbytes + 112 for liste in self.trigramme.values())
+        return groesse
+
+    def __len__(self):
+        """Anzahl verschiedener Texte im Index."""
+        return len(self.texte)
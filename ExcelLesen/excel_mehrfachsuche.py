@@ -0,0 +1,182 @@
+"""
+Suche über alle Tabellenblätter aller Excel-Dateien eines Ordners.
+
+Beispiel: "In welchen Mappen und auf welchen Blättern taucht Debitorenkonto
+3001300 auf?" Jedes Blatt ist ein eigener Auftrag; die Aufträge werden über
+einen Prozess-Pool verteilt (wie die PDF-Batch-Skripte), sodass mehrere Blätter
+gleichzeitig eingelesen und durchsucht werden. Die Treffer werden zu einer
+Tabelle zusammengeführt, mit drei Spalten vorneweg:
+
+- Arbeitsmappe  (Dateiname)
+- Blatt         (Blattname)
+- Zeile         (Zeilennummer in Excel; die Kopfzeile ist Zeile 1, so wie
+                 lade_blatt sie mit read_excel(header=0) einliest – leere
+                 Zeilen davor und dazwischen zählen mit)
+
+Eingelesen wird über excel_cache.py – ab dem zweiten Lauf kommen die Blätter
+aus dem Parquet-Sidecar. Gesucht wird mit excel_suche.py (wie in den Streamlit-Tools).
+
+Nutzung:
+python excel_mehrfachsuche.py 3001300
+python excel_mehrfachsuche.py 3001300 leipzig --ordner C:\\Daten\\Controlling --ausgabe treffer.xlsx
+python excel_mehrfachsuche.py 3001300 --dateien a.xlsx b.xlsx --spalten Debitorenkonto --prozesse 4
+
+pip install pandas openpyxl pyarrow
+"""
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from excel_cache import blattnamen, lade_blatt
+from excel_suche import suche_maske
+
+HERKUNFT_SPALTEN = ["Arbeitsmappe", "Blatt", "Zeile"]
+
+# Excel-Zeile der Kopfzeile beim Einlesen (read_excel(header=0) in excel_cache.lade_blatt)
+KOPFZEILE = 1
+
+# Werden pro Prozess von _init_worker gesetzt
+_suchbegriffe = []
+_spalten = None
+
+
+def _init_worker(suchbegriffe, spalten):
+    """Wird einmal pro Pool-Prozess aufgerufen."""
+    global _suchbegriffe, _spalten
+    _suchbegriffe = suchbegriffe
+    _spalten = spalten
+
+
+def _durchsuche_blatt(auftrag):
+    """Lädt ein Blatt und sucht darin. Gibt (nr, pfad, blatt, treffer, zeilen, fehler) zurück."""
+    nr, pfad, blatt = auftrag
+    try:
+        df = lade_blatt(pfad, blatt)
+        spalten = df.columns.tolist() if _spalten is None else [s for s in _spalten if s in df.columns]
+        maske = suche_maske(df, _suchbegriffe, spalten)
+        treffer = df[maske]
+        if not treffer.empty:
+            treffer = treffer.copy()
+            # Position im Blatt statt Index-Label: erste Datenzeile liegt direkt unter der Kopfzeile
+            treffer.insert(0, "Zeile", np.flatnonzero(maske.to_numpy()) + KOPFZEILE + 1)
+            treffer.insert(0, "Blatt", blatt)
+            treffer.insert(0, "Arbeitsmappe", os.path.basename(pfad))
+        return nr, pfad, blatt, treffer, len(df), None
+    except Exception as e:
+        return nr, pfad, blatt, None, 0, str(e)
+
+
+def excel_dateien(ordner):
+    """Alle .xlsx/.xlsm-Dateien im Ordner (ohne Excel-Sperrdateien ~$…)."""
+    return [
+        os.path.join(ordner, name) for name in sorted(os.listdir(ordner))
+        if name.lower().endswith((".xlsx", ".xlsm")) and not name.startswith("~$")
+    ]
+
+
+def blatt_auftraege(pfade):
+    """Ein Auftrag (nr, pfad, blattname) je Blatt aller Arbeitsmappen."""
+    blaetter = []
+    for pfad in pfade:
+        try:
+            blaetter.extend((pfad, blatt) for blatt in blattnamen(pfad))
+        except Exception as e:
+            print(f"❌ {os.path.basename(pfad)} kann nicht geöffnet werden: {e}")
+    return [(nr, pfad, blatt) for nr, (pfad, blatt) in enumerate(blaetter)]
+
+
+def suche_in_mappen(pfade, suchbegriffe, spalten=None, anzahl_prozesse=None):
+    """
+    Durchsucht alle Blätter der angegebenen Arbeitsmappen parallel.
+    spalten: nur diese Spalten durchsuchen (None = alle); fehlen sie in einem Blatt, werden sie ignoriert.
+    anzahl_prozesse: None = alle CPU-Kerne, 1 = nacheinander im selben Prozess.
+    Gibt (treffer_df, anzahl_zeilen) zurück.
+    """
+    start = time.perf_counter()
+    auftraege = blatt_auftraege(pfade)
+    gefunden = []
+    anzahl_zeilen = 0
+
+    pool = None
+    if anzahl_prozesse != 1 and len(auftraege) > 1:
+        pool = Pool(anzahl_prozesse, initializer=_init_worker, initargs=(suchbegriffe, spalten))
+    else:
+        _init_worker(suchbegriffe, spalten)
+    try:
+        if pool is not None:
+            # Große und kleine Blätter gemischt → fertige Blätter sofort abholen
+            ergebnisse = pool.imap_unordered(_durchsuche_blatt, auftraege)
+        else:
+            ergebnisse = map(_durchsuche_blatt, auftraege)
+
+        for nr, pfad, blatt, treffer, zeilen, fehler in ergebnisse:
+            name = f"{os.path.basename(pfad)} / {blatt}"
+            if fehler:
+                print(f"❌ {name}: {fehler}")
+                continue
+            anzahl_zeilen += zeilen
+            if not treffer.empty:
+                print(f"🔍 {name}: {len(treffer)} Treffer")
+                gefunden.append((nr, treffer))
+        if pool is not None:
+            pool.close()
+            pool.join()
+            pool = None
+    finally:
+        if pool is not None:
+            # Ausnahme oder Strg+C: restliche Blätter nicht mehr durchsuchen
+            pool.terminate()
+            pool.join()
+
+    if gefunden:
+        # Reihenfolge wie in den Dateien, unabhängig davon, welches Blatt zuerst fertig war
+        ergebnis = pd.concat([treffer for _, treffer in sorted(gefunden, key=lambda x: x[0])], ignore_index=True)
+    else:
+        ergebnis = pd.DataFrame(columns=HERKUNFT_SPALTEN)
+
+    dauer = time.perf_counter() - start
+    print(
+        f"\n✅ {len(ergebnis)} Treffer in {len(auftraege)} Blättern aus {len(pfade)} Dateien, "
+        f"{anzahl_zeilen:,} Zeilen in {dauer:.1f} s ({anzahl_zeilen / max(dauer, 1e-9):,.0f} Zeilen/s)"
+    )
+    return ergebnis, anzahl_zeilen
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("begriffe", nargs="+", help="Suchbegriffe (mind. einer muss vorkommen)")
+    parser.add_argument("--ordner", default=".", help="alle Excel-Dateien in diesem Ordner durchsuchen")
+    parser.add_argument("--dateien", nargs="+", default=None, help="stattdessen nur diese Dateien")
+    parser.add_argument("--spalten", nargs="+", default=None, help="nur in diesen Spalten suchen")
+    parser.add_argument("--prozesse", type=int, default=None, help="Standard: alle CPU-Kerne")
+    parser.add_argument("--ausgabe", default=None, help="Treffer als .csv oder .xlsx speichern")
+    args = parser.parse_args(argumente)
+
+    pfade = args.dateien or excel_dateien(args.ordner)
+    if not pfade:
+        print(f"❌ Keine Excel-Dateien in '{args.ordner}' gefunden.")
+        return 1
+
+    ergebnis, _ = suche_in_mappen(pfade, args.begriffe, args.spalten, args.prozesse)
+    if ergebnis.empty:
+        return 0
+    if args.ausgabe:
+        if args.ausgabe.lower().endswith(".csv"):
+            ergebnis.to_csv(args.ausgabe, index=False, encoding="utf-8-sig")
+        else:
+            ergebnis.to_excel(args.ausgabe, index=False)
+        print(f"💾 Gespeichert in {args.ausgabe}")
+    else:
+        print(ergebnis.to_string(index=False))
+    print(f"ℹ️ Zeile = Zeilennummer in Excel, gezählt mit der Kopfzeile in Zeile {KOPFZEILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
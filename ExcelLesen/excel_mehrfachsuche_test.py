@@ -0,0 +1,54 @@
+"""
+Tests für excel_mehrfachsuche.py.
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from openpyxl import Workbook
+
+import excel_mehrfachsuche
+from excel_cache import PARQUET_VERFUEGBAR, Sidecar
+
+
+@unittest.skipUnless(PARQUET_VERFUEGBAR, "pyarrow fehlt")
+class MehrfachsucheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pfad = os.path.join(self._tmp.name, "mappe.xlsx")
+        sidecar_ordner = os.path.join(self._tmp.name, "sidecar")
+        lade = mock.patch.object(
+            excel_mehrfachsuche, "lade_blatt", lambda pfad, blatt: Sidecar(pfad, sidecar_ordner).lade_blatt(blatt)
+        )
+        lade.start()
+        self.addCleanup(lade.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_zeile_ist_die_excel_zeile(self):
+        mappe = Workbook()
+        blatt = mappe.active
+        blatt.title = "Daten"
+        blatt["A1"], blatt["B1"] = "Ort", "Konto"
+        blatt["A2"], blatt["B2"] = "Berlin", 1
+        # Zeile 3 bleibt leer
+        blatt["A4"], blatt["B4"] = "Leipzig", 3001300
+        blatt["A7"], blatt["B7"] = "Leipzig", 2
+        mappe.save(self.pfad)
+
+        excel_mehrfachsuche._init_worker(["leipzig"], None)
+        for _ in range(2):  # Excel, dann Parquet-Sidecar
+            _, _, _, treffer, _, fehler = excel_mehrfachsuche._durchsuche_blatt((0, self.pfad, "Daten"))
+            self.assertIsNone(fehler)
+            self.assertEqual(treffer["Zeile"].tolist(), [4, 7])
+            for zeile, ort in zip(treffer["Zeile"], treffer["Ort"]):
+                self.assertEqual(blatt.cell(zeile, 1).value, ort)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Durchsucht sehr große Excel-Blätter, ohne sie komplett in den Speicher zu laden.
+
+pd.read_excel baut immer den ganzen DataFrame auf – ein Export mit 2 Mio. Zeilen
+passt so oft nicht mehr in den Arbeitsspeicher. Hier wird das Blatt mit openpyxl
+im read_only-Modus Zeile für Zeile gelesen, in Blöcken fester Größe (Standard
+50.000 Zeilen) zu kleinen DataFrames gemacht und jeder Block mit denselben
+Filtern wie in den Streamlit-Tools geprüft (excel_suche.py):
+
+- Textsuche über mehrere Begriffe
+- Zahlenbereich je Spalte
+- Datumsbereich je Spalte
+
+Treffer werden sofort ausgegeben bzw. an die Ergebnisdatei angehängt,
+der Speicherbedarf hängt nur von der Blockgröße ab.
+
+Nutzung:
+python excel_stream.py export.xlsx leipzig 3001300
+python excel_stream.py export.xlsx leipzig --blatt Daten --spalten Kunde Ort --ausgabe treffer.csv
+python excel_stream.py export.xlsx --zahl Betrag 1000 5000 --datum Datum 2024-01-01 2024-03-31
+
+pip install pandas openpyxl
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from excel_suche import filter_maske, suche_maske
+
+BLOCKGROESSE = 50_000
+
+
+def _zellwert(wert):
+    """Wie pd.read_excel: ganzzahlige Kommazahlen werden zu int."""
+    if isinstance(wert, float) and wert.is_integer():
+        return int(wert)
+    return wert
+
+
+def _spaltennamen(kopfzeile):
+    """
+    Wie pd.read_excel: leere Namen werden "Unnamed: i", doppelte "Name", "Name.1",
+    "Name.2", … (ohne einen Namen zu erzeugen, den es in der Kopfzeile schon gibt).
+    Sonst überschreiben sich gleichnamige Spalten gegenseitig.
+    """
+    namen = [f"Unnamed: {i}" if name is None or name == "" else name for i, name in enumerate(kopfzeile)]
+    unbenannt = [i for i, name in enumerate(kopfzeile) if name is None or name == ""]
+    anzahl = {}
+    # Benannte Spalten zuerst, damit sie ihren Namen behalten
+    for i in [i for i in range(len(namen)) if i not in unbenannt] + unbenannt:
+        name = basis = namen[i]
+        bisher = anzahl.get(name, 0)
+        while bisher > 0:
+            anzahl[basis] = bisher + 1
+            name = f"{basis}.{bisher}"
+            bisher = bisher + 1 if name in namen else anzahl.get(name, 0)
+        namen[i] = name
+        anzahl[name] = bisher + 1
+    return namen
+
+
+def zeilen_bloecke(quelle, blatt=None, blockgroesse=BLOCKGROESSE):
+    """
+    Liest ein Blatt (Name, Index oder None = erstes Blatt) blockweise.
+    Die erste Zeile ist die Kopfzeile. Gibt DataFrames mit je höchstens
+    blockgroesse Zeilen zurück; der Index zählt fortlaufend über alle Blöcke.
+    """
+    mappe = load_workbook(quelle, read_only=True, data_only=True)
+    try:
+        if blatt is None:
+            tabelle = mappe.worksheets[0]
+        elif isinstance(blatt, int):
+            tabelle = mappe.worksheets[blatt]
+        else:
+            tabelle = mappe[blatt]
+
+        zeilen = tabelle.iter_rows(values_only=True)
+        kopfzeile = next(zeilen, None)
+        if kopfzeile is None:
+            return
+        spalten = _spaltennamen(kopfzeile)
+        breite = len(spalten)
+
+        block = []
+        start = 0
+        for zeile in zeilen:
+            if all(wert is None for wert in zeile):
+                continue
+            werte = [_zellwert(wert) for wert in zeile[:breite]]
+            werte.extend([None] * (breite - len(werte)))
+            block.append(werte)
+            if len(block) >= blockgroesse:
+                yield pd.DataFrame(block, columns=spalten, index=range(start, start + len(block)))
+                start += len(block)
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=spalten, index=range(start, start + len(block)))
+    finally:
+        mappe.close()
+
+
+def block_maske(df, suchbegriffe=None, spalten=None, zahlen_filter=None, datum_filter=None):
+    """
+    Alle Filter für einen Block:
+    zahlen_filter = {spalte: (min, max)}, datum_filter = {spalte: (start, ende)}
+    """
+    text_maske = suche_maske(df, suchbegriffe, spalten or df.columns.tolist()) if suchbegriffe else None
+    return filter_maske(df, text_maske, zahlen_filter, datum_filter)
+
+
+def stream_suche(quelle, suchbegriffe=None, spalten=None, zahlen_filter=None, datum_filter=None,
+                 blatt=None, blockgroesse=BLOCKGROESSE, fortschritt=None):
+    """
+    Generator: liefert pro Block die Treffer als DataFrame (leere Blöcke werden übersprungen).
+    fortschritt(gelesene_zeilen) wird nach jedem Block aufgerufen, falls angegeben.
+    """
+    gelesen = 0
+    for block in zeilen_bloecke(quelle, blatt, blockgroesse):
+        treffer = block[block_maske(block, suchbegriffe, spalten, zahlen_filter, datum_filter)]
+        gelesen += len(block)
+        if fortschritt:
+            fortschritt(gelesen)
+        if not treffer.empty:
+            yield treffer
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("datei")
+    parser.add_argument("begriffe", nargs="*", help="Suchbegriffe (mind. einer muss vorkommen)")
+    parser.add_argument("--blatt", default=None, help="Blattname (Standard: erstes Blatt)")
+    parser.add_argument("--spalten", nargs="+", default=None, help="nur in diesen Spalten suchen")
+    parser.add_argument("--zahl", nargs=3, action="append", default=[], metavar=("SPALTE", "MIN", "MAX"))
+    parser.add_argument("--datum", nargs=3, action="append", default=[], metavar=("SPALTE", "VON", "BIS"))
+    parser.add_argument("--blockgroesse", type=int, default=BLOCKGROESSE)
+    parser.add_argument("--ausgabe", default=None, help="Treffer als CSV speichern statt anzeigen")
+    args = parser.parse_args(argumente)
+
+    if not os.path.exists(args.datei):
+        print(f"❌ Datei '{args.datei}' wurde nicht gefunden.")
+        return 1
+
+    filter_argumente = {
+        "suchbegriffe": args.begriffe,
+        "spalten": args.spalten,
+        "zahlen_filter": {spalte: (float(von), float(bis)) for spalte, von, bis in args.zahl},
+        "datum_filter": {spalte: (von, bis) for spalte, von, bis in args.datum},
+        "blatt": args.blatt,
+        "blockgroesse": args.blockgroesse,
+    }
+
+    start = time.perf_counter()
+    gelesen = 0
+    anzahl = 0
+
+    def fortschritt(zeilen):
+        nonlocal gelesen
+        gelesen = zeilen
+
+    ausgabe = open(args.ausgabe, "w", encoding="utf-8-sig", newline="") if args.ausgabe else None
+    try:
+        for treffer in stream_suche(args.datei, fortschritt=fortschritt, **filter_argumente):
+            # Treffer sofort weitergeben; in der CSV nur eine Kopfzeile, auf dem
+            # Bildschirm über jedem Block (die Spaltenbreiten sind je Block anders)
+            if ausgabe:
+                treffer.to_csv(ausgabe, index=False, header=anzahl == 0)
+            else:
+                print(treffer.to_string())
+            anzahl += len(treffer)
+    finally:
+        if ausgabe:
+            ausgabe.close()
+    dauer = time.perf_counter() - start
+
+    print(f"\n✅ {anzahl} Treffer in {gelesen:,} Zeilen ({dauer:.1f} s, {gelesen / max(dauer, 1e-9):,.0f} Zeilen/s)")
+    if args.ausgabe:
+        print(f"💾 Gespeichert in {args.ausgabe}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
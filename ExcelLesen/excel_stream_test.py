@@ -0,0 +1,63 @@
+"""
+Tests für excel_stream.py.
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+from openpyxl import Workbook
+
+from excel_stream import _spaltennamen, main, stream_suche, zeilen_bloecke
+
+
+class ExcelStreamTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pfad = os.path.join(self._tmp.name, "export.xlsx")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _mappe(self, kopf, zeilen):
+        mappe = Workbook()
+        blatt = mappe.active
+        blatt.append(kopf)
+        for zeile in zeilen:
+            blatt.append(zeile)
+        mappe.save(self.pfad)
+
+    def test_spaltennamen_wie_read_excel(self):
+        for kopf in (
+            ["Name", "Name", None, "Name.1", "Name", "Ort", None],
+            ["a", "a", "a.1", "a", None, "Unnamed: 4", None, "a.2"],
+            [1, 1, "x", "x.1", "x"],
+        ):
+            with self.subTest(kopf=kopf):
+                self._mappe(kopf, [list(range(len(kopf)))] * 3)
+                erwartet = pd.read_excel(self.pfad)
+                self.assertEqual(_spaltennamen(kopf), list(erwartet.columns))
+                self.assertTrue(pd.concat(zeilen_bloecke(self.pfad, blockgroesse=2)).equals(erwartet))
+
+    def test_gleichnamige_spalten_werden_beide_durchsucht(self):
+        self._mappe(["Ort", "Ort"], [["leipzig", "berlin"], ["berlin", "leipzig"], ["berlin", "berlin"]])
+        treffer = pd.concat(stream_suche(self.pfad, ["leipzig"], blockgroesse=1))
+        self.assertEqual(treffer.index.tolist(), [0, 1])
+
+    def test_kopfzeile_ueber_jedem_block(self):
+        self._mappe(["Ort", "Nr"], [["leipzig" if i < 3 else "berlin", i] for i in range(9)])
+        ausgabe = io.StringIO()
+        with contextlib.redirect_stdout(ausgabe):
+            main([self.pfad, "leipzig", "--blockgroesse", "2"])
+        text = ausgabe.getvalue()
+        self.assertEqual(text.count("Ort"), 2)
+        self.assertIn("3 Treffer in 9 Zeilen", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Gemeinsame Suchfunktionen für die Excel-Tools (Streamlit und tkinter).
+
+Bisher wurde für jeden Suchbegriff und jede Spalte einzeln
+df[spalte].astype(str).str.contains(begriff) aufgerufen –
+bei 10 Begriffen × 40 Spalten also 400 komplette Umwandlungen und Durchläufe.
+
+Hier werden alle Begriffe zu EINEM regulären Ausdruck (Alternation) verbunden
+und jede Spalte genau einmal in Text umgewandelt und durchsucht.
+Das Ergebnis ist dieselbe Maske wie vorher: Begriffe werden weiterhin als
+reguläre Ausdrücke ohne Beachtung der Groß-/Kleinschreibung behandelt.
+
+zahlen_maske und datum_maske sind die Bereichsfilter der Filter-App als
+reine Masken, damit sie auch blockweise (excel_stream.py) nutzbar sind.
+filter_maske verknüpft Textsuche und alle Bereichsfilter zu EINER Maske –
+ohne Zwischen-DataFrames nach jedem Filter.
+
+pip install pandas
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def suchmuster(suchbegriffe):
+    """Verbindet alle Begriffe zu einem Muster: (?:begriff1)|(?:begriff2)|…"""
+    return "|".join(f"(?:{begriff})" for begriff in suchbegriffe)
+
+
+class SucheAbgebrochen(Exception):
+    """Die Suche wurde über das abbruch-Event beendet (z. B. Abbrechen-Knopf in der GUI)."""
+
+
+def suche_maske(df, suchbegriffe, spalten, fortschritt=None, abbruch=None):
+    """
+    True für jede Zeile, in der mindestens ein Begriff in einer der Spalten vorkommt.
+    fortschritt(erledigt, gesamt) wird nach jeder Spalte aufgerufen;
+    ist abbruch (threading.Event) gesetzt, endet die Suche mit SucheAbgebrochen.
+    """
+    maske = np.zeros(len(df), dtype=bool)
+    if suchbegriffe:
+        muster = suchmuster(suchbegriffe)
+        for nr, spalte in enumerate(spalten, start=1):
+            if abbruch is not None and abbruch.is_set():
+                raise SucheAbgebrochen()
+            # Zeilen, die schon einen Treffer haben, müssen nicht mehr geprüft werden
+            offen = np.flatnonzero(~maske)
+            if len(offen) == 0:
+                break
+            werte = df[spalte].iloc[offen] if len(offen) < len(df) else df[spalte]
+            maske[offen] = werte.astype(str).str.contains(muster, case=False, na=False).to_numpy(dtype=bool)
+            if fortschritt:
+                fortschritt(nr, len(spalten))
+    return pd.Series(maske, index=df.index)
+
+
+def zahlen_maske(serie, min_wert=None, max_wert=None):
+    """True, wenn der Wert zwischen min_wert und max_wert liegt (None = offen). Nicht-Zahlen → False."""
+    werte = serie if pd.api.types.is_numeric_dtype(serie) else pd.to_numeric(serie, errors="coerce")
+    maske = werte.notna()
+    if min_wert is not None:
+        maske &= werte >= min_wert
+    if max_wert is not None:
+        maske &= werte <= max_wert
+    return maske
+
+
+def datum_maske(serie, start=None, ende=None):
+    """True, wenn das Datum zwischen start und ende liegt (None = offen). Die Spalte wird nicht verändert."""
+    werte = serie if pd.api.types.is_datetime64_any_dtype(serie) else pd.to_datetime(serie, errors="coerce")
+    maske = werte.notna()
+    if start is not None:
+        maske &= werte >= pd.to_datetime(start)
+    if ende is not None:
+        maske &= werte <= pd.to_datetime(ende)
+    return maske
+
+
+def filter_maske(df, text_maske=None, zahlen_filter=None, datum_filter=None):
+    """
+    Eine Maske für alle Filter:
+    text_maske = Ergebnis der Textsuche (oder None), zahlen_filter = {spalte: (min, max)},
+    datum_filter = {spalte: (start, ende)}.
+    Jeder weitere Filter prüft nur noch die Zeilen, die bis dahin übrig sind.
+    """
+    maske = np.ones(len(df), dtype=bool) if text_maske is None else np.asarray(text_maske, dtype=bool).copy()
+    filter_liste = [(zahlen_maske, spalte, grenzen) for spalte, grenzen in (zahlen_filter or {}).items()]
+    filter_liste += [(datum_maske, spalte, grenzen) for spalte, grenzen in (datum_filter or {}).items()]
+    for filter_funktion, spalte, (von, bis) in filter_liste:
+        offen = np.flatnonzero(maske)
+        if len(offen) == 0:
+            break
+        werte = df[spalte].iloc[offen] if len(offen) < len(df) else df[spalte]
+        maske[offen] = filter_funktion(werte, von, bis).to_numpy(dtype=bool)
+    return maske
@@ -0,0 +1,36 @@
+"""
+Tests für excel_suche.py und den SuchIndex aus excel_index.py.
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import unittest
+
+from benchmark_suche import alte_suche_maske, testdaten
+from excel_index import SuchIndex
+from excel_suche import suche_maske
+
+SUCHBEGRIFFE = ["rechnung", "leipzig", "3001300", "2023-12", "storn", "infra", "mahn", "1234", "abschlag", "xyz"]
+
+
+class SucheMaskeTest(unittest.TestCase):
+    def setUp(self):
+        self.df = testdaten(2_000, 12)
+        self.spalten = self.df.columns.tolist()
+
+    def test_gleiche_maske_wie_alte_suche(self):
+        for begriffe in [SUCHBEGRIFFE] + [[begriff] for begriff in SUCHBEGRIFFE]:
+            with self.subTest(begriffe=begriffe):
+                erwartet = alte_suche_maske(self.df, begriffe, self.spalten)
+                self.assertTrue(suche_maske(self.df, begriffe, self.spalten).equals(erwartet))
+
+    def test_index_findet_dieselben_zeilen(self):
+        index = SuchIndex(self.df)
+        for begriffe in ([SUCHBEGRIFFE[0]], SUCHBEGRIFFE[:4], ["xyz"]):
+            with self.subTest(begriffe=begriffe):
+                erwartet = suche_maske(self.df, begriffe, self.spalten).to_numpy()
+                self.assertTrue((index.maske(begriffe, self.spalten) == erwartet).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
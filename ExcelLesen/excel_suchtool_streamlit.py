@@ -14,8 +14,10 @@ Das Skript nutzt pandas (Standardbibliothek für Datenanalyse in Python).
 Nutzung
 
 - Datei speichern, z. B. als excel_suchtool.py
+- excel_suche.py, excel_cache.py, excel_index.py, excel_typen.py, excel_export.py
+  und excel_verlauf.py müssen im selben Ordner liegen
 - Abhängigkeiten installieren:
-- pip install streamlit pandas openpyxl
+- pip install streamlit pandas openpyxl pyarrow
 
 Starten:
 
@@ -24,43 +26,118 @@ Browser öffnet sich automatisch (Standard: http://localhost:8501
 )
 """
 
-import streamlit as st
-import pandas as pd
 import os
+import streamlit as st
+import time
 from datetime import datetime
+from excel_cache import DataFrameCache, inhalt_hash, lade_blatt
+from excel_export import ENDUNGEN, MIME_TYPEN, export_bytes, lade_letzte_ergebnisse, speichere_letzte_ergebnisse
+from excel_index import SuchIndex
+from excel_typen import kompaktiere
+from excel_verlauf import SuchVerlauf
 
 # -------------------------------
 # Einstellungen
 # -------------------------------
-ERGEBNIS_DATEI = "letzte_suchergebnisse.xlsx"
+# Hierhin schreibt das Tool seine Dateien – neben dem Skript, unabhängig vom Startordner (nicht im Git)
+DATEN_ORDNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "daten")
+# Schnappschuss der letzten Ergebnisse (Parquet statt .xlsx – viel schneller zu schreiben und zu lesen)
+ERGEBNIS_DATEI = os.path.join(DATEN_ORDNER, "letzte_suchergebnisse.parquet")
+# Suchverlauf: Begriffe, Filter, Trefferzahl und Vorschau jeder Suche
+VERLAUF_DATEI = os.path.join(DATEN_ORDNER, "suchverlauf.sqlite")
+VERLAUF_ANZEIGEN = 5
+# Wie viel Arbeitsspeicher eingelesene Tabellen höchstens belegen dürfen
+MAX_CACHE_MB = 1024
+# Kleinere Datentypen nach dem Laden (category, int8/16/32, float32, Arrow-Text), siehe excel_typen.py
+KOMPAKTE_TYPEN = True
+# So viele Trefferzeilen werden auf einmal angezeigt
+SEITENGROESSE = 500
 
 # -------------------------------
 # Hilfsfunktionen
 # -------------------------------
+@st.cache_resource
+def tabellen_cache():
+    """Ein Cache für alle Sitzungen, überlebt die Neuausführung des Skripts."""
+    return DataFrameCache(MAX_CACHE_MB * 1024 * 1024)
+
+@st.cache_resource
+def suchverlauf():
+    return SuchVerlauf(VERLAUF_DATEI)
+
 def lade_excel(uploaded_file):
-    try:
-        df = pd.read_excel(uploaded_file)
-        st.success(f"Datei '{uploaded_file.name}' erfolgreich geladen.")
-        return df
-    except Exception as e:
-        st.error(f"Fehler beim Laden der Datei: {e}")
-        return None
-
-def suche_dataframe(df, suchbegriffe, spalten):
-    mask = pd.Series([False] * len(df))
-    for begriff in suchbegriffe:
-        for spalte in spalten:
-            mask |= df[spalte].astype(str).str.contains(begriff, case=False, na=False)
-    return df[mask]
+    """Gibt (DataFrame, SuchIndex) zurück – beides nur beim ersten Hochladen aufgebaut, danach aus dem Cache."""
+    inhalt = uploaded_file.getvalue()
+    schluessel = inhalt_hash(inhalt)
+    df = tabellen_cache().hole(schluessel)
+    if df is None:
+        try:
+            # Erstes Blatt; ab dem zweiten Öffnen derselben Datei aus dem Parquet-Sidecar
+            df = lade_blatt(inhalt, 0)
+        except Exception as e:
+            st.error(f"Fehler beim Laden der Datei: {e}")
+            return None, None
+        if KOMPAKTE_TYPEN:
+            df, vorher, nachher = kompaktiere(df)
+            df.attrs["speicher"] = (vorher, nachher)
+        tabellen_cache().speichere(schluessel, df)
+
+    such_index = tabellen_cache().hole(schluessel + ":index")
+    if such_index is None:
+        such_index = SuchIndex(df)
+        tabellen_cache().speichere(schluessel + ":index", such_index, such_index.speicher())
+    st.success(f"Datei '{uploaded_file.name}' erfolgreich geladen.")
+    if "speicher" in df.attrs:
+        vorher, nachher = df.attrs["speicher"]
+        st.caption(f"💾 Speicherbedarf der Tabelle: {vorher / 1024 ** 2:.1f} MB → {nachher / 1024 ** 2:.1f} MB (kompakte Datentypen)")
+    st.caption(
+        f"🗂️ Suchindex: {len(such_index):,} verschiedene Werte, "
+        f"aufgebaut in {such_index.aufbau_sekunden:.2f} s, {such_index.speicher() / 1024 ** 2:.1f} MB"
+    )
+    # Flache Kopie: Spaltenzuweisungen im Skript verändern nicht den Cache-Eintrag
+    return df.copy(deep=False), such_index
+
+def suche_dataframe(df, such_index, suchbegriffe, spalten):
+    # Antwort aus dem beim Laden aufgebauten Index, siehe excel_index.py
+    return such_index.suche(df, suchbegriffe, spalten)
+
+def zeige_seitenweise(ergebnisse):
+    """Zeigt nur eine Seite der Treffer – an den Browser geht nie die ganze Ergebnistabelle."""
+    anzahl_seiten = max(1, -(-len(ergebnisse) // SEITENGROESSE))
+    links, rechts = st.columns([1, 4])
+    seite = links.number_input("Seite", min_value=1, max_value=anzahl_seiten, step=1, key="ergebnis_seite")
+    start = (seite - 1) * SEITENGROESSE
+    ende = min(start + SEITENGROESSE, len(ergebnisse))
+    rechts.caption(f"Zeilen {start + 1:,}–{ende:,} von {len(ergebnisse):,} (Seite {seite} von {anzahl_seiten:,})")
+    st.dataframe(ergebnisse.iloc[start:ende])
+
+def merke_ergebnisse(uploaded_file, ergebnisse, hinweis, suchbegriffe, filter):
+    """Treffer in der Sitzung ablegen (überleben das Blättern und den Export-Knopf) und in den Suchverlauf eintragen."""
+    st.session_state["ergebnisse"] = ergebnisse
+    st.session_state["ergebnisse_datei"] = uploaded_file.name
+    st.session_state["ergebnisse_hinweis"] = hinweis
+    st.session_state["ergebnis_seite"] = 1
+    suchverlauf().eintragen(uploaded_file.name, suchbegriffe, filter, ergebnisse)
 
 def exportiere_ergebnisse(df, format="csv"):
-    dateiname = f"suchergebnisse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
-    if format == "csv":
-        df.to_csv(dateiname, index=False, encoding="utf-8-sig")
-    else:
-        df.to_excel(dateiname, index=False)
-    df.to_excel(ERGEBNIS_DATEI, index=False)  # Automatische Speicherung
-    return dateiname
+    """Gibt (dateiname, bytes) zurück – nichts wird auf die Festplatte geschrieben außer dem Schnappschuss."""
+    dateiname = f"suchergebnisse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ENDUNGEN[format]}"
+    daten = export_bytes(df, format)
+    speichere_letzte_ergebnisse(df, ERGEBNIS_DATEI)  # Automatische Speicherung
+    return dateiname, daten
+
+def zeige_letzte_ergebnisse():
+    """Schnappschuss des letzten Exports wieder anzeigen – auch ohne hochgeladene Datei."""
+    if not os.path.exists(ERGEBNIS_DATEI):
+        return
+    st.divider()
+    gespeichert = datetime.fromtimestamp(os.path.getmtime(ERGEBNIS_DATEI))
+    if st.button(f"📂 Letzte Ergebnisse laden (exportiert {gespeichert:%d.%m.%Y %H:%M})"):
+        st.session_state["letzte_ergebnisse"] = lade_letzte_ergebnisse(ERGEBNIS_DATEI)
+    letzte = st.session_state.get("letzte_ergebnisse")
+    if letzte is not None:
+        st.caption(f"{len(letzte):,} Zeilen" + (f", angezeigt die ersten {SEITENGROESSE}" if len(letzte) > SEITENGROESSE else ""))
+        st.dataframe(letzte.head(SEITENGROESSE))
 
 # -------------------------------
 # Streamlit App
@@ -72,7 +149,7 @@ st.title("🔍 Excel-Suchtool mit Mehrfachsuche & Export")
 uploaded_file = st.file_uploader("Bitte eine Excel-Datei hochladen (.xlsx)", type=["xlsx"])
 
 if uploaded_file:
-    df = lade_excel(uploaded_file)
+    df, such_index = lade_excel(uploaded_file)
     if df is not None:
         st.subheader("Vorschau der Daten")
         st.dataframe(df.head())
@@ -90,32 +167,48 @@ if uploaded_file:
         # 4️⃣ Suche starten
         if st.button("🔎 Suche starten"):
             if suchbegriffe:
-                ergebnisse = suche_dataframe(df, suchbegriffe, spalten)
-                if not ergebnisse.empty:
-                    st.success(f"{len(ergebnisse)} Treffer gefunden.")
-                    st.dataframe(ergebnisse)
-
-                    # Exportoptionen
-                    export_format = st.selectbox("Exportformat wählen", ["csv", "excel"])
-                    if st.button("💾 Ergebnisse exportieren"):
-                        dateiname = exportiere_ergebnisse(ergebnisse, format=export_format)
-                        with open(dateiname, "rb") as f:
-                            st.download_button(
-                                label="📥 Datei herunterladen",
-                                data=f,
-                                file_name=dateiname,
-                                mime="text/csv" if export_format == "csv" else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            )
-                else:
-                    st.warning("Keine Ergebnisse gefunden.")
+                start = time.perf_counter()
+                ergebnisse = suche_dataframe(df, such_index, suchbegriffe, spalten)
+                merke_ergebnisse(
+                    uploaded_file, ergebnisse, f"Suchzeit: {(time.perf_counter() - start) * 1000:.1f} ms",
+                    suchbegriffe, {"Spalten": spalten} if len(spalten) < len(df.columns) else {},
+                )
             else:
                 st.info("Bitte mindestens einen Suchbegriff eingeben.")
 
-        # 5️⃣ Letzte gespeicherte Ergebnisse anzeigen
-        if os.path.exists(ERGEBNIS_DATEI):
+        # Treffer seitenweise anzeigen (bleiben bis zur nächsten Suche erhalten)
+        ergebnisse = st.session_state.get("ergebnisse")
+        if ergebnisse is not None and st.session_state.get("ergebnisse_datei") == uploaded_file.name:
+            if not ergebnisse.empty:
+                st.success(f"{len(ergebnisse)} Treffer gefunden.")
+                st.caption(st.session_state["ergebnisse_hinweis"])
+                zeige_seitenweise(ergebnisse)
+
+                # Exportoptionen
+                export_format = st.selectbox("Exportformat wählen", ["csv", "excel"])
+                if st.button("💾 Ergebnisse exportieren"):
+                    dateiname, daten = exportiere_ergebnisse(ergebnisse, format=export_format)
+                    st.download_button(
+                        label="📥 Datei herunterladen",
+                        data=daten,
+                        file_name=dateiname,
+                        mime=MIME_TYPEN[export_format],
+                    )
+            else:
+                st.warning("Keine Ergebnisse gefunden.")
+
+        # 5️⃣ Suchverlauf (gelesen wird nur die gespeicherte Vorschau, nie das ganze Ergebnis)
+        verlauf = suchverlauf().letzte(VERLAUF_ANZEIGEN)
+        if verlauf:
             st.divider()
-            st.subheader("📂 Letzte gespeicherte Suchergebnisse")
-            letzte_df = pd.read_excel(ERGEBNIS_DATEI)
-            st.dataframe(letzte_df.head())
+            st.subheader("🕘 Letzte Suchen")
+            for eintrag in verlauf:
+                begriffe = ", ".join(eintrag["begriffe"]) or "–"
+                with st.expander(f"{eintrag['zeit']} · {eintrag['datei']} · {begriffe} · {eintrag['treffer']} Treffer"):
+                    if eintrag["filter"]:
+                        st.caption("Filter: " + "; ".join(f"{name}: {wert}" for name, wert in eintrag["filter"].items()))
+                    st.dataframe(eintrag["vorschau"])
 else:
     st.info("Bitte zuerst eine Excel-Datei hochladen.")
+
+zeige_letzte_ergebnisse()
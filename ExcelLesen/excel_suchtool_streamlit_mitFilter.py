@@ -15,8 +15,11 @@ Das Skript nutzt pandas (Standardbibliothek für Datenanalyse in Python).
 Nutzung
 
 - Datei speichern, z. B. als excel_suchtool.py
+- excel_suche.py, excel_cache.py, excel_index.py, excel_typen.py, excel_export.py
+  und excel_verlauf.py müssen im selben Ordner liegen
+- Für Dateien, die nicht in den Speicher passen: excel_stream.py (gleiche Filter, blockweise)
 - Abhängigkeiten installieren:
-- pip install streamlit pandas openpyxl
+- pip install streamlit pandas openpyxl pyarrow
 
 Starten:
 
@@ -26,53 +29,127 @@ Browser öffnet sich automatisch (Standard: http://localhost:8501
 """
 
 
+import os
 import streamlit as st
 import pandas as pd
-import os
+import time
 from datetime import datetime
+from excel_cache import DataFrameCache, inhalt_hash, lade_blatt
+from excel_export import ENDUNGEN, MIME_TYPEN, export_bytes, lade_letzte_ergebnisse, speichere_letzte_ergebnisse
+from excel_index import SuchIndex
+from excel_typen import erkenne_typen, kompaktiere
+from excel_verlauf import SuchVerlauf
+from excel_suche import filter_maske
 
 # -------------------------------
 # Einstellungen
 # -------------------------------
-ERGEBNIS_DATEI = "letzte_suchergebnisse.xlsx"
+# Hierhin schreibt das Tool seine Dateien – neben dem Skript, unabhängig vom Startordner (nicht im Git)
+DATEN_ORDNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "daten")
+# Schnappschuss der letzten Ergebnisse (Parquet statt .xlsx – viel schneller zu schreiben und zu lesen)
+ERGEBNIS_DATEI = os.path.join(DATEN_ORDNER, "letzte_suchergebnisse.parquet")
+# Suchverlauf: Begriffe, Filter, Trefferzahl und Vorschau jeder Suche
+VERLAUF_DATEI = os.path.join(DATEN_ORDNER, "suchverlauf.sqlite")
+VERLAUF_ANZEIGEN = 5
+# Wie viel Arbeitsspeicher eingelesene Tabellen höchstens belegen dürfen
+MAX_CACHE_MB = 1024
+# Kleinere Datentypen nach dem Laden (category, int8/16/32, float32, Arrow-Text), siehe excel_typen.py
+KOMPAKTE_TYPEN = True
+# So viele Trefferzeilen werden auf einmal angezeigt
+SEITENGROESSE = 500
 
 # -------------------------------
 # Hilfsfunktionen
 # -------------------------------
+@st.cache_resource
+def tabellen_cache():
+    """Ein Cache für alle Sitzungen, überlebt die Neuausführung des Skripts."""
+    return DataFrameCache(MAX_CACHE_MB * 1024 * 1024)
+
+@st.cache_resource
+def suchverlauf():
+    return SuchVerlauf(VERLAUF_DATEI)
+
 def lade_excel(uploaded_file):
-    try:
-        df = pd. read_excel(uploaded_file)
-        st.success(f"Datei '{uploaded_file.name}' erfolgreich geladen.")
-        return df
-    except Exception as e:
-        st.error(f"Fehler beim Laden der Datei: {e}")
-        return None
-
-def suche_dataframe(df, suchbegriffe, spalten):
-    """Textsuche in den angegebenen Spalten."""
-    mask = pd.Series([False] * len(df))
-    for begriff in suchbegriffe:
-        for spalte in spalten:
-            mask |= df[spalte].astype(str).str.contains(begriff, case=False, na=False)
-    return df[mask]
-
-def filter_numerisch(df, spalte, min_wert, max_wert):
-    """Filtert numerische Werte zwischen min und max."""
-    return df[(df[spalte] >= min_wert) & (df[spalte] <= max_wert)]
-
-def filter_datum(df, spalte, start, ende):
-    """Filtert Datumswerte zwischen zwei Zeitpunkten."""
-    df[spalte] = pd.to_datetime(df[spalte], errors='coerce')
-    return df[(df[spalte] >= pd.to_datetime(start)) & (df[spalte] <= pd.to_datetime(ende))]
+    """Gibt (DataFrame, SuchIndex) zurück – beides nur beim ersten Hochladen aufgebaut, danach aus dem Cache."""
+    inhalt = uploaded_file.getvalue()
+    schluessel = inhalt_hash(inhalt)
+    df = tabellen_cache().hole(schluessel)
+    if df is None:
+        try:
+            # Erstes Blatt; ab dem zweiten Öffnen derselben Datei aus dem Parquet-Sidecar
+            df = lade_blatt(inhalt, 0)
+        except Exception as e:
+            st.error(f"Fehler beim Laden der Datei: {e}")
+            return None, None
+        # Datums-/Zahlenspalten, die als Text kommen, einmal umwandeln – gecacht wird die typisierte Tabelle
+        df, erkannt = erkenne_typen(df)
+        if KOMPAKTE_TYPEN:
+            df, vorher, nachher = kompaktiere(df)
+            df.attrs["speicher"] = (vorher, nachher)
+        df.attrs["erkannte_typen"] = erkannt
+        tabellen_cache().speichere(schluessel, df)
+
+    such_index = tabellen_cache().hole(schluessel + ":index")
+    if such_index is None:
+        such_index = SuchIndex(df)
+        tabellen_cache().speichere(schluessel + ":index", such_index, such_index.speicher())
+    st.success(f"Datei '{uploaded_file.name}' erfolgreich geladen.")
+    if "speicher" in df.attrs:
+        vorher, nachher = df.attrs["speicher"]
+        st.caption(f"💾 Speicherbedarf der Tabelle: {vorher / 1024 ** 2:.1f} MB → {nachher / 1024 ** 2:.1f} MB (kompakte Datentypen)")
+    erkannt = df.attrs.get("erkannte_typen")
+    if erkannt:
+        st.caption("🧮 Als Datum/Zahl erkannt: " + ", ".join(f"{spalte} ({typ})" for spalte, typ in erkannt.items()))
+    st.caption(
+        f"🗂️ Suchindex: {len(such_index):,} verschiedene Werte, "
+        f"aufgebaut in {such_index.aufbau_sekunden:.2f} s, {such_index.speicher() / 1024 ** 2:.1f} MB"
+    )
+    # Flache Kopie: Spaltenzuweisungen im Skript verändern nicht den Cache-Eintrag
+    return df.copy(deep=False), such_index
+
+def filter_maske_berechnen(df, such_index, suchbegriffe, spalten_text, num_filter_data, date_filter_data):
+    """Textsuche (aus dem Suchindex), Zahlen- und Datumsfilter als EINE Maske – keine Zwischen-DataFrames."""
+    text_maske = such_index.maske(suchbegriffe, spalten_text) if suchbegriffe else None
+    return filter_maske(df, text_maske, num_filter_data, date_filter_data)
+
+def zeige_seitenweise(ergebnisse):
+    """Zeigt nur eine Seite der Treffer – an den Browser geht nie die ganze Ergebnistabelle."""
+    anzahl_seiten = max(1, -(-len(ergebnisse) // SEITENGROESSE))
+    links, rechts = st.columns([1, 4])
+    seite = links.number_input("Seite", min_value=1, max_value=anzahl_seiten, step=1, key="ergebnis_seite")
+    start = (seite - 1) * SEITENGROESSE
+    ende = min(start + SEITENGROESSE, len(ergebnisse))
+    rechts.caption(f"Zeilen {start + 1:,}–{ende:,} von {len(ergebnisse):,} (Seite {seite} von {anzahl_seiten:,})")
+    st.dataframe(ergebnisse.iloc[start:ende])
+
+def merke_ergebnisse(uploaded_file, ergebnisse, hinweis, suchbegriffe, filter):
+    """Treffer in der Sitzung ablegen (überleben das Blättern und den Export-Knopf) und in den Suchverlauf eintragen."""
+    st.session_state["ergebnisse"] = ergebnisse
+    st.session_state["ergebnisse_datei"] = uploaded_file.name
+    st.session_state["ergebnisse_hinweis"] = hinweis
+    st.session_state["ergebnis_seite"] = 1
+    suchverlauf().eintragen(uploaded_file.name, suchbegriffe, filter, ergebnisse)
 
 def exportiere_ergebnisse(df, format="csv"):
-    dateiname = f"suchergebnisse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
-    if format == "csv":
-        df.to_csv(dateiname, index=False, encoding="utf-8-sig")
-    else:
-        df.to_excel(dateiname, index=False)
-    df.to_excel(ERGEBNIS_DATEI, index=False)
-    return dateiname
+    """Gibt (dateiname, bytes) zurück – nichts wird auf die Festplatte geschrieben außer dem Schnappschuss."""
+    dateiname = f"suchergebnisse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ENDUNGEN[format]}"
+    daten = export_bytes(df, format)
+    speichere_letzte_ergebnisse(df, ERGEBNIS_DATEI)  # Automatische Speicherung
+    return dateiname, daten
+
+def zeige_letzte_ergebnisse():
+    """Schnappschuss des letzten Exports wieder anzeigen – auch ohne hochgeladene Datei."""
+    if not os.path.exists(ERGEBNIS_DATEI):
+        return
+    st.divider()
+    gespeichert = datetime.fromtimestamp(os.path.getmtime(ERGEBNIS_DATEI))
+    if st.button(f"📂 Letzte Ergebnisse laden (exportiert {gespeichert:%d.%m.%Y %H:%M})"):
+        st.session_state["letzte_ergebnisse"] = lade_letzte_ergebnisse(ERGEBNIS_DATEI)
+    letzte = st.session_state.get("letzte_ergebnisse")
+    if letzte is not None:
+        st.caption(f"{len(letzte):,} Zeilen" + (f", angezeigt die ersten {SEITENGROESSE}" if len(letzte) > SEITENGROESSE else ""))
+        st.dataframe(letzte.head(SEITENGROESSE))
 
 # -------------------------------
 # Streamlit App
@@ -83,7 +160,7 @@ st.title("🔍 Excel-Suchtool mit Text-, Zahlen- & Datumsfiltern")
 uploaded_file = st.file_uploader("Bitte eine Excel-Datei hochladen (.xlsx)", type=["xlsx"])
 
 if uploaded_file:
-    df = lade_excel(uploaded_file)
+    df, such_index = lade_excel(uploaded_file)
     if df is not None:
         st.subheader("Vorschau der Daten")
         st.dataframe(df.head())
@@ -109,20 +186,12 @@ if uploaded_file:
         # ---- DATUMSFILTER ----
         st.divider()
         st.header("3️⃣ Datumsfilter (optional)")
+        # Textspalten mit Datumswerten wurden schon beim Laden umgewandelt (excel_typen.py)
         date_columns = df.select_dtypes(include=['datetime', 'datetimetz']).columns.tolist()
-        if not date_columns:
-            # Versuch, Datumsspalten automatisch zu erkennen
-            for col in df.columns:
-                try:
-                    pd.to_datetime(df[col])
-                    date_columns.append(col)
-                except:
-                    continue
 
         date_filter_data = {}
         if date_columns:
             for col in date_columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
                 min_date = df[col].min()
                 max_date = df[col].max()
                 if pd.notna(min_date) and pd.notna(max_date):
@@ -132,43 +201,54 @@ if uploaded_file:
         # ---- SUCHE STARTEN ----
         st.divider()
         if st.button("🔎 Suche und Filter anwenden"):
-            result_df = df.copy()
-
-            # Textsuche
-            if suchbegriffe:
-                result_df = suche_dataframe(result_df, suchbegriffe, spalten_text)
-
-            # Numerische Filter
-            for col, (minv, maxv) in num_filter_data.items():
-                result_df = filter_numerisch(result_df, col, minv, maxv)
-
-            # Datumsfilter
-            for col, (start, end) in date_filter_data.items():
-                result_df = filter_datum(result_df, col, start, end)
-
+            # Alle Filter werden zu einer Maske verknüpft, erst am Ende wird einmal ausgewählt
+            start = time.perf_counter()
+            maske = filter_maske_berechnen(df, such_index, suchbegriffe, spalten_text, num_filter_data, date_filter_data)
+            # Für den Verlauf nur Filter merken, die wirklich etwas einschränken
+            filter = {col: werte for col, werte in num_filter_data.items()
+                      if werte != (float(df[col].min()), float(df[col].max()))}
+            filter.update({col: werte for col, werte in date_filter_data.items()
+                           if tuple(werte) != (df[col].min().date(), df[col].max().date())})
+            if len(spalten_text) < len(df.columns):
+                filter["Spalten"] = spalten_text
+            merke_ergebnisse(
+                uploaded_file, df[maske], f"Suche und Filter: {(time.perf_counter() - start) * 1000:.1f} ms",
+                suchbegriffe, filter,
+            )
+
+        # Treffer seitenweise anzeigen (bleiben bis zur nächsten Suche erhalten)
+        result_df = st.session_state.get("ergebnisse")
+        if result_df is not None and st.session_state.get("ergebnisse_datei") == uploaded_file.name:
             if not result_df.empty:
                 st.success(f"{len(result_df)} Treffer gefunden.")
-                st.dataframe(result_df)
+                st.caption(st.session_state["ergebnisse_hinweis"])
+                zeige_seitenweise(result_df)
 
                 # Exportoptionen
                 export_format = st.selectbox("Exportformat wählen", ["csv", "excel"])
                 if st.button("💾 Ergebnisse exportieren"):
-                    dateiname = exportiere_ergebnisse(result_df, format=export_format)
-                    with open(dateiname, "rb") as f:
-                        st.download_button(
-                            label="📥 Datei herunterladen",
-                            data=f,
-                            file_name=dateiname,
-                            mime="text/csv" if export_format == "csv" else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        )
+                    dateiname, daten = exportiere_ergebnisse(result_df, format=export_format)
+                    st.download_button(
+                        label="📥 Datei herunterladen",
+                        data=daten,
+                        file_name=dateiname,
+                        mime=MIME_TYPEN[export_format],
+                    )
             else:
                 st.warning("Keine Treffer mit den angegebenen Filtern gefunden.")
 
-        # ---- Letzte Ergebnisse ----
-        if os.path.exists(ERGEBNIS_DATEI):
+        # ---- Suchverlauf (gelesen wird nur die gespeicherte Vorschau) ----
+        verlauf = suchverlauf().letzte(VERLAUF_ANZEIGEN)
+        if verlauf:
             st.divider()
-            st.subheader("📂 Letzte gespeicherte Suchergebnisse")
-            letzte_df = pd.read_excel(ERGEBNIS_DATEI)
-            st.dataframe(letzte_df.head())
+            st.subheader("🕘 Letzte Suchen")
+            for eintrag in verlauf:
+                begriffe = ", ".join(eintrag["begriffe"]) or "–"
+                with st.expander(f"{eintrag['zeit']} · {eintrag['datei']} · {begriffe} · {eintrag['treffer']} Treffer"):
+                    if eintrag["filter"]:
+                        st.caption("Filter: " + "; ".join(f"{name}: {wert}" for name, wert in eintrag["filter"].items()))
+                    st.dataframe(eintrag["vorschau"])
 else:
     st.info("Bitte zuerst eine Excel-Datei hochladen.")
+
+zeige_letzte_ergebnisse()
@@ -0,0 +1,176 @@
+"""
+Erkennt Datums- und Zahlenspalten, die pd.read_excel als Text liefert.
+
+Bisher hat die Filter-App jede Spalte komplett mit pd.to_datetime ausprobiert
+(try/except), danach noch einmal mit errors='coerce' umgewandelt und beim
+Filtern ein drittes Mal. Hier wird pro Textspalte nur eine Stichprobe geprüft:
+
+- passt ein bekanntes Datumsformat (z. B. 31.12.2024) auf fast alle Werte
+  der Stichprobe → die ganze Spalte wird genau einmal mit diesem Format
+  umgewandelt (explizites Format = schnell, keine Format-Raterei pro Zeile)
+- sonst: sind fast alle Werte Zahlen (auch deutsch geschrieben: 1.234,56)
+  → Zahlenspalte – außer ein Wert beginnt mit führender Null oder "+"
+  (PLZ 04103, Konto 0012, Telefon +49…): das sind Kennungen und bleiben Text
+
+Geht beim Umwandeln der ganzen Spalte auch nur ein Wert verloren (z. B. "offen"
+oder "n/a" in einer Datumsspalte), bleibt die Spalte Text – sonst fände die
+Suche diese Zeilen nicht mehr.
+
+Spalten, die schon Datum oder Zahl sind, bleiben unverändert.
+
+kompaktiere() verkleinert danach optional den Speicherbedarf:
+- Text mit wenigen verschiedenen Werten → category
+- Ganzzahlen → kleinster passender Typ (int8/16/32), Kommazahlen → float32,
+  wenn dabei kein Wert verändert wird
+- übriger Text → Arrow-Strings (wenn pyarrow installiert ist)
+
+pip install pandas pyarrow
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+STICHPROBE = 200
+# Anteil der Stichprobe, der passen muss
+MIN_TREFFERQUOTE = 0.9
+
+DATUMSFORMATE = [
+    "%d.%m.%Y",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%y",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y",
+]
+
+# Höchstens so viele verschiedene Werte (Anteil an den Zeilen) → category
+MAX_KATEGORIE_ANTEIL = 0.5
+
+DEUTSCHE_ZAHL = re.compile(r"^-?\d{1,3}(?:\.\d{3})*(?:,\d+)?$|^-?\d+,\d+$")
+# Führende Null vor weiteren Ziffern oder führendes "+" → Kennung, keine Zahl
+KENNUNG = re.compile(r"^\s*(?:\+|-?0\d)")
+
+
+def _stichprobe(serie, anzahl=STICHPROBE):
+    werte = serie.dropna()
+    werte = werte[werte.astype(str).str.strip() != ""]
+    if len(werte) > anzahl:
+        werte = werte.sample(anzahl, random_state=0)
+    return werte.astype(str).str.strip()
+
+
+def _datumsformat(probe):
+    """Das erste Format, das auf (fast) die ganze Stichprobe passt, sonst None."""
+    for format in DATUMSFORMATE:
+        if pd.to_datetime(probe, format=format, errors="coerce").notna().mean() >= MIN_TREFFERQUOTE:
+            return format
+    return None
+
+
+def _zahlen(werte):
+    """Text → Zahl; deutsch geschriebene Zahlen (1.234,56) werden vorher umgeschrieben."""
+    werte = werte.astype(str).str.strip()
+    deutsch = werte.str.match(DEUTSCHE_ZAHL)
+    if deutsch.any():
+        werte = werte.where(~deutsch, werte.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    return pd.to_numeric(werte, errors="coerce")
+
+
+def _ist_kennung(serie):
+    """True, wenn irgendein Wert der Spalte wie eine Kennung aussieht (ganze Spalte, nicht nur die Stichprobe)."""
+    return serie.dropna().astype(str).str.match(KENNUNG).any()
+
+
+def erkenne_typen(df):
+    """
+    Gibt (typisierter DataFrame, {spalte: "datum"/"zahl"}) zurück.
+    df selbst wird nicht verändert; nicht umgewandelte Spalten werden nicht kopiert.
+    """
+    erkannt = {}
+    typisiert = df
+    for spalte in df.columns:
+        serie = df[spalte]
+        if not (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)):
+            continue
+        probe = _stichprobe(serie)
+        if probe.empty:
+            continue
+
+        format = _datumsformat(probe)
+        if format:
+            # Ganze Spalte genau einmal parsen, mit festem Format
+            werte = pd.to_datetime(serie.astype(str).str.strip(), format=format, errors="coerce")
+            erkannt[spalte] = "datum"
+        elif _zahlen(probe).notna().mean() >= MIN_TREFFERQUOTE and not _ist_kennung(serie):
+            werte = _zahlen(serie)
+            erkannt[spalte] = "zahl"
+        else:
+            continue
+
+        # Die Stichprobe reicht nicht: jeder Wert, der nicht umgewandelt werden kann, wäre weg
+        verloren = werte.isna() & serie.notna() & (serie.astype(str).str.strip() != "")
+        if verloren.any():
+            del erkannt[spalte]
+            continue
+
+        if typisiert is df:
+            # Flache Kopie: nur die umgewandelten Spalten werden neu angelegt
+            typisiert = df.copy(deep=False)
+        typisiert[spalte] = werte
+    return typisiert, erkannt
+
+
+def _arrow_text():
+    """Arrow-gestützter Texttyp mit NaN als fehlendem Wert (wie str in pandas 3), sonst None."""
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except (ImportError, TypeError):
+        return None
+
+
+def _kompakte_spalte(serie, arrow_text):
+    """Gibt die Spalte in einem kleineren Typ zurück oder None, wenn sich nichts gewinnen lässt."""
+    if isinstance(serie.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(serie):
+        return None
+    if pd.api.types.is_integer_dtype(serie):
+        kleiner = pd.to_numeric(serie, downcast="integer")
+        return kleiner if kleiner.dtype != serie.dtype else None
+    if pd.api.types.is_float_dtype(serie):
+        if serie.dtype == np.float32:
+            return None
+        kleiner = serie.astype(np.float32)
+        # Nur wenn jeder Wert exakt erhalten bleibt (Beträge mit Cent meist nicht)
+        if ((kleiner.astype(serie.dtype) == serie) | serie.isna()).all():
+            return kleiner
+        return None
+    if pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+        werte = serie.dropna()
+        if not werte.map(type).eq(str).all():
+            return None  # Gemischte Typen bleiben, wie sie sind
+        if len(serie) and serie.nunique() <= MAX_KATEGORIE_ANTEIL * len(serie):
+            return serie.astype("category")
+        if arrow_text is not None and serie.dtype != arrow_text:
+            return serie.astype(arrow_text)
+    return None
+
+
+def kompaktiere(df):
+    """
+    Gibt (kompakter DataFrame, bytes_vorher, bytes_nachher) zurück.
+    df selbst wird nicht verändert.
+    """
+    vorher = int(df.memory_usage(deep=True).sum())
+    arrow_text = _arrow_text()
+    kompakt = df
+    for spalte in df.columns:
+        neu = _kompakte_spalte(df[spalte], arrow_text)
+        if neu is None:
+            continue
+        if kompakt is df:
+            kompakt = df.copy(deep=False)
+        kompakt[spalte] = neu
+    nachher = int(kompakt.memory_usage(deep=True).sum())
+    return kompakt, vorher, nachher
@@ -0,0 +1,63 @@
+"""
+Tests für excel_typen.py.
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import unittest
+
+import pandas as pd
+
+from excel_index import SuchIndex
+from excel_suche import suche_maske
+from excel_typen import erkenne_typen, kompaktiere
+
+
+class ErkenneTypenTest(unittest.TestCase):
+    def test_datumsspalte_wird_umgewandelt(self):
+        df = pd.DataFrame({"Datum": ["31.12.2024", "01.01.2025", None, ""] * 10})
+        typisiert, erkannt = erkenne_typen(df)
+        self.assertEqual(erkannt, {"Datum": "datum"})
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(typisiert["Datum"]))
+
+    def test_zahlenspalte_deutsch_geschrieben(self):
+        df = pd.DataFrame({"Betrag": ["1.234,56", "7,5", "12"] * 10})
+        typisiert, erkannt = erkenne_typen(df)
+        self.assertEqual(erkannt, {"Betrag": "zahl"})
+        self.assertEqual(typisiert["Betrag"].tolist()[:3], [1234.56, 7.5, 12.0])
+
+    def test_seltene_textwerte_gehen_nicht_verloren(self):
+        # 95 % passen zum Datumsformat bzw. sind Zahlen – die restlichen Werte dürfen nicht NaT/NaN werden
+        datum = ["31.12.2024"] * 95 + ["offen", "n/a", "offen", "n/a", "offen"]
+        betrag = ["12,50"] * 95 + ["offen", "n/a", "offen", "n/a", "offen"]
+        df = pd.DataFrame({"Datum": datum, "Betrag": betrag})
+        typisiert, erkannt = erkenne_typen(df)
+        self.assertEqual(erkannt, {})
+        self.assertTrue(typisiert["Datum"].equals(df["Datum"]))
+
+        spalten = df.columns.tolist()
+        for begriffe in (["offen"], ["n/a"]):
+            erwartet = suche_maske(df, begriffe, spalten)
+            self.assertTrue(suche_maske(typisiert, begriffe, spalten).equals(erwartet))
+            self.assertEqual(SuchIndex(typisiert).maske(begriffe, spalten).sum(), erwartet.sum())
+        self.assertEqual(int(suche_maske(typisiert, ["offen"], spalten).sum()), 3)
+
+    def test_kennungen_mit_fuehrender_null_bleiben_text(self):
+        # Text aus lauter Ziffern (PLZ) darf keine Zahlenspalte werden
+        df = pd.DataFrame({
+            "PLZ": ["04103", "04109", "10115", "60311", "01067"] * 20,
+            "Ort": ["Leipzig", "Leipzig", "Berlin", "Frankfurt", "Dresden"] * 20,
+        })
+        typisiert, erkannt = erkenne_typen(df)
+        kompakt, _, _ = kompaktiere(typisiert)
+        self.assertNotIn("PLZ", erkannt)
+        self.assertEqual(kompakt["PLZ"].astype(str).tolist(), df["PLZ"].tolist())
+
+        spalten = df.columns.tolist()
+        erwartet = suche_maske(df, ["04103"], spalten).to_numpy()
+        self.assertEqual(int(erwartet.sum()), 20)
+        self.assertTrue((SuchIndex(kompakt).maske(["04103"], spalten) == erwartet).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Suchverlauf für die Streamlit-Tools.
+
+Bisher wurde bei jedem Klick (jede Neuausführung des Skripts) die komplette
+letzte_suchergebnisse.xlsx mit pd.read_excel geparst, nur um head() zu zeigen.
+Jetzt wird jede Suche mit Begriffen, Filtern, Trefferzahl und einer kleinen
+Vorschau (die ersten Zeilen als JSON) in einer SQLite-Datei abgelegt.
+Für die Anzeige wird nur diese Tabelle gelesen – das Ergebnis selbst nie.
+
+pip install pandas
+"""
+
+import io
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+VERLAUF_DATEI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "daten", "suchverlauf.sqlite")
+# Ältere Einträge werden gelöscht
+MAX_EINTRAEGE = 100
+VORSCHAU_ZEILEN = 5
+
+
+class SuchVerlauf:
+    """Die letzten Suchen (Begriffe, Filter, Trefferzahl, Vorschau) in einer SQLite-Datei."""
+
+    def __init__(self, pfad=VERLAUF_DATEI):
+        self.pfad = pfad
+        os.makedirs(os.path.dirname(os.path.abspath(pfad)), exist_ok=True)
+        with self._verbindung() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS suchen (
+                    id INTEGER PRIMARY KEY,
+                    zeit TEXT NOT NULL,
+                    datei TEXT NOT NULL,
+                    begriffe TEXT NOT NULL,
+                    filter TEXT NOT NULL,
+                    treffer INTEGER NOT NULL,
+                    vorschau TEXT NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _verbindung(self):
+        # Eigene Verbindung je Aufruf: Streamlit führt das Skript in wechselnden Threads aus
+        db = sqlite3.connect(self.pfad, timeout=30)
+        try:
+            with db:  # commit bzw. rollback
+                yield db
+        finally:
+            db.close()
+
+    def eintragen(self, datei, suchbegriffe, filter, ergebnisse):
+        """Speichert eine Suche. filter ist ein Dictionary (Werte werden als Text gespeichert)."""
+        vorschau = ergebnisse.head(VORSCHAU_ZEILEN).rename(columns=str)
+        with self._verbindung() as db:
+            db.execute(
+                "INSERT INTO suchen (zeit, datei, begriffe, filter, treffer, vorschau) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    datei,
+                    json.dumps(list(suchbegriffe), ensure_ascii=False),
+                    json.dumps(filter, ensure_ascii=False, default=str),
+                    len(ergebnisse),
+                    vorschau.to_json(orient="split", index=False, date_format="iso", force_ascii=False),
+                ),
+            )
+            db.execute(
+                "DELETE FROM suchen WHERE id NOT IN (SELECT id FROM suchen ORDER BY id DESC LIMIT ?)",
+                (MAX_EINTRAEGE,),
+            )
+
+    def letzte(self, anzahl=10):
+        """Die neuesten Suchen als Liste von Dictionaries (vorschau als DataFrame)."""
+        with self._verbindung() as db:
+            zeilen = db.execute(
+                "SELECT zeit, datei, begriffe, filter, treffer, vorschau FROM suchen ORDER BY id DESC LIMIT ?",
+                (anzahl,),
+            ).fetchall()
+        return [
+            {
+                "zeit": zeit,
+                "datei": datei,
+                "begriffe": json.loads(begriffe),
+                "filter": json.loads(filter),
+                "treffer": treffer,
+                # Keine Typerkennung: "04103" bleibt Text, "2024-01-05" kein Datum
+                "vorschau": pd.read_json(io.StringIO(vorschau), orient="split", dtype=False, convert_dates=False),
+            }
+            for zeit, datei, begriffe, filter, treffer, vorschau in zeilen
+        ]
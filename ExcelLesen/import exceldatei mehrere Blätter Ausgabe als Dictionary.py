@@ -1,22 +1,24 @@
-import pandas as pd
-""" pip install pandas openpyxl """
+from excel_cache import Arbeitsmappe
+""" pip install pandas openpyxl pyarrow """
 
 def lese_excel_mehrere_sheets(dateipfad):
     """
-    Liest alle Tabellenblätter einer Excel-Datei ein und gibt sie als Dictionary zurück.
+    Gibt alle Tabellenblätter einer Excel-Datei als Dictionary zurück.
     Schlüssel = Sheet-Name, Wert = DataFrame
+    Ein Blatt wird erst beim ersten Zugriff (excel_inhalt[name]) vollständig eingelesen,
+    ab dem zweiten Mal aus dem Parquet-Sidecar (siehe excel_cache.py).
     """
     try:
-        # Alle Sheets einlesen
-        excel_inhalt = pd.read_excel(dateipfad, sheet_name=None)
+        # Nur die Blattnamen lesen – die Blätter selbst werden bei Bedarf geladen
+        excel_inhalt = Arbeitsmappe(dateipfad)
 
         print("✅ Excel-Datei erfolgreich eingelesen!")
         print(f"📄 Gefundene Tabellenblätter: {list(excel_inhalt.keys())}\n")
 
         # Inhalte der einzelnen Sheets anzeigen
-        for sheet_name, df in excel_inhalt.items():
+        for sheet_name in excel_inhalt:
             print(f"--- 📑 Blatt: {sheet_name} ---")
-            print(df.head())  # Zeigt die ersten 5 Zeilen
+            print(excel_inhalt.vorschau(sheet_name, 5))  # Liest nur die ersten 5 Zeilen
             print("\n")
 
         return excel_inhalt
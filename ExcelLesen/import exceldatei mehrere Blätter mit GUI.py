@@ -5,16 +5,26 @@ Excel-Datei auswählen
 → Es öffnet ein Dateidialog-Fenster.
 
 Dropdown-Menü mit allen Tabellenblättern
-→ Alle gefundenen Sheets werden automatisch geladen.
+→ Die Blattnamen kommen direkt aus der Arbeitsmappe (xl/workbook.xml),
+  ohne Zellen zu lesen.
 
 Anzeigen des ausgewählten Blattes
 → Zeigt die ersten 5 Zeilen des gewählten Sheets im Textfeld an."
+→ Das Blatt wird im Hintergrund geladen, das Fenster friert nicht ein.
+  Geladene Blätter bleiben im Arbeitsspeicher (höchstens BLATT_CACHE_MB),
+  ein erneutes Anzeigen geht sofort.
 """
-"""pip install pandas openpyxl"""
+"""pip install pandas openpyxl pyarrow"""
 
-import pandas as pd
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+from excel_cache import DataFrameCache, blattnamen_aus_mappe as lese_blattnamen, lade_blatt
+
+# Wie viel Arbeitsspeicher bereits geöffnete Blätter höchstens belegen dürfen
+BLATT_CACHE_MB = 512
 
 def lade_excel_datei():
     """Öffnet Dateidialog zum Auswählen einer Excel-Datei"""
@@ -29,8 +39,7 @@ def lade_excel_datei():
 def lade_tabellenblaetter(dateipfad):
     """Liest die Blattnamen und füllt das Dropdown-Menü"""
     try:
-        excel = pd.ExcelFile(dateipfad)
-        blattnamen = excel.sheet_names
+        blattnamen = lese_blattnamen(dateipfad)
 
         # Dropdown befüllen
         blatt_dropdown['values'] = blattnamen
@@ -54,13 +63,54 @@ def zeige_ausgewaehltes_blatt():
         messagebox.showwarning("Warnung", "Bitte ein Tabellenblatt auswählen!")
         return
 
+    # Schlüssel mit Änderungszeit: wird die Datei neu gespeichert, wird das Blatt neu gelesen
     try:
-        df = pd.read_excel(aktuelle_datei, sheet_name=blatt)
-        textfeld.delete("1.0", tk.END)
-        textfeld.insert(tk.END, f"--- 📑 Blatt: {blatt} ---\n\n")
-        textfeld.insert(tk.END, df.head().to_string(index=False))
-    except Exception as e:
+        schluessel = (aktuelle_datei, os.path.getmtime(aktuelle_datei), blatt)
+    except OSError as e:
         messagebox.showerror("Fehler", f"Fehler beim Einlesen des Blatts:\n{e}")
+        return
+    df = blatt_cache.hole(schluessel)
+    if df is not None:
+        zeige_blatt(blatt, df)
+        return
+
+    anzeigen_button.config(state=tk.DISABLED)
+    textfeld.delete("1.0", tk.END)
+    textfeld.insert(tk.END, f"⏳ Blatt '{blatt}' wird geladen …")
+    threading.Thread(target=_lade_im_hintergrund, args=(schluessel,), daemon=True).start()
+    root.after(100, pruefe_laden)
+
+def _lade_im_hintergrund(schluessel):
+    """Läuft im Worker-Thread – greift nicht auf tkinter zu, sondern meldet über die Queue."""
+    pfad, _, blatt = schluessel
+    try:
+        df = lade_blatt(pfad, blatt)
+        blatt_cache.speichere(schluessel, df)
+        lade_meldungen.put(("fertig", (schluessel, df)))
+    except Exception as e:
+        lade_meldungen.put(("fehler", e))
+
+def pruefe_laden():
+    """Holt das geladene Blatt ab (läuft im Tk-Hauptthread über root.after)"""
+    try:
+        art, inhalt = lade_meldungen.get_nowait()
+    except queue.Empty:
+        root.after(100, pruefe_laden)
+        return
+
+    anzeigen_button.config(state=tk.NORMAL)
+    if art == "fehler":
+        textfeld.delete("1.0", tk.END)
+        messagebox.showerror("Fehler", f"Fehler beim Einlesen des Blatts:\n{inhalt}")
+        return
+    (pfad, _, blatt), df = inhalt
+    if pfad == aktuelle_datei:  # Inzwischen wurde keine andere Datei gewählt
+        zeige_blatt(blatt, df)
+
+def zeige_blatt(blatt, df):
+    textfeld.delete("1.0", tk.END)
+    textfeld.insert(tk.END, f"--- 📑 Blatt: {blatt} ---\n\n")
+    textfeld.insert(tk.END, df.head().to_string(index=False))
 
 # Hauptfenster
 root = tk.Tk()
@@ -68,6 +118,8 @@ root.title("Excel-Reader GUI")
 root.geometry("700x500")
 
 aktuelle_datei = None
+lade_meldungen = queue.Queue()  # Lade-Thread → Tk-Hauptthread
+blatt_cache = DataFrameCache(BLATT_CACHE_MB * 1024 * 1024)
 
 # UI-Elemente
 tk.Label(root, text="Excel-Datei einlesen", font=("Arial", 14, "bold")).pack(pady=10)
@@ -80,7 +132,8 @@ dateipfad_label.pack(pady=5)
 blatt_dropdown = ttk.Combobox(root, state="readonly", width=50)
 blatt_dropdown.pack(pady=10)
 
-tk.Button(root, text="📊 Blatt anzeigen", command=zeige_ausgewaehltes_blatt).pack(pady=5)
+anzeigen_button = tk.Button(root, text="📊 Blatt anzeigen", command=zeige_ausgewaehltes_blatt)
+anzeigen_button.pack(pady=5)
 
 # Textfeld zur Anzeige
 textfeld = tk.Text(root, wrap="none", width=80, height=20)
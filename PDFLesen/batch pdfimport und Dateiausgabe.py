@@ -9,9 +9,16 @@
 # 2.Erstelle einen leeren Ordner texte (oder das Skript macht es automatisch).
 
 # 3.Speichere das Skript als pdf_batch_ocr.py.
+#   Die Hilfsmodule aus diesem Ordner (pdf_extraktion.py, pdf_manifest.py,
+#   ocr_cache.py, ocr_erkennung.py, seiten_klassifikation.py, text_index.py,
+#   rechnungsfelder.py, pdf_tabellen.py) müssen im selben Ordner liegen.
 
 # 4.Installiere die nötigen Pakete:
-#   pip install pdfplumber pytesseract pillow
+#   pip install pdfplumber pytesseract pillow pandas pyarrow
+#   (pandas und pyarrow braucht der Tabellen-Modus, siehe positions_ordner;
+#   ohne sie positions_ordner = None setzen)
+#   Optional: pip install tesserocr – dann lädt jeder Worker-Prozess Tesseract
+#   nur einmal statt einmal pro Seite (siehe ocr_erkennung.py).
 #   Installiere Tesseract OCR (siehe vorherige Anleitung).
 
 # 5.Führe das Skript aus:
@@ -24,9 +31,13 @@
 # Das spart enorm viel Zeit.
 
 import os
-import pdfplumber
+import sys
 import pytesseract
-from PIL import Image
+from pdf_extraktion import EXTRAKTOR_VERSION, verarbeite_pdfs
+from pdf_manifest import PdfManifest
+from pdf_tabellen import PARQUET_VERFUEGBAR, PositionsDaten
+from rechnungsfelder import RechnungsTabelle
+from text_index import INDEX_DATEI, TextIndex
 
 # Falls Tesseract nicht im Standardpfad ist, hier den Pfad angeben:
 # pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\\tesseract.exe"
@@ -35,36 +46,73 @@ from PIL import Image
 pdf_ordner = "pdfs"
 # Ausgabeordner für Textdateien
 ausgabe_ordner = "texte"
-
-os.makedirs(ausgabe_ordner, exist_ok=True)
-
-for dateiname in os.listdir(pdf_ordner):
-    if dateiname.lower().endswith(".pdf"):
-        pdf_pfad = os.path.join(pdf_ordner, dateiname)
-        txt_datei = os.path.splitext(dateiname)[0] + ".txt"
-        txt_pfad = os.path.join(ausgabe_ordner, txt_datei)
-
-        print(f"📄 Verarbeite: {dateiname}")
-        gesamt_text = ""
-
-        with pdfplumber.open(pdf_pfad) as pdf:
-            for seiten_nummer, seite in enumerate(pdf.pages):
-                text = seite.extract_text()
-
-                if text and text.strip():
-                    # Bereits durchsuchbarer Text → OCR überspringen
-                    gesamt_text += f"\n--- Seite {seiten_nummer + 1} ---\n{text}"
-                else:
-                    # Kein Text vorhanden → OCR anwenden
-                    print(f"  🔍 OCR auf Seite {seiten_nummer + 1}...")
-                    bild = seite.to_image(resolution=300).original
-                    text_ocr = pytesseract.image_to_string(bild, lang="deu")
-                    gesamt_text += f"\n--- Seite {seiten_nummer + 1} (OCR) ---\n{text_ocr}"
-
-        with open(txt_pfad, "w", encoding="utf-8") as f:
-            f.write(gesamt_text)
-
-        print(f"✅ Gespeichert: {txt_pfad}")
-
-print("🎯 Fertig! Alle PDFs wurden optimiert verarbeitet.")
-
+# Ordner für alles, was der Lauf sonst noch anlegt (Manifest, OCR-Cache,
+# Volltext-Index, Rechnungstabelle, Positionstabellen) – nicht im Git
+daten_ordner = "daten"
+
+# Parallelbetrieb: Die Seiten aller PDFs werden auf einen Prozess-Pool verteilt
+# und danach pro PDF wieder in der richtigen Reihenfolge zusammengesetzt.
+# None = so viele Prozesse wie CPU-Kerne, 1 = alles nacheinander wie früher
+anzahl_prozesse = None
+
+# Inkrementeller Lauf: Das Manifest (daten/.manifest.json) merkt sich Größe,
+# Änderungszeit und Inhalts-Hash jeder PDF. Unveränderte PDFs werden übersprungen.
+# False = wie früher jedes Mal alles neu extrahieren
+nur_geaenderte = True
+
+# OCR-Cache: Identische gescannte Seiten (Deckblätter, Leerseiten, Briefköpfe)
+# werden nur einmal durch Tesseract geschickt. None = kein Cache
+ocr_cache_pfad = os.path.join(daten_ordner, ".ocr_cache.sqlite")
+
+# Adaptive OCR: Gescannte Seiten zuerst mit 150 dpi und nur auf den bedruckten
+# Bereich zugeschnitten erkennen; 300 dpi nur, wenn Tesseract unsicher ist.
+# False = immer die ganze Seite mit 300 dpi
+ocr_adaptiv = True
+
+# Volltext-Index (daten/.text_index.sqlite): Jede neue .txt-Datei wird sofort
+# eingetragen. Suchen danach mit: python text_index.py suche <begriff>
+# False = keinen Index pflegen
+volltext_index = True
+
+# Rechnungsfelder (Rechnungsnummer, Debitorenkonto, Beträge, Abschläge …) werden
+# beim Extrahieren mitgelesen: eine Zeile pro Rechnung.
+# Endung .parquet statt .csv, wenn pandas und pyarrow installiert sind. None = aus
+rechnungs_tabelle = os.path.join(daten_ordner, "rechnungen.csv")
+
+# Tabellen-Modus: Die Positionstabellen (Leistungsnachweis) werden direkt in
+# Zeilen und Spalten zerlegt und typisiert als Parquet-Datensatz gespeichert,
+# ein Unterordner pro Tabellenart. Lesen mit pd.read_parquet(<unterordner>),
+# Übersicht mit: python pdf_tabellen.py daten/positionen
+# Braucht pandas und pyarrow. Schon extrahierte PDFs kommen erst dazu, wenn
+# sie neu verarbeitet werden (nur_geaenderte = False). None = aus
+positions_ordner = os.path.join(daten_ordner, "positionen")
+
+# Unter Windows startet jeder Pool-Prozess dieses Skript neu –
+# deshalb muss die eigentliche Verarbeitung hinter diesem if stehen.
+if __name__ == "__main__":
+    if positions_ordner and not PARQUET_VERFUEGBAR:
+        # Vor dem Lauf prüfen, nicht erst nach der ersten fertigen PDF
+        print("❌ Der Tabellen-Modus braucht pandas und pyarrow: pip install pandas pyarrow "
+              "(oder positions_ordner = None setzen).")
+        sys.exit(1)
+
+    pdf_pfade = [
+        os.path.join(pdf_ordner, dateiname)
+        for dateiname in sorted(os.listdir(pdf_ordner))
+        if dateiname.lower().endswith(".pdf")
+    ]
+
+    manifest = PdfManifest(daten_ordner, EXTRAKTOR_VERSION) if nur_geaenderte else None
+    text_index = TextIndex(os.path.join(daten_ordner, INDEX_DATEI)) if volltext_index else None
+    rechnungen = RechnungsTabelle(rechnungs_tabelle) if rechnungs_tabelle else None
+    positionen = PositionsDaten(positions_ordner) if positions_ordner else None
+    verarbeite_pdfs(pdf_pfade, ausgabe_ordner, anzahl_prozesse, manifest, ocr_cache_pfad, ocr_adaptiv,
+                    text_index, rechnungen, positionen)
+
+    if text_index is not None:
+        # Nimmt auch Textdateien auf, die vor dem Einschalten des Index entstanden sind
+        neu, entfernt = text_index.aktualisiere(ausgabe_ordner)
+        print(f"🗂️ Volltext-Index aktuell ({neu} Dateien nachgetragen, {entfernt} entfernt)")
+        text_index.schliessen()
+
+    print("🎯 Fertig! Alle PDFs wurden optimiert verarbeitet.")
@@ -0,0 +1,96 @@
+# Vergleicht die beiden OCR-Wege aus ocr_erkennung.py auf den Beispiel-PDFs:
+#
+# - pytesseract: pro Seite ein neuer tesseract-Prozess, Bild als temporäre
+#   Datei, Sprachdaten werden jedes Mal neu geladen (bisheriger Weg)
+# - tesserocr: eine Engine, einmal angelegt und für alle Seiten benutzt,
+#   Bild direkt aus dem Speicher
+#
+# Jede Seite wird einmal mit OCR_AUFLOESUNG gerendert (auch Textseiten, damit
+# genug Seiten zusammenkommen) und sofort mit beiden Wegen erkannt – im Speicher
+# liegt immer nur ein Seitenbild; gemessen wird nur die Texterkennung. Das
+# Anlegen der Engine wird extra ausgewiesen – im Batch passiert es einmal pro
+# Worker-Prozess.
+#
+# Nutzung:
+#   python benchmark_ocr.py [ordner_mit_pdfs] [max_seiten]
+# Standard ist der Ordner pdfs neben diesem Skript, alle Seiten.
+#
+#   pip install pdfplumber pytesseract pillow tesserocr
+
+import os
+import sys
+import time
+
+import pdfplumber
+import pytesseract
+from ocr_erkennung import OCR_SPRACHE, TESSEROCR_VERFUEGBAR, ocr_engine
+from pdf_extraktion import OCR_AUFLOESUNG
+
+pdf_ordner = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdfs")
+max_seiten = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+
+def seitenbilder(ordner, max_seiten=None):
+    """(Name, Seitennummer, Bild) für alle Seiten aller PDFs im Ordner, eine nach der anderen gerendert."""
+    anzahl = 0
+    for dateiname in sorted(os.listdir(ordner)):
+        if not dateiname.lower().endswith(".pdf"):
+            continue
+        with pdfplumber.open(os.path.join(ordner, dateiname)) as pdf:
+            for nummer, seite in enumerate(pdf.pages, start=1):
+                if max_seiten is not None and anzahl >= max_seiten:
+                    return
+                yield dateiname, nummer, seite.to_image(resolution=OCR_AUFLOESUNG).original
+                seite.close()
+                anzahl += 1
+
+
+def mit_pytesseract(bild):
+    return pytesseract.image_to_string(bild, lang=OCR_SPRACHE)
+
+
+def mit_engine(bild):
+    engine = ocr_engine(OCR_SPRACHE)
+    engine.SetImage(bild)
+    return engine.GetUTF8Text()
+
+
+def messe(ocr, bild):
+    start = time.perf_counter()
+    text = ocr(bild)
+    return text, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    if not TESSEROCR_VERFUEGBAR:
+        print("❌ tesserocr ist nicht installiert (pip install tesserocr) – nichts zu vergleichen.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    ocr_engine(OCR_SPRACHE)
+    engine_anlegen = time.perf_counter() - start
+
+    print(f"🖼️ Rendere Seiten aus '{pdf_ordner}' mit {OCR_AUFLOESUNG} dpi …")
+    anzahl = abweichungen = 0
+    gesamt_alt = gesamt_neu = 0.0
+    for dateiname, nummer, bild in seitenbilder(pdf_ordner, max_seiten):
+        text_alt, zeit_alt = messe(mit_pytesseract, bild)
+        text_neu, zeit_neu = messe(mit_engine, bild)
+        gleich = text_alt.strip() == text_neu.strip()
+        anzahl += 1
+        abweichungen += not gleich
+        gesamt_alt += zeit_alt
+        gesamt_neu += zeit_neu
+        print(f"  {dateiname} Seite {nummer:>3}: pytesseract {zeit_alt * 1000:8.1f} ms | "
+              f"tesserocr {zeit_neu * 1000:8.1f} ms" + ("" if gleich else "  ← anderer Text"))
+
+    if not anzahl:
+        print(f"❌ Keine PDFs in '{pdf_ordner}' gefunden.")
+        sys.exit(1)
+
+    print(f"\n⏱️ {anzahl} Seiten")
+    print(f"  pytesseract (Prozess pro Seite): {gesamt_alt:.2f} s, {gesamt_alt / anzahl * 1000:.1f} ms pro Seite")
+    print(f"  tesserocr (eine Engine):         {gesamt_neu:.2f} s, {gesamt_neu / anzahl * 1000:.1f} ms pro Seite"
+          f" + {engine_anlegen * 1000:.0f} ms Engine anlegen")
+    print(f"  → {gesamt_alt / max(gesamt_neu + engine_anlegen, 1e-9):.2f}x schneller")
+    print(f"  {abweichungen} Seiten mit abweichendem Text")
@@ -0,0 +1,79 @@
+# Misst, wie lange die Entscheidung "Text, OCR oder beides?" pro Seite dauert –
+# einmal mit der alten Methode (extract_text() und prüfen, ob etwas drinsteht)
+# und einmal mit seiten_klassifikation.klassifiziere_seite().
+#
+# Bei Textseiten steckt in beiden Zeiten vor allem das Parsen des Seiteninhalts,
+# das extract_text() danach wiederverwendet. Deshalb wird für die neue Methode
+# zusätzlich "Entscheidung + Text" gemessen – das ist der faire Vergleich zur
+# alten Methode, die den Text ja schon in der Hand hat. Reine Scan-Seiten
+# entscheidet die neue Methode ohne zu parsen.
+#
+# Nutzung:
+#   python benchmark_seitenklassifikation.py [ordner_mit_pdfs]
+# Standard ist der Ordner pdfs neben diesem Skript.
+
+import os
+import sys
+import time
+
+import pdfplumber
+from seiten_klassifikation import OCR, TEXT, klassifiziere_seite
+
+pdf_ordner = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdfs")
+
+
+def alte_entscheidung(seite):
+    text = seite.extract_text()
+    return TEXT if text and text.strip() else OCR
+
+
+def messe(pdf_pfad, entscheidung, mit_text=False):
+    """Öffnet die PDF frisch (kein Zwischenspeicher) und misst jede Seite einzeln."""
+    ergebnisse = []
+    with pdfplumber.open(pdf_pfad) as pdf:
+        for seite in pdf.pages:
+            start = time.perf_counter()
+            art = entscheidung(seite)
+            if isinstance(art, tuple):
+                art = art[0]
+            if mit_text and art != OCR:
+                seite.extract_text()
+            ergebnisse.append((art, time.perf_counter() - start))
+            seite.close()
+    return ergebnisse
+
+
+if __name__ == "__main__":
+    gesamt_alt = gesamt_neu = gesamt_neu_text = 0.0
+    anzahl_seiten = abweichungen = 0
+
+    for dateiname in sorted(os.listdir(pdf_ordner)):
+        if not dateiname.lower().endswith(".pdf"):
+            continue
+        pdf_pfad = os.path.join(pdf_ordner, dateiname)
+        alt = messe(pdf_pfad, alte_entscheidung)
+        neu = messe(pdf_pfad, klassifiziere_seite)
+        neu_text = messe(pdf_pfad, klassifiziere_seite, mit_text=True)
+
+        print(f"📄 {dateiname}")
+        for nummer, ((art_alt, zeit_alt), (art_neu, zeit_neu), (_, zeit_neu_text)) in enumerate(
+            zip(alt, neu, neu_text), start=1
+        ):
+            markierung = "" if art_alt == art_neu else "  ← abweichend"
+            print(f"  Seite {nummer:>3}: alt {art_alt:<6} {zeit_alt * 1000:7.2f} ms | "
+                  f"neu {art_neu:<6} {zeit_neu * 1000:7.2f} ms "
+                  f"(+ Text {zeit_neu_text * 1000:7.2f} ms){markierung}")
+            gesamt_alt += zeit_alt
+            gesamt_neu += zeit_neu
+            gesamt_neu_text += zeit_neu_text
+            anzahl_seiten += 1
+            abweichungen += art_alt != art_neu
+
+    if anzahl_seiten:
+        print(f"\n⏱️ {anzahl_seiten} Seiten")
+        print(f"  alt (extract_text):        {gesamt_alt / anzahl_seiten * 1000:.2f} ms pro Entscheidung")
+        print(f"  neu (klassifiziere_seite): {gesamt_neu / anzahl_seiten * 1000:.2f} ms pro Entscheidung")
+        print(f"  neu + extract_text:        {gesamt_neu_text / anzahl_seiten * 1000:.2f} ms pro Seite")
+        print(f"  {abweichungen} Seiten mit abweichender Entscheidung")
+    else:
+        print(f"❌ Keine PDFs in '{pdf_ordner}' gefunden.")
@@ -17,13 +17,10 @@ pdf_datei = "beispiel.pdf"
 # PDF-Datei im Lesemodus öffnen (binär)
 with open(pdf_datei, "rb") as datei:
     reader = PyPDF2.PdfReader(datei)
-    gesamt_text = ""
 
-    # Jede Seite durchgehen und Text extrahieren
+    # Jede Seite durchgehen, Text extrahieren und sofort ausgeben
     for seiten_nummer, seite in enumerate(reader.pages):
         text = seite.extract_text()
         if text:
-            gesamt_text += f"\n--- Seite {seiten_nummer + 1} ---\n{text}"
-
-# Ausgabe des extrahierten Textes
-print(gesamt_text)
\ No newline at end of file
+            print(f"\n--- Seite {seiten_nummer + 1} ---\n{text}", end="")
+print()
\ No newline at end of file
@@ -16,14 +16,12 @@ import pdfplumber
 # Pfad zur PDF-Datei
 pdf_datei = "beispiel.pdf"
 
-gesamt_text = ""
-
-# PDF öffnen und auslesen
+# PDF öffnen und auslesen – jede Seite wird sofort ausgegeben,
+# statt erst den ganzen Text im Speicher zu sammeln
 with pdfplumber.open(pdf_datei) as pdf:
     for seiten_nummer, seite in enumerate(pdf.pages):
         text = seite.extract_text()
         if text:
-            gesamt_text += f"\n--- Seite {seiten_nummer + 1} ---\n{text}"
-
-# Ausgabe des extrahierten Textes
-print(gesamt_text)
\ No newline at end of file
+            print(f"\n--- Seite {seiten_nummer + 1} ---\n{text}", end="")
+        seite.close()
+print()
\ No newline at end of file
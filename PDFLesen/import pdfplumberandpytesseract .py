@@ -4,37 +4,21 @@
 #
 # Damit kannst du jede PDF auslesen – egal ob 
 # reiner Text oder eingescanntes Bild.
-# Du bekommst den Text in gesamt_text und kannst ihn danach 
-# z. B. in eine Datei speichern.   
+# Der Text wird Seite für Seite direkt in die Ausgabedatei geschrieben
+# (erst als .part-Datei, nach der letzten Seite umbenannt), damit auch
+# sehr lange Dokumente nicht komplett im Speicher gehalten werden.
+# Die Datei pdf_extraktion.py muss im selben Ordner liegen.
 
-import pdfplumber
 import pytesseract
-from PIL import Image
-import io
+from pdf_extraktion import pdf_zu_text_datei
 
 # Falls Tesseract nicht im Standardpfad ist:
 # pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
 pdf_datei = "beispiel.pdf"
 ausgabe_datei = "beispiel_text.txt"
-gesamt_text = ""
 
-with pdfplumber.open(pdf_datei) as pdf:
-    for seiten_nummer, seite in enumerate(pdf.pages):
-        text = seite.extract_text()
-
-        if text and text.strip():
-            # Normale Textseite
-            gesamt_text += f"\n--- Seite {seiten_nummer + 1} ---\n{text}"
-        else:
-            # OCR für gescannte Seite
-            print(f"OCR auf Seite {seiten_nummer + 1}...")
-            bild = seite.to_image(resolution=300).original
-            text_ocr = pytesseract.image_to_string(bild, lang="deu")  # 'deu' für Deutsch
-            gesamt_text += f"\n--- Seite {seiten_nummer + 1} (OCR) ---\n{text_ocr}"
-
-# Text in Datei speichern
-with open(ausgabe_datei, "w", encoding="utf-8") as f:
-    f.write(gesamt_text)
+# Normale Textseiten direkt, gescannte Seiten per OCR ('deu' für Deutsch)
+pdf_zu_text_datei(pdf_datei, ausgabe_datei)
 
 print(f"✅ Text erfolgreich in '{ausgabe_datei}' gespeichert!")
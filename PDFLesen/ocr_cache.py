@@ -0,0 +1,100 @@
+"""
+OCR-Cache auf der Festplatte.
+
+Tesseract ist der mit Abstand teuerste Schritt. Eingescannte Deckblätter,
+Leerseiten und Standard-Briefköpfe wiederholen sich über hunderte Dokumente –
+deshalb wird das OCR-Ergebnis unter einem Hash aus
+Bildinhalt + Auflösung + Sprache + Engine gespeichert und bei gleicher Seite
+wiederverwendet, auch über mehrere Läufe hinweg.
+
+Gespeichert wird in einer SQLite-Datei (Standardbibliothek), damit mehrere
+Pool-Prozesse gleichzeitig lesen und schreiben können. Wird die
+Maximalgröße überschritten, fliegen die am längsten nicht benutzten
+Einträge raus (LRU).
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+STANDARD_MAX_GROESSE = 500 * 1024 * 1024  # 500 MB
+
+# Nur alle paar Einträge die Gesamtgröße prüfen, nicht bei jedem
+AUFRAEUMEN_ALLE = 50
+
+
+def bild_schluessel(bild, aufloesung, sprache, engine):
+    """Hash über Pixeldaten, Bildformat, Auflösung, Sprache und OCR-Engine (tesserocr/pytesseract)."""
+    h = hashlib.sha256()
+    h.update(f"{bild.mode}|{bild.size}|{aufloesung}|{sprache}|{engine}|".encode("utf-8"))
+    h.update(bild.tobytes())
+    return h.hexdigest()
+
+
+class OcrCache:
+    """Schlüssel → OCR-Text, begrenzt auf max_groesse Bytes Text."""
+
+    def __init__(self, pfad, max_groesse=STANDARD_MAX_GROESSE):
+        self.pfad = pfad
+        self.max_groesse = max_groesse
+        self.treffer = 0
+        self.fehlgriffe = 0
+        self._neue_eintraege = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(pfad)), exist_ok=True)
+        self._db = sqlite3.connect(pfad, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS ocr ("
+            " schluessel TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " groesse INTEGER NOT NULL,"
+            " zugriff REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ocr_zugriff ON ocr (zugriff)")
+        self._db.commit()
+
+    def hole(self, schluessel):
+        """Gibt den gespeicherten Text zurück oder None."""
+        zeile = self._db.execute("SELECT text FROM ocr WHERE schluessel = ?", (schluessel,)).fetchone()
+        if zeile is None:
+            self.fehlgriffe += 1
+            return None
+
+        self.treffer += 1
+        self._db.execute("UPDATE ocr SET zugriff = ? WHERE schluessel = ?", (time.time(), schluessel))
+        self._db.commit()
+        return zeile[0]
+
+    def speichere(self, schluessel, text):
+        groesse = len(text.encode("utf-8"))
+        self._db.execute(
+            "INSERT OR REPLACE INTO ocr (schluessel, text, groesse, zugriff) VALUES (?, ?, ?, ?)",
+            (schluessel, text, groesse, time.time()),
+        )
+        self._db.commit()
+
+        self._neue_eintraege += 1
+        if self._neue_eintraege % AUFRAEUMEN_ALLE == 0:
+            self.aufraeumen()
+
+    def aufraeumen(self):
+        """Löscht die am längsten nicht benutzten Einträge, bis der Cache unter 90 % der Maximalgröße liegt."""
+        gesamt = self._db.execute("SELECT COALESCE(SUM(groesse), 0) FROM ocr").fetchone()[0]
+        if gesamt <= self.max_groesse:
+            return
+
+        ziel = gesamt - int(self.max_groesse * 0.9)
+        geloescht = 0
+        loeschen = []
+        for schluessel, groesse in self._db.execute("SELECT schluessel, groesse FROM ocr ORDER BY zugriff"):
+            if geloescht >= ziel:
+                break
+            loeschen.append((schluessel,))
+            geloescht += groesse
+        self._db.executemany("DELETE FROM ocr WHERE schluessel = ?", loeschen)
+        self._db.commit()
+
+    def schliessen(self):
+        self._db.close()
@@ -0,0 +1,121 @@
+"""
+OCR-Hilfsfunktionen für gescannte Seiten.
+
+- ocr_text: einfacher Tesseract-Aufruf
+- ocr_mit_konfidenz: Text und mittlere Wort-Konfidenz aus einem einzigen
+  Tesseract-Lauf (image_to_data), damit man entscheiden kann, ob eine
+  höhere Auflösung nötig ist
+- inhaltsbereich: Rahmen um den bedruckten Teil einer Seite, damit leere
+  Ränder und halbleere Seiten nicht mit durch Tesseract müssen
+
+Tesseract-Engine pro Prozess:
+pytesseract startet für jede Seite ein neues tesseract-Programm, schreibt das
+Bild dafür in eine temporäre Datei und lädt jedes Mal die Sprachdaten (deu)
+neu. Ist tesserocr installiert (Python-Anbindung an die Tesseract-Bibliothek),
+wird stattdessen pro Prozess und Sprache einmal eine Engine angelegt und für
+alle weiteren Seiten wiederverwendet; das Bild wird direkt aus dem Speicher
+übergeben. Im Prozess-Pool von pdf_extraktion.py hat so jeder Worker seine
+eigene, fertig geladene Engine. Ohne tesserocr bleibt alles wie bisher.
+
+pip install pytesseract pillow
+pip install tesserocr   (optional, braucht die Tesseract-Bibliothek)
+"""
+
+import importlib.util
+import threading
+
+import pytesseract
+from PIL import ImageOps
+
+OCR_SPRACHE = "deu"
+
+TESSEROCR_VERFUEGBAR = importlib.util.find_spec("tesserocr") is not None
+# Welcher Weg den Text liefert – beide formatieren leicht unterschiedlich (Teil des OCR-Cache-Schlüssels)
+OCR_ENGINE = "tesserocr" if TESSEROCR_VERFUEGBAR else "pytesseract"
+# Ordner mit den Sprachdaten für tesserocr, None = einkompilierter Standard, z. B.:
+# TESSDATA_PFAD = r"C:\Program Files\Tesseract-OCR\tessdata"
+TESSDATA_PFAD = None
+
+# Pixel dunkler als dieser Grauwert zählen als "bedruckt"
+TINTE_SCHWELLE = 200
+
+
+# Eine Engine pro Thread und Sprache – PyTessBaseAPI darf nicht von zwei Threads gleichzeitig benutzt werden
+_engines = threading.local()
+
+
+def ocr_engine(sprache=OCR_SPRACHE):
+    """Die Tesseract-Engine dieses Threads für die Sprache; wird beim ersten Aufruf angelegt."""
+    import tesserocr
+
+    engines = getattr(_engines, "nach_sprache", None)
+    if engines is None:
+        engines = _engines.nach_sprache = {}
+    if sprache not in engines:
+        if TESSDATA_PFAD:
+            engines[sprache] = tesserocr.PyTessBaseAPI(path=TESSDATA_PFAD, lang=sprache)
+        else:
+            engines[sprache] = tesserocr.PyTessBaseAPI(lang=sprache)
+    return engines[sprache]
+
+
+def ocr_text(bild, sprache=OCR_SPRACHE):
+    """Text eines Bildes per Tesseract."""
+    if TESSEROCR_VERFUEGBAR:
+        engine = ocr_engine(sprache)
+        engine.SetImage(bild)
+        return engine.GetUTF8Text()
+    return pytesseract.image_to_string(bild, lang=sprache)
+
+
+def ocr_mit_konfidenz(bild, sprache=OCR_SPRACHE):
+    """Gibt (text, konfidenz) zurück; konfidenz = Mittel über alle erkannten Wörter (0–100)."""
+    if TESSEROCR_VERFUEGBAR:
+        # Text und Konfidenzen stammen aus derselben Erkennung (SetImage erkennt nur einmal)
+        engine = ocr_engine(sprache)
+        engine.SetImage(bild)
+        text = engine.GetUTF8Text()
+        konfidenzen = engine.AllWordConfidences()
+        return text, sum(konfidenzen) / len(konfidenzen) if konfidenzen else 0.0
+
+    daten = pytesseract.image_to_data(bild, lang=sprache, output_type=pytesseract.Output.DICT)
+
+    absaetze = {}
+    konfidenzen = []
+    for i, wort in enumerate(daten["text"]):
+        konfidenz = float(daten["conf"][i])
+        if konfidenz < 0 or not wort.strip():
+            continue
+        konfidenzen.append(konfidenz)
+        absatz = absaetze.setdefault((daten["block_num"][i], daten["par_num"][i]), {})
+        absatz.setdefault(daten["line_num"][i], []).append(wort)
+
+    # Gleiche Struktur wie image_to_string: Zeilen mit \n, Absätze mit Leerzeile
+    text = "\n\n".join(
+        "\n".join(" ".join(woerter) for woerter in zeilen.values())
+        for zeilen in absaetze.values()
+    )
+    if text:
+        text += "\n"
+    konfidenz = sum(konfidenzen) / len(konfidenzen) if konfidenzen else 0.0
+    return text, konfidenz
+
+
+def inhaltsbereich(bild, rand=10):
+    """
+    Rahmen (links, oben, rechts, unten) um alle bedruckten Pixel plus etwas Rand,
+    oder None bei einer leeren Seite.
+    """
+    grau = ImageOps.invert(bild.convert("L"))
+    tinte = grau.point(lambda p: 255 if p > 255 - TINTE_SCHWELLE else 0)
+    rahmen = tinte.getbbox()
+    if rahmen is None:
+        return None
+
+    links, oben, rechts, unten = rahmen
+    return (
+        max(links - rand, 0),
+        max(oben - rand, 0),
+        min(rechts + rand, bild.width),
+        min(unten + rand, bild.height),
+    )
@@ -0,0 +1,455 @@
+"""
+Gemeinsame Bausteine für die Batch-Skripte:
+
+- Text einer PDF-Seite extrahieren; ob OCR nötig ist, entscheidet
+  seiten_klassifikation.py anhand billiger Metadaten
+- Viele PDFs seitenweise über einen Prozess-Pool verarbeiten und
+  die Seiten in der richtigen Reihenfolge wieder zu einer .txt-Datei
+  im bekannten Format "--- Seite N ---" zusammensetzen.
+- Optional mit Manifest (pdf_manifest.py), damit unveränderte PDFs
+  bei einem erneuten Lauf übersprungen werden.
+- Optional mit OCR-Cache (ocr_cache.py), damit identische gescannte
+  Seiten nur einmal durch Tesseract laufen.
+- Optional mit adaptiver OCR: erst mit niedriger Auflösung auf den
+  bedruckten Bereich, 300 dpi nur bei zu geringer Tesseract-Konfidenz.
+- Optional wird jede fertige .txt-Datei sofort in den Volltext-Index
+  (text_index.py) eingetragen.
+- Optional werden Rechnungsfelder seitenweise mitgelesen und als eine
+  Zeile pro Rechnung gespeichert (rechnungsfelder.py).
+- Optional Tabellen-Modus: Positionstabellen (Leistungsnachweis) werden
+  direkt in Zeilen und Spalten zerlegt und als partitionierter
+  Parquet-Datensatz gespeichert (pdf_tabellen.py).
+- Ist tesserocr installiert, behält jeder Pool-Prozess seine Tesseract-Engine
+  für alle Seiten (ocr_erkennung.py) statt pro Seite tesseract zu starten.
+
+Die Seiten werden nie zu einem Gesamttext zusammengeklebt, sondern einzeln
+in eine temporäre Datei geschrieben, die erst nach der letzten Seite
+umbenannt wird. Der Speicherbedarf hängt so nur von der größten Seite ab,
+nicht von der Länge des Dokuments.
+
+pip install pdfplumber pytesseract pillow   (optional: tesserocr)
+"""
+
+import os
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+import pdfplumber
+
+from ocr_cache import OcrCache, bild_schluessel
+from ocr_erkennung import OCR_ENGINE, inhaltsbereich, ocr_mit_konfidenz, ocr_text
+from pdf_tabellen import seiten_tabellen
+from seiten_klassifikation import HYBRID, TEXT, klassifiziere_seite
+
+OCR_SPRACHE = "deu"
+OCR_AUFLOESUNG = 300
+
+# Adaptive OCR: Startauflösung und die mittlere Wort-Konfidenz (0–100),
+# unter der die Seite mit OCR_AUFLOESUNG wiederholt wird
+OCR_START_AUFLOESUNG = 150
+OCR_MIN_KONFIDENZ = 80
+
+# Erhöhen, wenn sich die Extraktion so ändert, dass alte .txt-Dateien
+# neu erzeugt werden sollen (das Manifest verarbeitet dann alles neu).
+EXTRAKTOR_VERSION = "4"
+
+# Nach so vielen fertigen PDFs wird das Manifest zwischengespeichert
+MANIFEST_SPEICHERN_ALLE = 50
+
+# Wie viele Seiten ein Worker am Stück bekommt. Aufeinanderfolgende Seiten
+# derselben PDF landen so im selben Prozess, der die Datei schon offen hat.
+SEITEN_PRO_PAKET = 4
+
+
+# Werden pro Prozess von _init_worker gesetzt
+_ocr_cache = None
+_ocr_adaptiv = False
+_tabellen_modus = False
+
+
+def _aus_cache(bild, aufloesung, info):
+    """Gibt (schluessel, text) zurück; text ist None, wenn nicht im Cache."""
+    if _ocr_cache is None:
+        return None, None
+    schluessel = bild_schluessel(bild, aufloesung, OCR_SPRACHE, OCR_ENGINE)
+    text = _ocr_cache.hole(schluessel)
+    if text is not None:
+        info["ocr_cache"] = True
+    return schluessel, text
+
+
+def ocr_bild(bild, info):
+    """Tesseract auf ein Seitenbild – mit OCR-Cache, falls eingerichtet."""
+    schluessel, text = _aus_cache(bild, OCR_AUFLOESUNG, info)
+    if text is not None:
+        return text
+
+    text = ocr_text(bild, OCR_SPRACHE)
+    if schluessel is not None:
+        _ocr_cache.speichere(schluessel, text)
+    return text
+
+
+def ocr_seite_adaptiv(seite, info):
+    """
+    OCR erst mit OCR_START_AUFLOESUNG auf den bedruckten Bereich. Nur wenn
+    Tesseract sich zu unsicher ist, wird derselbe Bereich mit OCR_AUFLOESUNG
+    wiederholt. Die Ersparnis gegenüber einer vollen 300-dpi-Seite wird über
+    die Pixelzahl geschätzt (Tesseract-Zeit wächst etwa linear damit).
+    """
+    info["ocr_adaptiv"] = True
+    bild = seite.to_image(resolution=OCR_START_AUFLOESUNG).original
+    bereich = inhaltsbereich(bild)
+    if bereich is None:
+        # Leere Seite → Tesseract gar nicht erst starten
+        info["ocr_leer"] = True
+        return ""
+    bild = bild.crop(bereich)
+
+    cache_aufloesung = f"adaptiv-{OCR_START_AUFLOESUNG}-{OCR_AUFLOESUNG}-{OCR_MIN_KONFIDENZ}"
+    schluessel, text = _aus_cache(bild, cache_aufloesung, info)
+    if text is not None:
+        return text
+
+    start = time.perf_counter()
+    text, konfidenz = ocr_mit_konfidenz(bild, OCR_SPRACHE)
+    letztes_bild = bild
+
+    if konfidenz < OCR_MIN_KONFIDENZ:
+        info["ocr_eskaliert"] = True
+        faktor = OCR_AUFLOESUNG / OCR_START_AUFLOESUNG
+        gross = seite.to_image(resolution=OCR_AUFLOESUNG).original
+        letztes_bild = gross.crop(tuple(round(k * faktor) for k in bereich))
+        zwischen = time.perf_counter()
+        # Derselbe Weg wie bei OCR_START_AUFLOESUNG → gleiches Textformat, egal ob eskaliert
+        text, _ = ocr_mit_konfidenz(letztes_bild, OCR_SPRACHE)
+        sekunden_letzter_lauf = time.perf_counter() - zwischen
+    else:
+        sekunden_letzter_lauf = time.perf_counter() - start
+
+    sekunden = time.perf_counter() - start
+    volle_pixel = (seite.width * OCR_AUFLOESUNG / 72) * (seite.height * OCR_AUFLOESUNG / 72)
+    geschaetzt_voll = sekunden_letzter_lauf * volle_pixel / max(letztes_bild.width * letztes_bild.height, 1)
+    info["ocr_sekunden"] = sekunden
+    info["ocr_sekunden_gespart"] = geschaetzt_voll - sekunden
+
+    if schluessel is not None:
+        _ocr_cache.speichere(schluessel, text)
+    return text
+
+
+def ocr_bildbereiche(seite, info):
+    """OCR nur auf die eingebetteten Bilder einer Seite (für Mischseiten)."""
+    x0, oben, x1, unten = seite.bbox
+    texte = []
+    for bild_objekt in seite.images:
+        rahmen = (
+            max(bild_objekt["x0"], x0), max(bild_objekt["top"], oben),
+            min(bild_objekt["x1"], x1), min(bild_objekt["bottom"], unten),
+        )
+        if rahmen[2] - rahmen[0] < 1 or rahmen[3] - rahmen[1] < 1:
+            continue
+        bild = seite.crop(rahmen).to_image(resolution=OCR_AUFLOESUNG).original
+        texte.append(ocr_bild(bild, info))
+    return "\n".join(texte)
+
+
+def extrahiere_seite(seite):
+    """Liefert (text, info) für eine pdfplumber-Seite; info["ocr"] sagt, ob OCR nötig war."""
+    art, _ = klassifiziere_seite(seite)
+    info = {"ocr": art != TEXT}
+    if art == TEXT:
+        # Brauchbarer Textlayer → OCR überspringen
+        text = seite.extract_text() or ""
+        if _tabellen_modus:
+            # Die Seite ist schon geparst – Kanten und Wörter kosten jetzt kaum noch etwas
+            try:
+                info["tabellen"] = seiten_tabellen(seite)
+            except Exception as e:
+                # Der Text der Seite ist trotzdem gültig – nur die Tabelle fehlt
+                info["tabellen"] = []
+                info["tabellen_fehler"] = str(e)
+        return text, info
+
+    if art == HYBRID:
+        # Echter Text plus großflächige Bilder → Textlayer und OCR der Bilder
+        info["hybrid"] = True
+        return (seite.extract_text() or "") + "\n" + ocr_bildbereiche(seite, info), info
+
+    # Kein brauchbarer Textlayer → OCR der ganzen Seite
+    if _ocr_adaptiv:
+        return ocr_seite_adaptiv(seite, info), info
+    bild = seite.to_image(resolution=OCR_AUFLOESUNG).original
+    return ocr_bild(bild, info), info
+
+
+def seiten_kopf(seiten_nummer, ocr=False):
+    """Trennzeile vor jeder Seite, wie in den bisherigen Textdateien."""
+    if ocr:
+        return f"\n--- Seite {seiten_nummer} (OCR) ---\n"
+    return f"\n--- Seite {seiten_nummer} ---\n"
+
+
+def seiten_texte(pdf_pfad):
+    """Generator: liefert (seiten_nummer, text, info) Seite für Seite."""
+    with pdfplumber.open(pdf_pfad) as pdf:
+        for seiten_index, seite in enumerate(pdf.pages):
+            text, info = extrahiere_seite(seite)
+            # Zwischengespeicherte Zeichen/Objekte der Seite freigeben
+            seite.close()
+            yield seiten_index + 1, text or "", info
+
+
+class TextDateiSchreiber:
+    """
+    Schreibt eine Textdatei seitenweise nach <ziel>.part und benennt sie erst
+    bei schreibe_fertig() in <ziel> um. Bricht der Lauf vorher ab, bleibt die
+    alte Datei unangetastet und der bisherige Stand liegt in <ziel>.part.
+    """
+
+    def __init__(self, ziel_pfad):
+        self.ziel_pfad = ziel_pfad
+        self.tmp_pfad = ziel_pfad + ".part"
+        self._datei = open(self.tmp_pfad, "w", encoding="utf-8")
+
+    def schreibe_seite(self, seiten_nummer, text, ocr=False):
+        self._datei.write(seiten_kopf(seiten_nummer, ocr))
+        self._datei.write(text)
+        self._datei.flush()
+
+    def schreibe_fertig(self):
+        self._datei.close()
+        os.replace(self.tmp_pfad, self.ziel_pfad)
+
+    def abbrechen(self):
+        """Schließt die .part-Datei, ohne die Zieldatei zu ersetzen."""
+        self._datei.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_typ, exc, tb):
+        if exc_typ is None:
+            self.schreibe_fertig()
+        else:
+            self.abbrechen()
+        return False
+
+
+def pdf_zu_text_datei(pdf_pfad, txt_pfad):
+    """Extrahiert eine PDF im aktuellen Prozess direkt in eine Textdatei."""
+    with TextDateiSchreiber(txt_pfad) as schreiber:
+        for seiten_nummer, text, info in seiten_texte(pdf_pfad):
+            if info["ocr"]:
+                print(f"OCR auf Seite {seiten_nummer}...")
+            schreiber.schreibe_seite(seiten_nummer, text, info["ocr"])
+
+
+# -------------------------------
+# Worker (läuft im Pool-Prozess)
+# -------------------------------
+_offenes_pdf = {"pfad": None, "pdf": None}
+
+
+def _oeffne_pdf(pdf_pfad):
+    """Hält pro Prozess die zuletzt benutzte PDF offen."""
+    if _offenes_pdf["pfad"] != pdf_pfad:
+        if _offenes_pdf["pdf"] is not None:
+            _offenes_pdf["pdf"].close()
+        _offenes_pdf["pdf"] = pdfplumber.open(pdf_pfad)
+        _offenes_pdf["pfad"] = pdf_pfad
+    return _offenes_pdf["pdf"]
+
+
+def _init_worker(ocr_cache_pfad, ocr_adaptiv=False, tabellen_modus=False):
+    """Wird einmal pro Pool-Prozess aufgerufen."""
+    global _ocr_cache, _ocr_adaptiv, _tabellen_modus
+    _ocr_cache = OcrCache(ocr_cache_pfad) if ocr_cache_pfad else None
+    _ocr_adaptiv = ocr_adaptiv
+    _tabellen_modus = tabellen_modus
+
+
+def _verarbeite_seite(aufgabe):
+    """Eine Arbeitseinheit = eine Seite. Gibt (pdf_pfad, index, anzahl, text, info, fehler) zurück."""
+    pdf_pfad, seiten_index, anzahl_seiten = aufgabe
+    if seiten_index is None:
+        return pdf_pfad, None, anzahl_seiten, "", {"ocr": False}, None
+
+    try:
+        seite = _oeffne_pdf(pdf_pfad).pages[seiten_index]
+        text, info = extrahiere_seite(seite)
+        seite.close()
+        return pdf_pfad, seiten_index, anzahl_seiten, text or "", info, None
+    except Exception as e:
+        return pdf_pfad, seiten_index, anzahl_seiten, "", {"ocr": False}, str(e)
+
+
+# -------------------------------
+# Steuerung (Hauptprozess)
+# -------------------------------
+def seiten_aufgaben(pdf_pfade):
+    """Zerlegt die PDFs in Arbeitseinheiten (pdf_pfad, seiten_index, anzahl_seiten)."""
+    for pdf_pfad in pdf_pfade:
+        try:
+            with pdfplumber.open(pdf_pfad) as pdf:
+                anzahl_seiten = len(pdf.pages)
+        except Exception as e:
+            print(f"❌ Kann {os.path.basename(pdf_pfad)} nicht öffnen: {e}")
+            continue
+
+        if anzahl_seiten == 0:
+            yield pdf_pfad, None, 0
+        for seiten_index in range(anzahl_seiten):
+            yield pdf_pfad, seiten_index, anzahl_seiten
+
+
+def txt_pfad_fuer(pdf_pfad, ausgabe_ordner):
+    """texte/<name>.txt zur PDF pdfs/<name>.pdf"""
+    txt_datei = os.path.splitext(os.path.basename(pdf_pfad))[0] + ".txt"
+    return os.path.join(ausgabe_ordner, txt_datei)
+
+
+def verarbeite_pdfs(pdf_pfade, ausgabe_ordner, anzahl_prozesse=None, manifest=None, ocr_cache_pfad=None,
+                    ocr_adaptiv=False, text_index=None, rechnungen=None, positionen=None):
+    """
+    Extrahiert alle PDFs seitenweise und schreibt je PDF eine .txt-Datei.
+    anzahl_prozesse: None = alle CPU-Kerne, 1 = nacheinander im selben Prozess.
+    manifest: optionales PdfManifest – unveränderte PDFs werden übersprungen.
+    ocr_cache_pfad: optionale SQLite-Datei für den OCR-Cache.
+    ocr_adaptiv: OCR erst mit niedriger Auflösung, siehe ocr_seite_adaptiv.
+    text_index: optionaler TextIndex, in den jede fertige .txt-Datei eingetragen wird.
+    rechnungen: optionale RechnungsTabelle, die Rechnungsfelder aus jeder Seite sammelt.
+    positionen: optionale PositionsDaten – Tabellen-Modus, Positionstabellen als Parquet.
+    Gibt (anzahl_dateien, anzahl_seiten) zurück.
+    """
+    os.makedirs(ausgabe_ordner, exist_ok=True)
+    start = time.perf_counter()
+    anzahl_dateien = anzahl_seiten = 0
+    statistik = Counter()
+    schreiber = None
+    ocr_seiten = []
+
+    if manifest is not None:
+        alle = len(pdf_pfade)
+        pdf_pfade = [
+            pdf_pfad for pdf_pfad in pdf_pfade
+            if not manifest.ist_aktuell(pdf_pfad, txt_pfad_fuer(pdf_pfad, ausgabe_ordner))
+        ]
+        print(f"📋 Manifest: {alle - len(pdf_pfade)} von {alle} PDFs unverändert, werden übersprungen.")
+
+    aufgaben = seiten_aufgaben(pdf_pfade)
+    pool = None
+    initargs = (ocr_cache_pfad, ocr_adaptiv, positionen is not None)
+    if anzahl_prozesse != 1:
+        pool = Pool(anzahl_prozesse, initializer=_init_worker, initargs=initargs)
+    else:
+        _init_worker(*initargs)
+    try:
+        if pool is not None:
+            ergebnisse = pool.imap(_verarbeite_seite, aufgaben, chunksize=SEITEN_PRO_PAKET)
+        else:
+            ergebnisse = map(_verarbeite_seite, aufgaben)
+
+        # imap liefert in Auftragsreihenfolge → Seiten kommen sortiert an
+        for pdf_pfad, seiten_index, anzahl, text, info, fehler in ergebnisse:
+            ocr = info["ocr"]
+            tabellen = info.pop("tabellen", [])
+            tabellen_fehler = info.pop("tabellen_fehler", None)
+            if seiten_index == 0 or seiten_index is None:
+                print(f"📄 Verarbeite: {os.path.basename(pdf_pfad)}")
+                fehlerhaft = False
+                txt_pfad = txt_pfad_fuer(pdf_pfad, ausgabe_ordner)
+                schreiber = TextDateiSchreiber(txt_pfad)
+                if rechnungen is not None:
+                    rechnungen.neue_datei(pdf_pfad)
+                if positionen is not None:
+                    positionen.neue_datei(pdf_pfad)
+
+            if seiten_index is not None:
+                if fehler:
+                    print(f"  ❌ Fehler auf Seite {seiten_index + 1}: {fehler}")
+                    fehlerhaft = True
+                elif ocr:
+                    print(
+                        f"  🔍 OCR auf Seite {seiten_index + 1}"
+                        + (" (Text + Bilder)" if info.get("hybrid") else "")
+                        + (" (aus Cache)" if info.get("ocr_cache") else "")
+                    )
+                statistik.update(info)
+                schreiber.schreibe_seite(seiten_index + 1, text, ocr)
+                if rechnungen is not None:
+                    rechnungen.seite(text)
+                if tabellen_fehler:
+                    print(f"  ⚠️ Tabellen auf Seite {seiten_index + 1} nicht gelesen: {tabellen_fehler}")
+                if positionen is not None:
+                    positionen.seite(seiten_index + 1, tabellen)
+                    statistik["tabellen_zeilen"] += sum(len(zeilen) for _, _, zeilen in tabellen)
+                ocr_seiten.append(ocr)
+                anzahl_seiten += 1
+
+            if seiten_index is None or seiten_index == anzahl - 1:
+                anzahl_dateien += 1
+                if fehlerhaft:
+                    # Unvollständigen Text nicht übernehmen: alte .txt (und die daraus
+                    # abgeleiteten Zeilen/Tabellen) bleiben, der Stand liegt in .part
+                    schreiber.abbrechen()
+                    schreiber = None
+                    print(f"⚠️ Nicht übernommen (Fehler auf mindestens einer Seite): {txt_pfad}.part")
+                else:
+                    schreiber.schreibe_fertig()
+                    schreiber = None
+                    print(f"✅ Gespeichert: {txt_pfad}")
+                    if text_index is not None:
+                        text_index.indexiere_datei(txt_pfad)
+                    if rechnungen is not None:
+                        rechnungen.datei_fertig()
+                    if positionen is not None:
+                        positionen.datei_fertig()
+
+                # Fehlerhafte PDFs nicht eintragen → beim nächsten Lauf erneut versuchen
+                if manifest is not None and not fehlerhaft:
+                    manifest.eintragen(pdf_pfad, txt_pfad, ocr_seiten)
+                    if anzahl_dateien % MANIFEST_SPEICHERN_ALLE == 0:
+                        # Tabelle mitspeichern, sonst fehlen nach einem Absturz
+                        # Zeilen zu PDFs, die das Manifest schon als erledigt kennt
+                        if rechnungen is not None:
+                            rechnungen.speichern()
+                        manifest.speichern()
+                ocr_seiten = []
+        if pool is not None:
+            pool.close()
+            pool.join()
+            pool = None
+    finally:
+        if schreiber is not None:
+            # Abbruch mitten in einer PDF: .part bleibt liegen, alte .txt unverändert
+            schreiber.abbrechen()
+        if pool is not None:
+            # Ausnahme oder Strg+C: restliche Seiten nicht mehr abarbeiten
+            pool.terminate()
+            pool.join()
+        if rechnungen is not None:
+            rechnungen.speichern()
+        if manifest is not None:
+            manifest.speichern()
+
+    dauer = max(time.perf_counter() - start, 1e-9)
+    print(
+        f"\n⏱️ {anzahl_dateien} Dateien / {anzahl_seiten} Seiten ({statistik['ocr']} mit OCR) "
+        f"in {dauer:.1f} s → {anzahl_dateien / dauer:.2f} Dateien/s, {anzahl_seiten / dauer:.2f} Seiten/s"
+    )
+    if statistik["hybrid"]:
+        print(f"🧩 {statistik['hybrid']} Mischseiten (Textlayer + OCR der Bilder)")
+    if positionen is not None:
+        print(f"📊 {statistik['tabellen_zeilen']} Tabellenzeilen → {positionen.ordner}")
+    if ocr_cache_pfad and statistik["ocr"]:
+        print(f"💾 OCR-Cache: {statistik['ocr_cache']} von {statistik['ocr']} OCR-Seiten aus dem Cache")
+    if statistik["ocr_adaptiv"]:
+        print(
+            f"🔬 Adaptive OCR: {statistik['ocr_eskaliert']} von {statistik['ocr_adaptiv']} Seiten "
+            f"auf {OCR_AUFLOESUNG} dpi eskaliert, {statistik['ocr_leer']} leere Seiten übersprungen, "
+            f"{statistik['ocr_sekunden']:.1f} s OCR-Zeit, "
+            f"ca. {statistik['ocr_sekunden_gespart']:.1f} s gegenüber {OCR_AUFLOESUNG} dpi gespart"
+        )
+    return anzahl_dateien, anzahl_seiten
@@ -0,0 +1,93 @@
+"""
+Manifest für inkrementelle Batch-Läufe.
+
+Für jede verarbeitete PDF wird gespeichert:
+Pfad, Größe, Änderungszeit, SHA-256 des Inhalts, Extraktor-Version
+und pro Seite, ob OCR nötig war.
+
+Beim nächsten Lauf werden nur neue oder geänderte PDFs verarbeitet.
+Stimmen Größe und Änderungszeit überein, wird nicht einmal gehasht;
+hat sich nur die Änderungszeit geändert (Datei kopiert/angefasst),
+entscheidet der Hash.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_DATEI = ".manifest.json"
+
+
+def datei_hash(pfad, blockgroesse=1024 * 1024):
+    """SHA-256 des Dateiinhalts, blockweise gelesen."""
+    h = hashlib.sha256()
+    with open(pfad, "rb") as f:
+        for block in iter(lambda: f.read(blockgroesse), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class PdfManifest:
+    """Merkt sich, welche PDFs mit welchem Stand bereits extrahiert wurden."""
+
+    def __init__(self, ordner, extraktor_version):
+        self.pfad = os.path.join(ordner, MANIFEST_DATEI)
+        self.extraktor_version = extraktor_version
+        self.eintraege = {}
+        self._offene_hashes = {}
+
+        if os.path.exists(self.pfad):
+            try:
+                with open(self.pfad, "r", encoding="utf-8") as f:
+                    self.eintraege = json.load(f).get("dateien", {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Manifest '{self.pfad}' unlesbar, verarbeite alles neu: {e}")
+
+    @staticmethod
+    def _schluessel(pdf_pfad):
+        return os.path.normcase(os.path.abspath(pdf_pfad))
+
+    def ist_aktuell(self, pdf_pfad, txt_pfad):
+        """True, wenn die PDF seit dem letzten Lauf unverändert ist und die .txt noch existiert."""
+        eintrag = self.eintraege.get(self._schluessel(pdf_pfad))
+        if not eintrag or eintrag.get("version") != self.extraktor_version:
+            return False
+        if not os.path.exists(txt_pfad):
+            return False
+
+        stat = os.stat(pdf_pfad)
+        if eintrag["groesse"] == stat.st_size and eintrag["mtime"] == stat.st_mtime:
+            return True
+        if eintrag["groesse"] != stat.st_size:
+            return False
+
+        # Gleiche Größe, andere Änderungszeit → Inhalt vergleichen
+        inhalt_hash = datei_hash(pdf_pfad)
+        self._offene_hashes[self._schluessel(pdf_pfad)] = inhalt_hash
+        if inhalt_hash == eintrag["hash"]:
+            eintrag["mtime"] = stat.st_mtime
+            return True
+        return False
+
+    def eintragen(self, pdf_pfad, txt_pfad, ocr_seiten):
+        """Nach erfolgreicher Extraktion aufrufen. ocr_seiten = Liste mit True/False je Seite."""
+        schluessel = self._schluessel(pdf_pfad)
+        stat = os.stat(pdf_pfad)
+        inhalt_hash = self._offene_hashes.pop(schluessel, None) or datei_hash(pdf_pfad)
+        self.eintraege[schluessel] = {
+            "pfad": pdf_pfad,
+            "txt": txt_pfad,
+            "groesse": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": inhalt_hash,
+            "version": self.extraktor_version,
+            "ocr_seiten": list(ocr_seiten),
+        }
+
+    def speichern(self):
+        """Schreibt das Manifest atomar (temporäre Datei + Umbenennen)."""
+        os.makedirs(os.path.dirname(self.pfad) or ".", exist_ok=True)
+        tmp_pfad = self.pfad + ".tmp"
+        with open(tmp_pfad, "w", encoding="utf-8") as f:
+            json.dump({"dateien": self.eintraege}, f, ensure_ascii=False)
+        os.replace(tmp_pfad, self.pfad)
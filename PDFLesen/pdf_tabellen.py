@@ -0,0 +1,373 @@
+"""
+Tabellen-Modus: Positionstabellen (Leistungsnachweis) direkt als Tabelle.
+
+Bisher wurden die 30+ Tabellenseiten jeder Rechnung zu Text plattgedrückt und
+danach wieder auseinandergenommen. Hier wird jede Tabellenseite direkt in
+Zeilen und Spalten zerlegt:
+
+1. Layout lernen (einmal pro Prozess und Layout)
+   Das Layout einer Seite erkennt man billig an Seitengröße und den
+   senkrechten Kanten (Zellrahmen/Linien) – die liegen nach dem Parsen der
+   Seite ohnehin vor. Für ein neues Layout läuft einmal die vollständige
+   Tabellenerkennung von pdfplumber (find_tables). Gemerkt werden die
+   Spaltengrenzen, die Spaltennamen aus den Kopfzeilen und wo die Daten
+   beginnen. Die Tageskopfzeilen (01 Fr, 02 Sa, …) ändern sich jeden Monat:
+   Wochentage werden weggelassen, die Spalten heißen Tag 01 … Tag 31.
+2. Weitere Seiten mit demselben Layout
+   Keine Tabellenerkennung mehr: die Zeilengrenzen kommen aus den
+   waagerechten Kanten, jedes Wort wird über seine Position (bisect) in
+   seine Zelle einsortiert. pdfplumber prüft dagegen für jede Zelle jedes
+   Zeichen der Seite – das ist der teuerste Teil von extract_table().
+
+PositionsDaten schreibt die Zeilen (im Hauptprozess) typisiert in einen
+partitionierten Parquet-Datensatz, ein Ordner pro Tabellenart:
+
+  positionen/<tabelle>/datei=<pdf>/teil-0.parquet
+
+Der Name der Tabellenart hängt nur an den festen Spalten (nicht an den
+Tagesspalten), jede Partition enthält immer Tag 01 … Tag 31 – so landet der
+Leistungsnachweis jeden Monat im selben Datensatz.
+
+Die Spaltentypen (Zahl, Ganzzahl, Datum, Text) werden beim ersten Auftreten
+einer Tabellenart festgelegt (<tabelle>/_schema.json) und danach für jede
+weitere Rechnung übernommen, damit alle Dateien desselben Ordners dasselbe
+Schema haben. Alle Positionen aller Rechnungen liest man in einem Aufruf:
+
+  pd.read_parquet("daten/positionen/<tabelle>")
+
+Bei inkrementellen Läufen wird nur der Ordner der neu verarbeiteten PDF ersetzt.
+
+pip install pdfplumber pandas pyarrow
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import sys
+from bisect import bisect_right
+from urllib.parse import quote
+
+# Weniger Spalten → keine Positionstabelle (Deckblatt, Übersicht der Anlagen)
+MIN_SPALTEN = 8
+# Punkte, um die Kanten und Zeilen voneinander abweichen dürfen
+TOLERANZ = 1.0
+# Eine Zeile höher als das Vielfache der höchsten gelernten Datenzeile → Tabelle zu Ende
+MAX_ZEILENHOEHE_FAKTOR = 3
+
+DEZIMALZAHL = re.compile(r"\d,\d")
+ZAHL = re.compile(r"^-?\d{1,3}(?:\.\d{3})*,\d+$|^-?\d+,\d+$")
+GANZZAHL = re.compile(r"^-?\d+$")
+DATUM = re.compile(r"^\d{2}\.\d{2}\.\d{4}$")
+
+WOCHENTAGE = {"Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"}
+TAG = re.compile(r"^\d{1,2}$")
+TAG_SPALTE = re.compile(r"^Tag \d{2}$")
+TAGE = [f"Tag {tag:02d}" for tag in range(1, 32)]
+
+SCHEMA_DATEI = "_schema.json"
+
+PARQUET_VERFUEGBAR = all(importlib.util.find_spec(paket) is not None for paket in ("pandas", "pyarrow"))
+
+# Pro Prozess: Layout-Signatur → TabellenLayout (None = Seite ohne Positionstabelle)
+_layouts = {}
+
+
+# -------------------------------
+# Layout lernen (Worker-Prozesse)
+# -------------------------------
+def layout_signatur(seite):
+    """Seitengröße und senkrechte Kanten – gleiche Signatur = gleiches Tabellenraster."""
+    kanten = sorted({round(kante["x0"]) for kante in seite.vertical_edges})
+    return round(seite.width), round(seite.height), tuple(kanten)
+
+
+def _zelltext(text):
+    """Trennstriche am Zeilenende entfernen, Zeilen mit Leerzeichen verbinden."""
+    return " ".join((text or "").replace("-\n", "").split())
+
+
+class TabellenLayout:
+    """Spaltengrenzen, Spaltennamen und Datenbeginn einer Tabellenart."""
+
+    def __init__(self, spalten, namen, daten_oben, max_zeilenhoehe):
+        self.spalten = spalten                # [(x0, x1), …] von links nach rechts
+        self.namen = namen
+        self.daten_oben = daten_oben
+        self.max_zeilenhoehe = max_zeilenhoehe
+        self._anfaenge = [x0 for x0, _ in spalten]
+        # Der Name hängt nur an den festen Spaltennamen – Seiten mit leicht anderem Raster
+        # (letzte Seite mit Summenzeile, Monate mit 28–31 Tagen) landen so in derselben Tabelle
+        feste = [name for name in namen if not TAG_SPALTE.match(name)]
+        self.name = "tabelle_" + hashlib.sha1("|".join(feste).encode("utf-8")).hexdigest()[:8]
+
+    @classmethod
+    def lerne(cls, seite):
+        """Volle Tabellenerkennung auf einer Seite; None, wenn keine Positionstabelle gefunden wird."""
+        tabellen = seite.find_tables()
+        if not tabellen:
+            return None
+        # Nebeneinanderliegende Teile beginnen auf derselben Höhe wie die breiteste Tabelle
+        breiteste = max(tabellen, key=lambda tabelle: tabelle.bbox[2] - tabelle.bbox[0])
+        teile = sorted(
+            (tabelle for tabelle in tabellen if abs(tabelle.bbox[1] - breiteste.bbox[1]) <= TOLERANZ),
+            key=lambda tabelle: tabelle.bbox[0],
+        )
+        inhalte = [teil.extract() for teil in teile]
+        if sum(len(inhalt[0]) for inhalt in inhalte) < MIN_SPALTEN:
+            return None
+
+        # Daten beginnen mit der ersten Zeile, in der irgendwo eine Dezimalzahl steht
+        anfaenge = [
+            teil.rows[nr].bbox[1]
+            for teil, inhalt in zip(teile, inhalte)
+            for nr, zeile in enumerate(inhalt)
+            if any(DEZIMALZAHL.search(zelle or "") for zelle in zeile)
+        ]
+        if not anfaenge:
+            return None
+        daten_oben = min(anfaenge)
+
+        spalten, namen, hoehen = [], [], []
+        for teil, inhalt in zip(teile, inhalte):
+            kopf = [texte for texte, zeile in zip(inhalt, teil.rows) if zeile.bbox[3] <= daten_oben + TOLERANZ]
+            daten = [zeile for zeile in teil.rows if zeile.bbox[1] >= daten_oben - TOLERANZ]
+            hoehen += [zeile.bbox[3] - zeile.bbox[1] for zeile in daten]
+            for nr, spalte in enumerate(teil.columns):
+                x0, _, x1, _ = spalte.bbox
+                if all(zeile.cells[nr] is None for zeile in daten) and spalten:
+                    # Spalte ohne eigene Datenzellen (von links überdeckt) → gehört zur linken Spalte
+                    spalten[-1] = (spalten[-1][0], x1)
+                    continue
+                teile_name = []
+                for zeile in kopf:
+                    # None = von links verbundene Zelle → deren Text gilt auch hier
+                    links = next((zeile[i] for i in range(nr, -1, -1) if zeile[i] is not None), "")
+                    text = _zelltext(links)
+                    # Wochentage wechseln jeden Monat → nicht in den Namen
+                    if text and text not in WOCHENTAGE and text not in teile_name:
+                        teile_name.append(text)
+                name = " ".join(teile_name)
+                if TAG.match(name):
+                    name = f"Tag {int(name):02d}"
+                spalten.append((x0, x1))
+                namen.append(name or f"Spalte {len(namen) + 1}")
+
+        # Doppelte Namen eindeutig machen
+        gesehen = {}
+        for nr, name in enumerate(namen):
+            gesehen[name] = gesehen.get(name, 0) + 1
+            if gesehen[name] > 1:
+                namen[nr] = f"{name} {gesehen[name]}"
+        return cls(spalten, namen, daten_oben, max(hoehen) * MAX_ZEILENHOEHE_FAKTOR)
+
+    # -------------------------------
+    # Seiten mit bekanntem Layout
+    # -------------------------------
+    def _zeilengrenzen(self, seite):
+        """Waagerechte Kanten durch die erste Spalte, ab Datenbeginn, bis die Tabelle endet."""
+        x_mitte = (self.spalten[0][0] + self.spalten[0][1]) / 2
+        hoehen = sorted(
+            kante["top"] for kante in seite.horizontal_edges
+            if kante["x0"] <= x_mitte <= kante["x1"] and kante["top"] >= self.daten_oben - TOLERANZ
+        )
+        grenzen = []
+        for y in hoehen:
+            if grenzen and y - grenzen[-1] <= TOLERANZ:
+                continue
+            if grenzen and y - grenzen[-1] > self.max_zeilenhoehe:
+                break
+            grenzen.append(y)
+        return grenzen
+
+    def zeilen(self, seite):
+        """Datenzeilen der Seite als Listen von Texten (eine pro Spalte)."""
+        grenzen = self._zeilengrenzen(seite)
+        if len(grenzen) < 2:
+            return []
+        zellen = [[[] for _ in self.spalten] for _ in range(len(grenzen) - 1)]
+        for wort in seite.extract_words():
+            y = (wort["top"] + wort["bottom"]) / 2
+            zeile = bisect_right(grenzen, y) - 1
+            if not 0 <= zeile < len(zellen):
+                continue
+            x = (wort["x0"] + wort["x1"]) / 2
+            spalte = bisect_right(self._anfaenge, x) - 1
+            if spalte < 0 or x > self.spalten[spalte][1]:
+                continue
+            zellen[zeile][spalte].append(wort)
+
+        ergebnis = []
+        for zeile in zellen:
+            texte = [
+                _zelltext(" ".join(wort["text"] for wort in sorted(woerter, key=lambda w: (round(w["top"]), w["x0"]))))
+                for woerter in zeile
+            ]
+            if any(texte):
+                ergebnis.append(texte)
+        return ergebnis
+
+
+def seiten_tabellen(seite):
+    """
+    Positionstabellen einer Textseite als Liste von (tabellenname, spaltennamen, zeilen).
+    Das Layout wird pro Prozess nur einmal gelernt.
+    """
+    signatur = layout_signatur(seite)
+    if signatur not in _layouts:
+        layout = TabellenLayout.lerne(seite)
+        if layout is None and len(signatur[2]) > MIN_SPALTEN:
+            # Viele Kanten, aber keine Datenzeilen (z. B. nur Kopf) → beim nächsten Mal neu versuchen
+            return []
+        _layouts[signatur] = layout
+    layout = _layouts[signatur]
+    if layout is None:
+        return []
+    zeilen = layout.zeilen(seite)
+    return [(layout.name, layout.namen, zeilen)] if zeilen else []
+
+
+# -------------------------------
+# Parquet-Datensatz (Hauptprozess)
+# -------------------------------
+def _spaltentyp(werte):
+    werte = [wert for wert in werte if wert]
+    if not werte:
+        return "text"
+    if all(ZAHL.match(wert) for wert in werte):
+        return "zahl"
+    # Führende Nullen (Variante 001) sind Kennungen, keine Zahlen
+    if all(GANZZAHL.match(wert) and not (len(wert.lstrip("-")) > 1 and wert.lstrip("-")[0] == "0") for wert in werte):
+        return "ganzzahl"
+    if all(DATUM.match(wert) for wert in werte):
+        return "datum"
+    return "text"
+
+
+def _alle_spalten(spalten):
+    """Tagesspalten immer vollständig (Tag 01 … Tag 31), an der Stelle der ersten Tagesspalte."""
+    tage = [nr for nr, spalte in enumerate(spalten) if TAG_SPALTE.match(spalte)]
+    if not tage:
+        return list(spalten)
+    feste = [spalte for spalte in spalten if not TAG_SPALTE.match(spalte)]
+    davor = sum(1 for nr in range(tage[0]) if not TAG_SPALTE.match(spalten[nr]))
+    return feste[:davor] + TAGE + feste[davor:]
+
+
+def _typisiere(df, typen):
+    """
+    Wandelt die Spalten in die Typen aus dem Schema um. Gibt (df, verloren) zurück;
+    verloren = {spalte: [Werte, die nicht zum Typ passen und jetzt fehlen]}.
+    """
+    import pandas as pd
+
+    verloren = {}
+    for spalte, typ in typen.items():
+        roh = werte = df[spalte].replace("", None)
+        if typ == "zahl":
+            werte = pd.to_numeric(werte.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+                                  errors="coerce")
+        elif typ == "ganzzahl":
+            werte = pd.to_numeric(werte, errors="coerce").astype("Int64")
+        elif typ == "datum":
+            werte = pd.to_datetime(werte, format="%d.%m.%Y", errors="coerce")
+        else:
+            werte = werte.astype("string")
+        fehlt = werte.isna() & roh.notna()
+        if fehlt.any():
+            verloren[spalte] = roh[fehlt].tolist()
+        df[spalte] = werte
+    return df, verloren
+
+
+class PositionsDaten:
+    """Sammelt die Tabellenzeilen einer PDF und schreibt sie als Partition des Parquet-Datensatzes."""
+
+    def __init__(self, ordner):
+        self.ordner = ordner
+        self._datei = None
+        self._tabellen = None
+
+    # Aufruf während der Extraktion: neue_datei → seite (je Seite) → datei_fertig
+    def neue_datei(self, pdf_pfad):
+        self._datei = os.path.basename(pdf_pfad)
+        self._tabellen = {}
+
+    def seite(self, seiten_nummer, tabellen):
+        for name, spalten, zeilen in tabellen:
+            _, gesammelt = self._tabellen.setdefault(name, (spalten, []))
+            gesammelt.extend([seiten_nummer] + zeile for zeile in zeilen)
+
+    def _schema(self, name, df):
+        """(spalten, typen) der Tabelle – beim ersten Mal aus den Werten bestimmt und gespeichert."""
+        pfad = os.path.join(self.ordner, name, SCHEMA_DATEI)
+        try:
+            with open(pfad, "r", encoding="utf-8") as f:
+                schema = json.load(f)
+            return schema["spalten"], schema["typen"]
+        except (OSError, ValueError, KeyError):
+            pass
+        spalten = [spalte for spalte in df.columns if spalte != "seite"]
+        typen = {spalte: _spaltentyp(df[spalte].tolist()) for spalte in spalten}
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        with open(pfad + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"spalten": spalten, "typen": typen}, f, ensure_ascii=False, indent=1)
+        os.replace(pfad + ".tmp", pfad)
+        return spalten, typen
+
+    def datei_fertig(self):
+        import pandas as pd
+
+        partition = "datei=" + quote(self._datei, safe="")
+        # Alte Zeilen dieser PDF entfernen (auch aus Tabellen, die sie jetzt nicht mehr hat)
+        if os.path.isdir(self.ordner):
+            for name in os.listdir(self.ordner):
+                shutil.rmtree(os.path.join(self.ordner, name, partition), ignore_errors=True)
+
+        for name, (spalten, zeilen) in self._tabellen.items():
+            df = pd.DataFrame(zeilen, columns=["seite"] + spalten)
+            df = df.reindex(columns=["seite"] + _alle_spalten(spalten), fill_value="")
+            # Alle Partitionen mit denselben Spalten in derselben Reihenfolge
+            schema_spalten, typen = self._schema(name, df)
+            neu = [spalte for spalte in df.columns if spalte != "seite" and spalte not in typen]
+            typen = {**typen, **{spalte: "text" for spalte in neu}}
+            df = df.reindex(columns=["seite"] + schema_spalten + neu, fill_value="")
+            df, verloren = _typisiere(df, typen)
+            for spalte, werte in verloren.items():
+                beispiele = ", ".join(repr(wert) for wert in list(dict.fromkeys(werte))[:3])
+                print(f"  ⚠️ {self._datei} / {name} / {spalte}: {len(werte)} Werte passen nicht zum "
+                      f"Typ '{typen[spalte]}' aus {SCHEMA_DATEI} und fehlen im Datensatz (z. B. {beispiele})")
+            ziel_ordner = os.path.join(self.ordner, name, partition)
+            os.makedirs(ziel_ordner, exist_ok=True)
+            ziel = os.path.join(ziel_ordner, "teil-0.parquet")
+            df.to_parquet(ziel + ".tmp", index=False)
+            os.replace(ziel + ".tmp", ziel)
+        self._datei = self._tabellen = None
+
+
+def lade_positionen(ordner, name):
+    """Alle Zeilen einer Tabellenart über alle Rechnungen (Spalte datei aus der Partition)."""
+    import pandas as pd
+
+    return pd.read_parquet(os.path.join(ordner, name))
+
+
+def main():
+    """Übersicht: python pdf_tabellen.py [ordner]"""
+    ordner = sys.argv[1] if len(sys.argv) > 1 else os.path.join("daten", "positionen")
+    if not os.path.isdir(ordner):
+        print(f"❌ Kein Positionsordner '{ordner}' gefunden.")
+        return 1
+    for name in sorted(os.listdir(ordner)):
+        if not os.path.isdir(os.path.join(ordner, name)):
+            continue
+        df = lade_positionen(ordner, name)
+        print(f"📊 {name}: {len(df):,} Zeilen aus {df['datei'].nunique():,} PDFs")
+        print("   Spalten: " + ", ".join(str(spalte) for spalte in df.columns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
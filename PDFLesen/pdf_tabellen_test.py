@@ -0,0 +1,65 @@
+"""
+Tests für pdf_tabellen.py (ohne PDF: Schema und Typisierung des Datensatzes).
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from pdf_tabellen import TAGE, PositionsDaten, _alle_spalten, _spaltentyp, _typisiere, lade_positionen
+
+SPALTEN = ["Auftrags-Nr.", "Zug-Nr.", "Variante", "Tag 01", "Tag 02", "Entgelt Gesamt"]
+
+
+class SpaltenTest(unittest.TestCase):
+    def test_spaltentyp(self):
+        self.assertEqual(_spaltentyp(["1.234,56", "7,50", ""]), "zahl")
+        self.assertEqual(_spaltentyp(["12", "-3"]), "ganzzahl")
+        self.assertEqual(_spaltentyp(["001", "002"]), "text")
+        self.assertEqual(_spaltentyp(["31.12.2023"]), "datum")
+
+    def test_tagesspalten_immer_vollstaendig(self):
+        spalten = _alle_spalten(SPALTEN)
+        self.assertEqual(spalten[:3], SPALTEN[:3])
+        self.assertEqual(spalten[3:34], TAGE)
+        self.assertEqual(spalten[-1], "Entgelt Gesamt")
+
+
+class TypisiereTest(unittest.TestCase):
+    def test_nicht_passende_werte_werden_gemeldet(self):
+        df = pd.DataFrame({"Betrag": ["1.234,56", "storniert", ""], "Anzahl": ["1", "2", "x"]})
+        df, verloren = _typisiere(df, {"Betrag": "zahl", "Anzahl": "ganzzahl"})
+        self.assertEqual(df["Betrag"].iloc[0], 1234.56)
+        self.assertEqual(verloren, {"Betrag": ["storniert"], "Anzahl": ["x"]})
+
+
+class PositionsDatenTest(unittest.TestCase):
+    def test_schema_bleibt_und_abweichungen_werden_geloggt(self):
+        zeile = ["4711", "12345", "001", "1", "", "1.234,56"]
+        with tempfile.TemporaryDirectory() as ordner:
+            daten = PositionsDaten(ordner)
+            daten.neue_datei("januar.pdf")
+            daten.seite(1, [("tabelle_test", SPALTEN, [zeile])])
+            daten.datei_fertig()
+
+            daten.neue_datei("februar.pdf")
+            daten.seite(1, [("tabelle_test", SPALTEN, [zeile[:-1] + ["siehe Anlage"]])])
+            ausgabe = io.StringIO()
+            with contextlib.redirect_stdout(ausgabe):
+                daten.datei_fertig()
+            self.assertIn("Entgelt Gesamt: 1 Werte", ausgabe.getvalue())
+
+            df = lade_positionen(ordner, "tabelle_test")
+            self.assertEqual(len(df), 2)
+            self.assertEqual(df["Variante"].tolist(), ["001", "001"])
+            self.assertTrue(os.path.exists(os.path.join(ordner, "tabelle_test", "_schema.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Strukturierte Rechnungsfelder aus dem extrahierten Text (DB InfraGO-Rechnungen).
+
+Alle Feldmuster werden beim Import zu EINEM regulären Ausdruck zusammengefasst
+und pro Seite in einem einzigen Durchlauf (finditer) angewendet – direkt
+während der Batch-Extraktion, ohne die .txt-Dateien später noch einmal
+zu lesen. Pro Rechnung entsteht eine Zeile in einer Tabelle:
+
+- .csv (Standard, nur Standardbibliothek, öffnet direkt in Excel)
+- .parquet (wenn pandas und pyarrow installiert sind: pip install pandas pyarrow)
+
+Bei inkrementellen Läufen werden die Zeilen neu verarbeiteter PDFs ersetzt,
+alle anderen bleiben erhalten. PDFs, in denen kein einziges Feld gefunden
+wird (keine Rechnung), bekommen keine Zeile.
+"""
+
+import csv
+import os
+import re
+
+BETRAG = r"-?\d{1,3}(?:\.\d{3})*,\d{2}"
+DATUM = r"\d{2}\.\d{2}\.\d{4}"
+
+# Name der äußeren Gruppe = Mustername, innere Gruppen "<muster>__<spalte>"
+FELD_MUSTER = {
+    "kopf": (
+        rf"Debitorenkonto\s+Rechnungsnummer\s+Gesamtbetrag\s+(?P<kopf__gesamtbetrag>{BETRAG})\s*EUR\s*\n"
+        rf"\s*(?P<kopf__debitorenkonto>\d+)\s+(?P<kopf__rechnungsnummer>\d+)"
+    ),
+    "rechnung": rf"^Rechnung\s+(?P<rechnung__leistungsmonat>\w+\s+\d{{4}})\s+(?P<rechnung__rechnungsdatum>{DATUM})$",
+    "uebersicht": rf"^Übersicht zur Rechnung\s+(?P<uebersicht__rechnungsnummer>\d+)\s+vom\s+(?P<uebersicht__rechnungsdatum>{DATUM})",
+    "kunde": r"^Für Kundennummer:\s*\n(?P<kunde__kundennummer>\S+)\s+(?P<kunde__kunde>[^\n]+)$",
+    "ust": r"Kunden-USt-IdNr:\s*(?P<ust__kunden_ust_idnr>[A-Z]{2}\w+)",
+    "anlage": r"Leistungsnachweis\s+\((?P<anlage__leistungsnachweis_seiten>\d+)\s+Seiten\)",
+    "mwst": (
+        rf"^MwSt\.\s*(?:frei|\d+\s*%)?\s*(?P<mwst__netto>{BETRAG})\s+(?:(?P<mwst__mwst>{BETRAG})\s+)?"
+        rf"(?P<mwst__mwst_satz>\d+)\s*%\s+(?P<mwst__brutto>{BETRAG})$"
+    ),
+    "summe": rf"^Summe\s+(?P<summe__netto>{BETRAG})\s+(?P<summe__mwst>{BETRAG})\s+(?P<summe__brutto>{BETRAG})$",
+    "abschlag": (
+        rf"^abzgl\.\s+Abschlagsrechnung\s+(?P<abschlag__abschlagsrechnung>\d+)\s+"
+        rf"\((?P<abschlag__abschlag_datum>{DATUM})\)\s+(?P<abschlag__abschlagsbetrag>{BETRAG})(?:\s+{BETRAG})?"
+        rf"(?:\s*\n(?P<abschlag__zahlbetrag>{BETRAG})$)?"
+    ),
+}
+
+GESAMT_MUSTER = re.compile(
+    "|".join(f"(?P<{name}>{muster})" for name, muster in FELD_MUSTER.items()),
+    re.MULTILINE,
+)
+
+SPALTEN = [
+    "datei", "rechnungsnummer", "rechnungsdatum", "leistungsmonat", "kundennummer", "kunde",
+    "kunden_ust_idnr", "debitorenkonto", "gesamtbetrag", "netto", "mwst", "mwst_satz", "brutto",
+    "abschlagsrechnung", "abschlag_datum", "abschlagsbetrag", "zahlbetrag", "leistungsnachweis_seiten",
+]
+BETRAG_SPALTEN = {"gesamtbetrag", "netto", "mwst", "brutto", "abschlagsbetrag", "zahlbetrag"}
+DATUM_SPALTEN = {"rechnungsdatum", "abschlag_datum"}
+ZAHL_SPALTEN = {"mwst_satz", "leistungsnachweis_seiten"}
+
+# Diese Spalten können mehrfach vorkommen (mehrere Abschlagsrechnungen)
+MEHRFACH_SPALTEN = {"abschlagsrechnung", "abschlag_datum", "abschlagsbetrag"}
+
+
+def betrag_zu_zahl(text):
+    """'997.102,54' → 997102.54"""
+    return float(text.replace(".", "").replace(",", "."))
+
+
+def datum_zu_iso(text):
+    """'04.01.2024' → '2024-01-04'"""
+    tag, monat, jahr = text.split(".")
+    return f"{jahr}-{monat}-{tag}"
+
+
+def _wert(spalte, text):
+    if spalte in BETRAG_SPALTEN:
+        return betrag_zu_zahl(text)
+    if spalte in DATUM_SPALTEN:
+        return datum_zu_iso(text)
+    if spalte in ZAHL_SPALTEN:
+        return int(text)
+    return text.strip()
+
+
+def felder_aus_seite(text, felder):
+    """Ergänzt das Dictionary felder um alle Felder, die auf dieser Seite gefunden werden."""
+    for treffer in GESAMT_MUSTER.finditer(text):
+        praefix = treffer.lastgroup + "__"
+        for gruppe, roh in treffer.groupdict().items():
+            if roh is None or not gruppe.startswith(praefix):
+                continue
+            spalte = gruppe[len(praefix):]
+            wert = _wert(spalte, roh)
+            if spalte in MEHRFACH_SPALTEN:
+                felder.setdefault(spalte, []).append(wert)
+            elif spalte == "zahlbetrag":
+                # Steht unter der letzten Abschlagszeile
+                felder[spalte] = wert
+            else:
+                # Deckblatt kommt zuerst → erster Fund gewinnt (z. B. MwSt-Zeile vor Summe)
+                felder.setdefault(spalte, wert)
+    return felder
+
+
+def rechnungs_zeile(datei, felder):
+    """Macht aus den gesammelten Feldern eine Tabellenzeile."""
+    zeile = {spalte: felder.get(spalte) for spalte in SPALTEN}
+    zeile["datei"] = datei
+    if felder.get("abschlagsrechnung"):
+        zeile["abschlagsrechnung"] = ";".join(felder["abschlagsrechnung"])
+        zeile["abschlag_datum"] = ";".join(felder["abschlag_datum"])
+        zeile["abschlagsbetrag"] = round(sum(felder["abschlagsbetrag"]), 2)
+    return zeile
+
+
+class RechnungsTabelle:
+    """Sammelt eine Zeile pro Rechnung und schreibt sie als CSV oder Parquet."""
+
+    def __init__(self, pfad):
+        self.pfad = pfad
+        self.zeilen = {}
+        self._felder = None
+        self._datei = None
+        if os.path.exists(pfad):
+            for zeile in self._lesen():
+                self.zeilen[zeile["datei"]] = zeile
+
+    def _ist_parquet(self):
+        return self.pfad.lower().endswith(".parquet")
+
+    def _lesen(self):
+        if self._ist_parquet():
+            import pandas as pd
+            return pd.read_parquet(self.pfad).to_dict("records")
+        with open(self.pfad, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+
+    # Aufruf während der Extraktion: neue_datei → seite (je Seite) → datei_fertig
+    def neue_datei(self, pdf_pfad):
+        self._datei = os.path.basename(pdf_pfad)
+        self._felder = {}
+
+    def seite(self, text):
+        felder_aus_seite(text, self._felder)
+
+    def datei_fertig(self):
+        if self._felder:
+            self.zeilen[self._datei] = rechnungs_zeile(self._datei, self._felder)
+        else:
+            # Keine Rechnung (mehr) – auch eine alte Zeile dieser Datei entfernen
+            self.zeilen.pop(self._datei, None)
+        self._felder = self._datei = None
+
+    def speichern(self):
+        """Schreibt die Tabelle atomar (temporäre Datei + Umbenennen)."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.pfad)), exist_ok=True)
+        zeilen = [self.zeilen[datei] for datei in sorted(self.zeilen)]
+        tmp_pfad = self.pfad + ".tmp"
+        if self._ist_parquet():
+            import pandas as pd
+            pd.DataFrame(zeilen, columns=SPALTEN).to_parquet(tmp_pfad, index=False)
+        else:
+            with open(tmp_pfad, "w", encoding="utf-8-sig", newline="") as f:
+                schreiber = csv.DictWriter(f, fieldnames=SPALTEN)
+                schreiber.writeheader()
+                schreiber.writerows(zeilen)
+        os.replace(tmp_pfad, self.pfad)
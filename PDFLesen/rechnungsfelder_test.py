@@ -0,0 +1,49 @@
+"""
+Tests für rechnungsfelder.py.
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import os
+import tempfile
+import unittest
+
+from rechnungsfelder import RechnungsTabelle
+
+RECHNUNG = (
+    "Übersicht zur Rechnung 9100001234 vom 04.01.2024\n"
+    "Summe 1.000,00 190,00 1.190,00\n"
+)
+
+
+class RechnungsTabelleTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pfad = os.path.join(self._tmp.name, "rechnungen.csv")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _lauf(self, dateien):
+        tabelle = RechnungsTabelle(self.pfad)
+        for datei, text in dateien.items():
+            tabelle.neue_datei(datei)
+            tabelle.seite(text)
+            tabelle.datei_fertig()
+        tabelle.speichern()
+        return RechnungsTabelle(self.pfad).zeilen
+
+    def test_pdf_ohne_felder_bekommt_keine_zeile(self):
+        zeilen = self._lauf({"rechnung.pdf": RECHNUNG, "beispiel.pdf": "Nur ein Beispieltext\n"})
+        self.assertEqual(list(zeilen), ["rechnung.pdf"])
+        self.assertEqual(zeilen["rechnung.pdf"]["rechnungsnummer"], "9100001234")
+        self.assertEqual(zeilen["rechnung.pdf"]["brutto"], "1190.0")
+
+    def test_alte_zeile_verschwindet_wenn_keine_rechnung_mehr(self):
+        self._lauf({"rechnung.pdf": RECHNUNG, "anderes.pdf": RECHNUNG})
+        zeilen = self._lauf({"anderes.pdf": "Kein Rechnungstext\n"})
+        self.assertEqual(list(zeilen), ["rechnung.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
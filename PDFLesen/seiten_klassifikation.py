@@ -0,0 +1,162 @@
+"""
+Entscheidet pro PDF-Seite, ob Text extrahiert, OCR gemacht oder beides
+kombiniert werden muss – nur anhand billiger pdfplumber-Metadaten:
+
+- Anzahl sichtbarer Zeichen im Textlayer
+- Anteil der Seitenfläche, der von Bildern bedeckt ist
+- Anteil "kaputter" Zeichen ((cid:NN), Ersatzzeichen, Private-Use-Glyphen),
+  wie sie bei defekten Schrift-Einbettungen entstehen
+- wie viel der Bildfläche der Textlayer überdeckt: Scanner-PDFs mit
+  unsichtbarer OCR-Textschicht ("Sandwich") und Seiten mit ganzseitigem
+  Briefbogen als Hintergrundbild haben ihren Text über dem Bild – dort gibt
+  es nichts nachzuerkennen. OCR der Bilder (HYBRID) nur, wenn der Text das
+  Bild höchstens zum Teil bedeckt (z. B. ein Eingangsstempel auf einem Scan)
+
+Reine Scan-Seiten (keine Schriften, nur Bilder in den Seitenressourcen)
+werden schon vor dem Parsen des Seiteninhalts erkannt. Für alle anderen
+Seiten wird seite.chars benutzt, das pdfplumber zwischenspeichert – ein
+anschließendes extract_text() parst die Seite also nicht noch einmal.
+"""
+
+import unicodedata
+
+from pdfminer.pdftypes import resolve1
+
+TEXT = "text"
+OCR = "ocr"
+HYBRID = "hybrid"
+
+# Weniger sichtbare Zeichen gelten als "kein echter Textlayer"
+# (z. B. nur ein Stempel oder eine Fußzeile auf einem Scan)
+MIN_ZEICHEN = 40
+
+# Ab diesem Anteil kaputter Zeichen wird der Textlayer verworfen
+MAX_KAPUTT_ANTEIL = 0.3
+
+# Ab diesem Bildanteil der Seitenfläche lohnt OCR der Bilder
+MIN_BILD_ANTEIL = 0.3
+
+# Bedeckt der Rahmen um den Text auf den Bildern mindestens diesen Anteil der
+# Bildfläche, steht der Inhalt der Bilder schon im Textlayer → kein OCR
+MIN_TEXT_DECKUNG = 0.2
+
+# Seiten ohne Zeichen, aber mit so vielen Vektorkurven, sind meist
+# in Pfade umgewandelter Text
+MIN_KURVEN_OHNE_TEXT = 200
+
+
+def _ist_kaputt(zeichen):
+    if zeichen.startswith("(cid:") or "\ufffd" in zeichen:
+        return True
+    return unicodedata.category(zeichen[0]) in ("Co", "Cn", "Cc")
+
+
+def _nur_bilder_ohne_schrift(seite):
+    """
+    True, wenn die Seitenressourcen keine Schrift, aber Bilder enthalten.
+    Form-XObjects können eigene Schriften mitbringen → dann lieber parsen.
+    """
+    ressourcen = resolve1(seite.page_obj.resources) or {}
+    if resolve1(ressourcen.get("Font")):
+        return False
+
+    xobjekte = resolve1(ressourcen.get("XObject")) or {}
+    if not xobjekte:
+        return False
+    for xobjekt in xobjekte.values():
+        untertyp = getattr(resolve1(xobjekt), "attrs", {}).get("Subtype")
+        if getattr(untertyp, "name", None) != "Image":
+            return False
+    return True
+
+
+def bild_anteil(seite):
+    """Anteil der Seitenfläche, der von Bildern bedeckt ist (0–1, Überlappungen nicht abgezogen)."""
+    x0, oben, x1, unten = seite.bbox
+    flaeche = 0.0
+    for bild in seite.images:
+        breite = min(bild["x1"], x1) - max(bild["x0"], x0)
+        hoehe = min(bild["bottom"], unten) - max(bild["top"], oben)
+        if breite > 0 and hoehe > 0:
+            flaeche += breite * hoehe
+    return min(flaeche / max(seite.width * seite.height, 1), 1.0)
+
+
+def _bildrahmen(seite):
+    """Rahmen (x0, top, x1, bottom) aller Bilder, auf die Seite zugeschnitten."""
+    x0, oben, x1, unten = seite.bbox
+    rahmen = []
+    for bild in seite.images:
+        r = (max(bild["x0"], x0), max(bild["top"], oben), min(bild["x1"], x1), min(bild["bottom"], unten))
+        if r[2] > r[0] and r[3] > r[1]:
+            rahmen.append(r)
+    return rahmen
+
+
+def text_deckung(seite):
+    """
+    Anteil der Bildfläche, den der Rahmen um die Zeichen auf den Bildern bedeckt
+    (0–1, je Bild gerechnet und nach Bildfläche gewichtet).
+    """
+    bilder = _bildrahmen(seite)
+    if not bilder:
+        return 0.0
+    textrahmen = [None] * len(bilder)
+    for zeichen in seite.chars:
+        if not zeichen["text"] or zeichen["text"].isspace():
+            continue
+        mitte_x = (zeichen["x0"] + zeichen["x1"]) / 2
+        mitte_y = (zeichen["top"] + zeichen["bottom"]) / 2
+        for i, (x0, oben, x1, unten) in enumerate(bilder):
+            if x0 <= mitte_x <= x1 and oben <= mitte_y <= unten:
+                r = textrahmen[i]
+                textrahmen[i] = (
+                    (zeichen["x0"], zeichen["top"], zeichen["x1"], zeichen["bottom"]) if r is None else
+                    (min(r[0], zeichen["x0"]), min(r[1], zeichen["top"]), max(r[2], zeichen["x1"]), max(r[3], zeichen["bottom"]))
+                )
+    bild_flaeche = bedeckt = 0.0
+    for (x0, oben, x1, unten), r in zip(bilder, textrahmen):
+        flaeche = (x1 - x0) * (unten - oben)
+        bild_flaeche += flaeche
+        if r is not None:
+            bedeckt += min((r[2] - r[0]) * (r[3] - r[1]), flaeche)
+    return bedeckt / bild_flaeche if bild_flaeche else 0.0
+
+
+def klassifiziere_seite(seite):
+    """Gibt (art, merkmale) zurück; art ist TEXT, OCR oder HYBRID."""
+    if _nur_bilder_ohne_schrift(seite):
+        return OCR, {"zeichen": 0, "kaputt_anteil": 0.0, "bild_anteil": None}
+
+    sichtbar = kaputt = 0
+    for zeichen in seite.chars:
+        text = zeichen["text"]
+        if not text or text.isspace():
+            continue
+        sichtbar += 1
+        if _ist_kaputt(text):
+            kaputt += 1
+
+    merkmale = {
+        "zeichen": sichtbar,
+        "kaputt_anteil": kaputt / sichtbar if sichtbar else 0.0,
+        "bild_anteil": bild_anteil(seite),
+    }
+    brauchbar = sichtbar - kaputt
+
+    if merkmale["kaputt_anteil"] > MAX_KAPUTT_ANTEIL:
+        return OCR, merkmale
+    if brauchbar < MIN_ZEICHEN:
+        if merkmale["bild_anteil"] >= MIN_BILD_ANTEIL:
+            return OCR, merkmale
+        if brauchbar == 0 and (seite.images or len(seite.curves) >= MIN_KURVEN_OHNE_TEXT):
+            # Kein Textlayer, aber etwas Sichtbares: kleiner Scan oder Text als Vektorpfade
+            return OCR, merkmale
+        # Kurze echte Textseite oder komplett leere Seite → kein OCR nötig
+        return TEXT, merkmale
+    if merkmale["bild_anteil"] >= MIN_BILD_ANTEIL:
+        # Nur hier nötig: für alle anderen Seiten fällt die Entscheidung ohne Zeichenpositionen
+        merkmale["text_deckung"] = text_deckung(seite)
+        if merkmale["text_deckung"] < MIN_TEXT_DECKUNG:
+            return HYBRID, merkmale
+    return TEXT, merkmale
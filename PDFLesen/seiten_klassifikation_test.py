@@ -0,0 +1,98 @@
+"""
+Tests für seiten_klassifikation.py mit kleinen, hier zusammengebauten PDFs.
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import io
+import unittest
+
+import pdfplumber
+
+from seiten_klassifikation import HYBRID, OCR, TEXT, klassifiziere_seite
+
+BREITE, HOEHE = 595, 842
+ZEILE = "Rechnung 430100011644 Leistungszeitraum Dezember 2023"
+
+
+def _pdf(inhalt, bild=None):
+    """
+    Einseitige PDF (A4) mit Helvetica als F1. bild = (x, y, breite, hoehe) legt
+    ein 1x1-Graustufenbild als Im1 an und zeichnet es vor dem Text.
+    """
+    if bild:
+        x, y, b, h = bild
+        inhalt = f"q {b} 0 0 {h} {x} {y} cm /Im1 Do Q\n" + inhalt
+    strom = inhalt.encode("latin-1")
+    objekte = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {BREITE} {HOEHE}] /Contents 4 0 R "
+        f"/Resources << /Font << /F1 5 0 R >> /XObject << /Im1 6 0 R >> >> >>".encode("latin-1"),
+        b"<< /Length %d >>\nstream\n" % len(strom) + strom + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /XObject /Subtype /Image /Width 1 /Height 1 /ColorSpace /DeviceGray "
+        b"/BitsPerComponent 8 /Length 1 >>\nstream\n\x80\nendstream",
+    ]
+    pdf = io.BytesIO()
+    pdf.write(b"%PDF-1.4\n")
+    positionen = []
+    for nummer, objekt in enumerate(objekte, start=1):
+        positionen.append(pdf.tell())
+        pdf.write(b"%d 0 obj\n" % nummer + objekt + b"\nendobj\n")
+    xref = pdf.tell()
+    pdf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objekte) + 1))
+    for position in positionen:
+        pdf.write(b"%010d 00000 n \n" % position)
+    pdf.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objekte) + 1, xref))
+    return pdf.getvalue()
+
+
+def _text(zeilen, oben=800, unten=60, unsichtbar=False):
+    """So viele Zeilen ZEILE, gleichmäßig zwischen oben und unten verteilt (3 Tr = unsichtbar wie bei OCR-Sandwiches)."""
+    abstand = (oben - unten) / max(zeilen - 1, 1)
+    teile = ["BT /F1 10 Tf" + (" 3 Tr" if unsichtbar else "")]
+    for i in range(zeilen):
+        teile.append(f"1 0 0 1 40 {oben - i * abstand:.1f} Tm ({ZEILE}) Tj")
+    teile.append("ET")
+    return "\n".join(teile)
+
+
+def klassifiziere(pdf_bytes):
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return klassifiziere_seite(pdf.pages[0])
+
+
+class KlassifiziereSeiteTest(unittest.TestCase):
+    def test_textseite(self):
+        art, merkmale = klassifiziere(_pdf(_text(20)))
+        self.assertEqual(art, TEXT)
+        self.assertEqual(merkmale["bild_anteil"], 0.0)
+
+    def test_sandwich_mit_unsichtbarem_ocr_text_ist_text(self):
+        # Scan über die ganze Seite, darüber die OCR-Textschicht des Scanners
+        art, merkmale = klassifiziere(_pdf(_text(30, unsichtbar=True), bild=(0, 0, BREITE, HOEHE)))
+        self.assertEqual(merkmale["bild_anteil"], 1.0)
+        self.assertEqual(art, TEXT, merkmale)
+
+    def test_briefbogen_als_hintergrundbild_ist_text(self):
+        art, merkmale = klassifiziere(_pdf(_text(30), bild=(0, 0, BREITE, HOEHE)))
+        self.assertEqual(art, TEXT, merkmale)
+
+    def test_stempel_auf_scan_ist_hybrid(self):
+        # Eine Textzeile (Eingangsstempel) auf einem ganzseitigen Scan
+        art, merkmale = klassifiziere(_pdf(_text(1, oben=800), bild=(0, 0, BREITE, HOEHE)))
+        self.assertEqual(art, HYBRID, merkmale)
+
+    def test_text_neben_grossem_bild_ist_hybrid(self):
+        # Text oben, eingefügter Scan in der unteren Hälfte
+        art, merkmale = klassifiziere(_pdf(_text(10, oben=800, unten=500), bild=(20, 20, 555, 420)))
+        self.assertEqual(art, HYBRID, merkmale)
+
+    def test_reiner_scan_ist_ocr(self):
+        art, _ = klassifiziere(_pdf("", bild=(0, 0, BREITE, HOEHE)))
+        self.assertEqual(art, OCR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Volltext-Index über die extrahierten Textdateien (texte/*.txt).
+
+Statt mit grep über hunderte MB zu suchen, wird einmal ein invertierter Index
+aufgebaut: Wort → (Datei, Seite aus "--- Seite N ---", Wortnummer, Zeichen-Offset).
+Gespeichert wird in einer SQLite-Datei; die Postings liegen nach Wort sortiert
+(WITHOUT ROWID), sodass eine Abfrage nur die Einträge dieses Wortes liest.
+
+Gespeichert wird der Byte-Offset jedes Wortes in der Datei – für den
+Textausschnitt eines Treffers wird nur dieser Bereich gelesen, nicht die
+ganze Datei.
+
+Der Index wird inkrementell gepflegt: Neue oder geänderte .txt-Dateien werden
+(neu) eingelesen, gelöschte entfernt. Die Batch-Skripte tragen jede frisch
+geschriebene Datei direkt ein.
+
+Nutzung auf der Kommandozeile:
+  python text_index.py index [ordner]          Index aufbauen/aktualisieren
+  python text_index.py suche 430100011644      Einzelbegriff
+  python text_index.py suche "abzgl. Abschlagsrechnung"   Phrase (mehrere Wörter)
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+
+INDEX_DATEI = ".text_index.sqlite"
+# Dort legen die Batch-Skripte den Index ab (neben texte/, nicht darin)
+DATEN_ORDNER = "daten"
+
+TOKEN_MUSTER = re.compile(r"\w+")
+# \r? – die Datei wird ohne Zeilenende-Umwandlung gelesen (Offsets = Bytes in der Datei)
+SEITEN_MUSTER = re.compile(r"^--- Seite (\d+)(?: \(OCR\))? ---\r?$", re.MULTILINE)
+
+# Erhöhen, wenn sich der Aufbau des Index ändert – ältere Index-Dateien werden dann neu aufgebaut
+INDEX_VERSION = 1
+
+
+def tokens(text):
+    """Zerlegt Text in kleingeschriebene Wörter/Zahlen mit Zeichen-Offset."""
+    for treffer in TOKEN_MUSTER.finditer(text):
+        yield treffer.group().lower(), treffer.start()
+
+
+def seiten(text):
+    """Zerlegt eine Textdatei anhand der "--- Seite N ---"-Marker in (seite, start, ende)."""
+    marker = list(SEITEN_MUSTER.finditer(text))
+    if not marker:
+        yield 0, 0, len(text)
+        return
+    for i, m in enumerate(marker):
+        ende = marker[i + 1].start() if i + 1 < len(marker) else len(text)
+        yield int(m.group(1)), m.end(), ende
+
+
+class TextIndex:
+    """Invertierter Index über einen Ordner mit Textdateien."""
+
+    def __init__(self, pfad):
+        self.pfad = pfad
+        os.makedirs(os.path.dirname(os.path.abspath(pfad)), exist_ok=True)
+        self._db = sqlite3.connect(pfad, timeout=30)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            # Version 0 speicherte Zeichen- statt Byte-Offsets
+            self._db.executescript("DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS woerter; DROP TABLE IF EXISTS dateien;")
+            self._db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS dateien (
+                id INTEGER PRIMARY KEY,
+                pfad TEXT UNIQUE NOT NULL,
+                groesse INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS woerter (
+                id INTEGER PRIMARY KEY,
+                wort TEXT UNIQUE NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                wort_id INTEGER NOT NULL,
+                datei_id INTEGER NOT NULL,
+                seite INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                PRIMARY KEY (wort_id, datei_id, seite, position)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_datei ON postings (datei_id);
+            """
+        )
+        self._wort_ids = {}
+
+    # -------------------------------
+    # Aufbauen
+    # -------------------------------
+    def _wort_id(self, wort):
+        wort_id = self._wort_ids.get(wort)
+        if wort_id is None:
+            zeile = self._db.execute("SELECT id FROM woerter WHERE wort = ?", (wort,)).fetchone()
+            if zeile:
+                wort_id = zeile[0]
+            else:
+                wort_id = self._db.execute("INSERT INTO woerter (wort) VALUES (?)", (wort,)).lastrowid
+            self._wort_ids[wort] = wort_id
+        return wort_id
+
+    def _entferne(self, pfad):
+        zeile = self._db.execute("SELECT id FROM dateien WHERE pfad = ?", (pfad,)).fetchone()
+        if zeile:
+            self._db.execute("DELETE FROM postings WHERE datei_id = ?", zeile)
+            self._db.execute("DELETE FROM dateien WHERE id = ?", zeile)
+
+    def indexiere_datei(self, txt_pfad):
+        """(Neu-)Indexiert eine Textdatei. Gibt die Anzahl der Wörter zurück."""
+        pfad = os.path.abspath(txt_pfad)
+        with open(pfad, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        stat = os.stat(pfad)
+
+        self._entferne(pfad)
+        datei_id = self._db.execute(
+            "INSERT INTO dateien (pfad, groesse, mtime) VALUES (?, ?, ?)",
+            (pfad, stat.st_size, stat.st_mtime),
+        ).lastrowid
+
+        zeilen = []
+        # Zeichen- in Byte-Offsets umrechnen: nur den Text seit dem letzten Wort kodieren
+        zeichen = byte = 0
+        for seite, start, ende in seiten(text):
+            for position, (wort, offset) in enumerate(tokens(text[start:ende])):
+                byte += len(text[zeichen:start + offset].encode("utf-8"))
+                zeichen = start + offset
+                zeilen.append((self._wort_id(wort), datei_id, seite, position, byte))
+        self._db.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?, ?)", zeilen)
+        self._db.commit()
+        return len(zeilen)
+
+    def aktualisiere(self, ordner):
+        """Bringt den Index auf den Stand des Ordners. Gibt (neu_indexiert, entfernt) zurück."""
+        bekannt = {
+            pfad: (groesse, mtime)
+            for pfad, groesse, mtime in self._db.execute("SELECT pfad, groesse, mtime FROM dateien")
+        }
+        vorhanden = set()
+        neu = 0
+        for dateiname in sorted(os.listdir(ordner)):
+            if not dateiname.lower().endswith(".txt"):
+                continue
+            pfad = os.path.abspath(os.path.join(ordner, dateiname))
+            vorhanden.add(pfad)
+            stat = os.stat(pfad)
+            if bekannt.get(pfad) != (stat.st_size, stat.st_mtime):
+                self.indexiere_datei(pfad)
+                neu += 1
+
+        entfernt = [pfad for pfad in bekannt if pfad not in vorhanden
+                    and os.path.dirname(pfad) == os.path.abspath(ordner)]
+        for pfad in entfernt:
+            self._entferne(pfad)
+        self._db.commit()
+        return neu, len(entfernt)
+
+    # -------------------------------
+    # Abfragen
+    # -------------------------------
+    def _postings(self, wort):
+        return self._db.execute(
+            "SELECT p.datei_id, p.seite, p.position, p.offset FROM postings p "
+            "JOIN woerter w ON w.id = p.wort_id WHERE w.wort = ?",
+            (wort,),
+        ).fetchall()
+
+    def suche(self, anfrage):
+        """
+        Sucht einen Begriff oder eine Phrase (mehrere Wörter hintereinander).
+        Gibt eine Liste von (txt_pfad, seite, offset) zurück; offset in Bytes.
+        """
+        woerter = [wort for wort, _ in tokens(anfrage)]
+        if not woerter:
+            return []
+
+        # Für jedes Wort die möglichen Startpositionen der Phrase bestimmen
+        treffer = None
+        for i, wort in enumerate(woerter):
+            starts = {(d, s, p - i) for d, s, p, _ in self._postings(wort)}
+            treffer = starts if treffer is None else treffer & starts
+            if not treffer:
+                return []
+
+        offsets = {(d, s, p): o for d, s, p, o in self._postings(woerter[0])}
+        datei_ids = sorted({d for d, _, _ in treffer})
+        pfade = dict(self._db.execute(
+            f"SELECT id, pfad FROM dateien WHERE id IN ({','.join('?' * len(datei_ids))})", datei_ids
+        ))
+        return sorted((pfade[d], s, offsets[(d, s, p)]) for d, s, p in treffer)
+
+    def schliessen(self):
+        self._db.close()
+
+
+def kontext(txt_pfad, offset, breite=60):
+    """Textausschnitt rund um einen Treffer (für die Anzeige); liest nur diesen Bereich der Datei."""
+    start = max(offset - breite, 0)
+    with open(txt_pfad, "rb") as f:
+        f.seek(start)
+        ausschnitt = f.read(offset + breite - start)
+    # An den Rändern kann ein Umlaut halb abgeschnitten sein
+    return " ".join(ausschnitt.decode("utf-8", errors="ignore").split())
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description="Volltext-Index über extrahierte PDF-Texte")
+    parser.add_argument("--index", default=None, help=f"Index-Datei (Standard: {DATEN_ORDNER}/{INDEX_DATEI})")
+    unter = parser.add_subparsers(dest="befehl", required=True)
+
+    p_index = unter.add_parser("index", help="Index aufbauen bzw. aktualisieren")
+    p_index.add_argument("ordner", nargs="?", default="texte")
+
+    p_suche = unter.add_parser("suche", help="Begriffe oder Phrasen suchen")
+    p_suche.add_argument("anfragen", nargs="+")
+    p_suche.add_argument("--max", type=int, default=20, help="höchstens so viele Treffer je Anfrage anzeigen")
+
+    args = parser.parse_args(argumente)
+    index = TextIndex(args.index or os.path.join(DATEN_ORDNER, INDEX_DATEI))
+
+    if args.befehl == "index":
+        start = time.perf_counter()
+        neu, entfernt = index.aktualisiere(args.ordner)
+        print(f"✅ Index aktualisiert: {neu} Dateien neu indexiert, {entfernt} entfernt "
+              f"({time.perf_counter() - start:.2f} s)")
+    else:
+        for anfrage in args.anfragen:
+            start = time.perf_counter()
+            treffer = index.suche(anfrage)
+            dauer_ms = (time.perf_counter() - start) * 1000
+            print(f"🔍 '{anfrage}': {len(treffer)} Treffer in {dauer_ms:.1f} ms")
+            for txt_pfad, seite, offset in treffer[:args.max]:
+                print(f"  {os.path.basename(txt_pfad)} – Seite {seite}: …{kontext(txt_pfad, offset)}…")
+    index.schliessen()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
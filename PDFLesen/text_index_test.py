@@ -0,0 +1,75 @@
+"""
+Tests für text_index.py.
+
+python -m unittest discover -p "*_test.py"
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from text_index import INDEX_DATEI, TextIndex, kontext
+
+TEXT = (
+    "\n--- Seite 1 ---\n"
+    "Rechnung für Straßenbenutzung, Gebühr über 1.234,56 EUR\n"
+    "\n--- Seite 2 (OCR) ---\n"
+    "Größere Abschlagsrechnung 430100011644 abzgl. Abschlagsrechnung März\n"
+)
+
+
+class TextIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.ordner = self._tmp.name
+        self.index_pfad = os.path.join(self.ordner, "daten", INDEX_DATEI)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _datei(self, name, text, zeilenende="\n"):
+        pfad = os.path.join(self.ordner, name)
+        with open(pfad, "w", encoding="utf-8", newline=zeilenende) as f:
+            f.write(text)
+        return pfad
+
+    def test_suche_mit_seite_und_kontext(self):
+        for zeilenende in ("\n", "\r\n"):
+            with self.subTest(zeilenende=repr(zeilenende)):
+                self._datei("rechnung.txt", TEXT, zeilenende)
+                index = TextIndex(self.index_pfad)
+                index.aktualisiere(self.ordner)
+
+                treffer = index.suche("abzgl. Abschlagsrechnung")
+                self.assertEqual(len(treffer), 1)
+                pfad, seite, offset = treffer[0]
+                self.assertEqual(seite, 2)
+                with open(pfad, "rb") as f:
+                    f.seek(offset)
+                    self.assertEqual(f.read(6), b"abzgl.")
+
+                # Byte-Offsets bleiben auch nach Umlauten richtig
+                _, seite, offset = index.suche("März")[0]
+                self.assertIn("Abschlagsrechnung März", kontext(pfad, offset))
+                self.assertEqual(index.suche("gebühr")[0][1], 1)
+                index.schliessen()
+                os.remove(self.index_pfad)
+
+    def test_alter_index_wird_neu_aufgebaut(self):
+        os.makedirs(os.path.dirname(self.index_pfad))
+        with sqlite3.connect(self.index_pfad) as db:
+            db.execute("CREATE TABLE dateien (id INTEGER PRIMARY KEY, pfad TEXT UNIQUE NOT NULL, "
+                       "groesse INTEGER NOT NULL, mtime REAL NOT NULL)")
+            db.execute("INSERT INTO dateien VALUES (1, 'alt.txt', 0, 0)")
+        db.close()
+
+        index = TextIndex(self.index_pfad)
+        self.assertEqual(index._db.execute("SELECT COUNT(*) FROM dateien").fetchone()[0], 0)
+        self._datei("rechnung.txt", TEXT)
+        self.assertEqual(index.aktualisiere(self.ordner), (1, 0))
+        index.schliessen()
+
+
+if __name__ == "__main__":
+    unittest.main()